@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Compare per-cell and batched prompt-variant aggregation.
+
+Collects the (value, stderr) pairs of every latest results file that
+build_data.py would read, then times prompt_stats.aggregate_metric_values()
+cell by cell against one prompt_stats.aggregate_batch() call over all cells
+(NumPy segment reductions).  --scale N repeats the cells N times to mimic
+trees with many more checkpoints.
+
+Usage: python3 benchmarks/bench_aggregate.py [--limit N] [--scale N] [--repeat R]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import build_data  # noqa: E402
+from prompt_stats import HAVE_NUMPY, aggregate_batch, aggregate_metric_values  # noqa: E402
+from results_index import scan_results_root  # noqa: E402
+
+
+def collect_cells():
+    metrics_setup = build_data.load_metrics_setup()
+    cells = []
+    for root in (build_data.RESULTS_DIR, build_data.RESULTS_INSTRUCT_DIR,
+                 build_data.PROGRESS_DIR):
+        index = scan_results_root(root, metrics_setup, build_data.SHOT_DIRS.values())
+        for model_index in index.values():
+            for benchmark, shots in model_index.items():
+                config = metrics_setup[benchmark]
+                for cell in shots.values():
+                    if cell.latest:
+                        cells.append(build_data.collect_metric_values(
+                            cell.latest, benchmark, config.get("subtasks"), config
+                        ))
+    return cells
+
+
+def per_cell(cells):
+    return [aggregate_metric_values(c) for c in cells]
+
+
+def run(name, fn, cells, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(cells)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{name:>8}: {best:7.3f} s total, {best / len(cells) * 1e6:8.1f} us/cell")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--limit", type=int, default=0,
+                        help="only use the first N cells (default: all)")
+    parser.add_argument("--scale", type=int, default=1,
+                        help="repeat the cells N times (default: 1)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="take the best of R runs (default: 3)")
+    args = parser.parse_args()
+    if not HAVE_NUMPY:
+        sys.exit("numpy is not installed; aggregate_batch() would only fall back to per-cell")
+
+    cells = collect_cells()
+    if args.limit:
+        cells = cells[:args.limit]
+    cells = cells * args.scale
+    rows = sum(len(pairs) for c in cells for pairs in c.values())
+    print(f"{len(cells)} cells, {rows} (metric, variant) rows")
+
+    # Both paths must agree before timing means anything
+    if per_cell(cells) != aggregate_batch(cells):
+        sys.exit("batched aggregation does not match the per-cell results")
+
+    scalar = run("per-cell", per_cell, cells, args.repeat)
+    batched = run("batched", aggregate_batch, cells, args.repeat)
+    print(f"speedup: {scalar / batched:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""Time the build pipeline on a synthetic results tree of configurable size.
+
+Generates lm-eval style results trees in a temporary directory, laid out like
+the real ones (<model>/<benchmark>/<N-shot>/<model_sanitized>/results_<ts>.json
+with _pN prompt variants, subtask entries and --stale older duplicates per
+cell), for --models models in results/ and --checkpoints steps in
+NorOLMo_progress/.  Benchmarks are taken from metrics_setup.yaml; asking for
+more than it defines adds renamed copies.
+
+Then runs the build_data.py and check_missing.py stages phase by phase:
+
+    scan           results_index.scan_results_root() of both roots
+    parse          collect_metric_values() of every latest results file
+    aggregate      aggregate_metric_values() of every cell, into ScoreTables
+    derive         build_norm_params(), build_progress_filter() and
+                   build_significance()
+    serialize      write_sharded_output() into the temporary directory
+    check_missing  check_missing.py's directory and main-metric checks
+
+and records the best wall time of --repeat runs and the peak traced memory
+(tracemalloc, from a separate run) of each phase as JSON.  With --baseline,
+exits with status 1 if a phase got slower or bigger than the baseline by more
+than --threshold; --save-baseline stores the current run as that baseline.
+Baselines are machine-specific and must use the same size options.
+
+Usage: python3 benchmarks/bench_build.py [--models N] [--checkpoints N]
+           [--benchmarks N] [--prompts N] [--stale N] [--repeat R]
+           [--output FILE] [--baseline FILE [--save-baseline]] [--threshold X]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import build_data  # noqa: E402
+import check_missing  # noqa: E402
+from prompt_stats import aggregate_metric_values  # noqa: E402
+from results_index import scan_results_root  # noqa: E402
+from score_table import ScoreTable, to_records  # noqa: E402
+from significance import build_significance  # noqa: E402
+
+PHASES = ["scan", "parse", "aggregate", "derive", "serialize", "check_missing"]
+SHOT_DIRS = build_data.SHOT_DIRS
+# lm-eval stores every task config and the environment in each results file;
+# this much filler keeps synthetic files near the real ~20 KB average.
+CONFIG_FILLER = "x" * 2500
+
+
+def synthetic_metrics_setup(n_benchmarks):
+    """The first n_benchmarks of metrics_setup.yaml, plus renamed copies if needed."""
+    real = build_data.load_metrics_setup()
+    names = list(real)
+    setup = {}
+    for i in range(n_benchmarks):
+        name = names[i % len(names)]
+        copy = i // len(names)
+        setup[name if copy == 0 else f"{name}_x{copy}"] = real[name]
+    return setup
+
+
+def results_payload(rng, benchmark, config, n_prompts):
+    """Contents of one synthetic results file (json.dump(indent=2), like lm-eval)."""
+    scale = 100.0 if config.get("metric_scale") == "percent" else 1.0
+    main = config["main_metric"]
+    metrics = [main, "acc_norm"] if main == "acc" else [main]
+
+    def task_entry(alias):
+        entry = {"alias": alias}
+        for metric in metrics:
+            entry[f"{metric},none"] = rng.uniform(0.2, 0.9) * scale
+            entry[f"{metric}_stderr,none"] = rng.uniform(0.005, 0.02) * scale
+        return entry
+
+    tasks = [f"{benchmark}_p{i}" for i in range(n_prompts)]
+    tasks += [f"{benchmark}_{code}" for code in config.get("subtasks", {})]
+    return {
+        "results": {task: task_entry(task) for task in tasks},
+        "configs": {task: {"task": task, "doc_to_text": CONFIG_FILLER} for task in tasks},
+        "n-samples": {task: {"original": 500, "effective": 500} for task in tasks},
+        "pretty_env_info": CONFIG_FILLER,
+    }
+
+
+def generate_tree(base, metrics_setup, n_models, n_checkpoints, n_prompts, n_stale, seed=0):
+    """Write results/ and NorOLMo_progress/ under base; returns (roots, files, bytes)."""
+    rng = random.Random(seed)
+    roots = {
+        "results": [f"model-{i:03d}" for i in range(n_models)],
+        "NorOLMo_progress": [f"NorOLMo-step-{(i + 1) * 1000}" for i in range(n_checkpoints)],
+    }
+    n_files = n_bytes = 0
+    for root, model_dirs in roots.items():
+        for model_dir in model_dirs:
+            sanitized = "models__" + model_dir
+            for benchmark, config in metrics_setup.items():
+                for shot_dir in SHOT_DIRS.values():
+                    cell = base / root / model_dir / benchmark / shot_dir / sanitized
+                    cell.mkdir(parents=True)
+                    # Older runs first; only the newest file per cell is read
+                    for run in range(n_stale + 1):
+                        path = cell / f"results_2026-01-{run + 1:02d}T12-00-00.000000.json"
+                        text = json.dumps(results_payload(rng, benchmark, config, n_prompts), indent=2)
+                        path.write_text(text)
+                        n_files += 1
+                        n_bytes += len(text)
+    return {root: base / root for root in roots}, n_files, n_bytes
+
+
+def run_pipeline(roots, metrics_setup, out_dir, timer):
+    """Run every phase once; timer(name) is a context manager around each phase."""
+    benchmarks = list(metrics_setup)
+    shot_dirs = list(SHOT_DIRS.values())
+
+    with timer("scan"):
+        indexes = {root: scan_results_root(path, benchmarks, shot_dirs)
+                   for root, path in roots.items()}
+
+    with timer("parse"):
+        cells = []  # (root, model_dir, benchmark, shot, metric values)
+        for root, index in indexes.items():
+            for model_dir, model_index in index.items():
+                for benchmark, shots in model_index.items():
+                    config = metrics_setup[benchmark]
+                    for shot, shot_dir in SHOT_DIRS.items():
+                        cell = shots.get(shot_dir)
+                        if cell is None or cell.latest is None:
+                            continue
+                        values = build_data.collect_metric_values(
+                            cell.latest, benchmark, config.get("subtasks"), config
+                        )
+                        cells.append((root, model_dir, benchmark, shot, values))
+
+    with timer("aggregate"):
+        sections = {"results": {}, "NorOLMo_progress": {}}
+        for root, model_dir, benchmark, shot, values in cells:
+            scores = to_records(aggregate_metric_values(values))
+            if scores is None:
+                continue
+            key = int(model_dir.rsplit("-", 1)[1]) if root == "NorOLMo_progress" else model_dir
+            sections[root].setdefault(key, {}).setdefault(benchmark, {})[shot] = scores
+        models, progress = ScoreTable(), ScoreTable()
+        for table, root in ((models, "results"), (progress, "NorOLMo_progress")):
+            for key, scores in sections[root].items():
+                table.add(key, scores)
+
+    with timer("derive"):
+        output = {
+            "models": models, "instruct_models": ScoreTable(), "progress": progress,
+            "ablations": {},
+            "norm_params": {
+                "models": build_data.build_norm_params(models, metrics_setup),
+                "instruct_models": {},
+                "progress": build_data.build_norm_params(progress, metrics_setup),
+                "ablations": {},
+            },
+            "progress_filter": build_data.build_progress_filter(progress, metrics_setup),
+            "significance": {
+                "models": build_significance(models, metrics_setup, build_data.SHOT_SETTINGS,
+                                             build_data.PROMPT_AGGS),
+                "instruct_models": build_significance(ScoreTable(), metrics_setup,
+                                                      build_data.SHOT_SETTINGS,
+                                                      build_data.PROMPT_AGGS),
+            },
+        }
+
+    with timer("serialize"):
+        build_data.write_sharded_output(output, out_dir / "data.json", out_dir / "data")
+
+    with timer("check_missing"):
+        for index in indexes.values():
+            for model_index in index.values():
+                check_missing.check_model_dir(model_index, benchmarks)
+        check_missing.check_main_metrics(list(indexes.values()), metrics_setup)
+
+
+class PhaseTimer:
+    """Records wall time, and optionally tracemalloc peak, per phase."""
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.seconds = {}
+        self.peak_bytes = {}
+        self._phase = None
+
+    def __call__(self, phase):
+        self._phase = phase
+        return self
+
+    def __enter__(self):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            self._base = tracemalloc.get_traced_memory()[0]
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.seconds[self._phase] = time.perf_counter() - self._start
+        if self.trace_memory:
+            self.peak_bytes[self._phase] = tracemalloc.get_traced_memory()[1] - self._base
+
+
+def measure(roots, metrics_setup, work_dir, repeat):
+    """Best-of-repeat seconds, and the peak memory of one traced run, per phase."""
+    best = {}
+    for _ in range(repeat):
+        timer = PhaseTimer()
+        run_pipeline(roots, metrics_setup, work_dir / "out", timer)
+        for phase, seconds in timer.seconds.items():
+            best[phase] = min(seconds, best.get(phase, seconds))
+    tracemalloc.start()
+    try:
+        traced = PhaseTimer(trace_memory=True)
+        run_pipeline(roots, metrics_setup, work_dir / "out", traced)
+    finally:
+        tracemalloc.stop()
+    return {phase: {"seconds": round(best[phase], 6), "peak_bytes": traced.peak_bytes[phase]}
+            for phase in PHASES}
+
+
+def compare(result, baseline, threshold, min_seconds):
+    """Return a list of regression messages of result against baseline."""
+    if baseline["config"] != result["config"]:
+        sys.exit(f"baseline was recorded with {baseline['config']}, "
+                 f"not {result['config']}")
+    regressions = []
+    for phase, stats in result["phases"].items():
+        base = baseline["phases"].get(phase)
+        if base is None:
+            continue
+        for key in ("seconds", "peak_bytes"):
+            limit = base[key] * (1 + threshold)
+            # Ignore timing noise on phases that only take a few milliseconds
+            if key == "seconds" and stats[key] - base[key] < min_seconds:
+                continue
+            if stats[key] > limit:
+                regressions.append(f"{phase} {key}: {stats[key]} > {base[key]} "
+                                   f"(+{(stats[key] / base[key] - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--models", type=int, default=20,
+                        help="models in results/ (default: 20)")
+    parser.add_argument("--checkpoints", type=int, default=30,
+                        help="checkpoints in NorOLMo_progress/ (default: 30)")
+    parser.add_argument("--benchmarks", type=int, default=35,
+                        help="benchmarks per model (default: 35)")
+    parser.add_argument("--prompts", type=int, default=5,
+                        help="prompt variants per benchmark (default: 5)")
+    parser.add_argument("--stale", type=int, default=1,
+                        help="older duplicate results files per cell (default: 1)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="take the best of R runs (default: 3)")
+    parser.add_argument("--output", metavar="FILE",
+                        help="write the results as JSON to FILE")
+    parser.add_argument("--baseline", metavar="FILE",
+                        help="fail if a phase regressed against this results JSON")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store this run as --baseline instead of comparing")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed relative regression (default: 0.25)")
+    parser.add_argument("--min-seconds", type=float, default=0.05,
+                        help="ignore slowdowns smaller than this (default: 0.05)")
+    args = parser.parse_args()
+    if args.save_baseline and not args.baseline:
+        parser.error("--save-baseline needs --baseline FILE")
+
+    config = {k: getattr(args, k) for k in ("models", "checkpoints", "benchmarks", "prompts", "stale")}
+    metrics_setup = synthetic_metrics_setup(args.benchmarks)
+    work_dir = Path(tempfile.mkdtemp(prefix="noreval-bench-"))
+    try:
+        start = time.perf_counter()
+        roots, n_files, n_bytes = generate_tree(
+            work_dir / "tree", metrics_setup, args.models, args.checkpoints,
+            args.prompts, args.stale,
+        )
+        print(f"generated {n_files} results files ({n_bytes / 2**20:.1f} MiB) "
+              f"in {time.perf_counter() - start:.1f} s")
+        phases = measure(roots, metrics_setup, work_dir, args.repeat)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    result = {
+        "config": config,
+        "files": n_files,
+        "bytes": n_bytes,
+        "python": platform.python_version(),
+        "phases": phases,
+    }
+    for phase, stats in phases.items():
+        print(f"{phase:>14}: {stats['seconds']:8.3f} s, peak {stats['peak_bytes'] / 2**20:8.1f} MiB")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if args.baseline:
+        if args.save_baseline:
+            with open(args.baseline, "w") as f:
+                json.dump(result, f, indent=2)
+            print(f"saved baseline {args.baseline}")
+            return
+        if not os.path.exists(args.baseline):
+            sys.exit(f"no baseline at {args.baseline} (record one with --save-baseline)")
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(result, baseline, args.threshold, args.min_seconds)
+        if regressions:
+            print("regressions against " + args.baseline + ":")
+            for message in regressions:
+                print("  " + message)
+            sys.exit(1)
+        print(f"no phase regressed by more than {args.threshold * 100:.0f}% against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
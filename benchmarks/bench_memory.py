@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""Compare the build's peak memory for nested score dicts, ScoreTables and streaming.
+
+Processes the real NorOLMo_progress/ checkpoints once (through the build
+cache), then replays their scores as --checkpoints synthetic steps, cycling
+over the real ones with fresh float objects as parsing would create them.
+Each layout is measured with tracemalloc:
+
+    dicts   the layout before score_table.py: {step: {benchmark: {shot:
+            {metric: {stat: value}}}}}, as process_model_dir() returned it
+    table   ScoreRecords in a ScoreTable, as the build now holds them
+    stream  the same ScoreTable, written by json_stream.write_json() as
+            with --stream
+
+for two phases:
+
+    hold       collect every checkpoint's scores (memory held afterwards,
+               and the peak while collecting)
+    serialize  json.dumps() of the section, as write_output() does, or for
+               stream write_json() into a temporary file
+
+and checks that all of them serialize to the same bytes.  The build cache
+shares the same per-cell objects in every layout, so it is left out.
+
+Usage: python3 benchmarks/bench_memory.py [--checkpoints N] [--output FILE]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import build_data  # noqa: E402
+from results_index import benchmark_aliases, resolve_aliases, scan_results_root  # noqa: E402
+from json_stream import write_json  # noqa: E402
+from score_table import ScoreTable, json_default, to_records  # noqa: E402
+
+MIB = 1024 * 1024
+
+
+def load_templates(metrics_setup):
+    """Scores of the real main-run checkpoints, as {metric: stats dict} cells."""
+    aliases = benchmark_aliases(metrics_setup)
+    index = scan_results_root(build_data.PROGRESS_DIR, [*metrics_setup, *aliases],
+                              list(build_data.SHOT_DIRS.values()))
+    paths, indexes = [], []
+    for ckpt_dir, ckpt_index in index.items():
+        family = build_data.classify_checkpoint_dir(ckpt_dir)
+        if family is not None and family[0] is None:
+            paths.append(str(build_data.PROGRESS_DIR / ckpt_dir))
+            indexes.append(resolve_aliases(ckpt_index, aliases))
+    cache = build_data.BuildCache.load(build_data.CACHE_FILE)
+    templates = []
+    for scores, _ in build_data.process_model_dirs(paths, metrics_setup, cache,
+                                                    model_indexes=indexes):
+        templates.append({
+            benchmark: {
+                shot: {metric: record.as_dict() for metric, record in metrics.items()}
+                for shot, metrics in shots.items()
+            }
+            for benchmark, shots in scores.items()
+        })
+    return templates
+
+
+def extracted(template):
+    """A fresh copy of a checkpoint's scores, as extraction hands them over."""
+    return {
+        benchmark: {
+            shot: {
+                metric: {k: v + 0.0 if isinstance(v, float) else v for k, v in stats.items()}
+                for metric, stats in metrics.items()
+            }
+            for shot, metrics in shots.items()
+        }
+        for benchmark, shots in template.items()
+    }
+
+
+def collect_dicts(templates, n):
+    section = {}
+    for i in range(n):
+        section[(i + 1) * 1000] = extracted(templates[i % len(templates)])
+    return section
+
+
+def collect_table(templates, n):
+    table = ScoreTable()
+    for i in range(n):
+        scores = extracted(templates[i % len(templates)])
+        table.add((i + 1) * 1000, {
+            benchmark: {shot: to_records(metrics) for shot, metrics in shots.items()}
+            for benchmark, shots in scores.items()
+        })
+    return table
+
+
+def dumps(section, path):
+    with open(path, "w") as f:
+        f.write(json.dumps(section, ensure_ascii=False, default=json_default))
+
+
+def stream(section, path):
+    write_json(path, section)
+
+
+def measure(collect, serialize, templates, n, path):
+    """Traced memory and time of the hold and serialize phases of one layout."""
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        section = collect(templates, n)
+        hold_seconds = time.perf_counter() - start
+        held, hold_peak = (m - base for m in tracemalloc.get_traced_memory())
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        serialize(section, path)
+        serialize_seconds = time.perf_counter() - start
+        serialize_peak = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+    result = {
+        "held_bytes": held,
+        "hold": {"seconds": round(hold_seconds, 3), "peak_bytes": hold_peak},
+        "serialize": {"seconds": round(serialize_seconds, 3), "peak_bytes": serialize_peak},
+        "peak_bytes": max(hold_peak, serialize_peak),
+    }
+    with open(path, "rb") as f:
+        return result, f.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--checkpoints", type=int, default=1000,
+                        help="synthetic checkpoints to hold (default: 1000)")
+    parser.add_argument("--output", metavar="FILE",
+                        help="write the measurements as JSON to FILE")
+    args = parser.parse_args()
+
+    metrics_setup = build_data.load_metrics_setup()
+    templates = load_templates(metrics_setup)
+    if not templates:
+        sys.exit(f"no checkpoints found in {build_data.PROGRESS_DIR}")
+    template_rows = [
+        sum(len(metrics) for shots in scores.values() for metrics in shots.values())
+        for scores in templates
+    ]
+    rows = sum(template_rows[i % len(templates)] for i in range(args.checkpoints))
+    print(f"{args.checkpoints} checkpoints from {len(templates)} real ones, "
+          f"{rows} (benchmark, shot, metric) rows")
+
+    results = {}
+    payloads = {}
+    layouts = [("dicts", collect_dicts, dumps), ("table", collect_table, dumps),
+               ("stream", collect_table, stream)]
+    for layout, collect, serialize in layouts:
+        with tempfile.TemporaryDirectory() as tmp:
+            results[layout], payloads[layout] = measure(
+                collect, serialize, templates, args.checkpoints, Path(tmp) / "section.json"
+            )
+        r = results[layout]
+        print(f"{layout:>6}: held {r['held_bytes'] / MIB:7.1f} MiB "
+              f"({r['held_bytes'] / rows:5.0f} B/row), "
+              f"peak {r['peak_bytes'] / MIB:7.1f} MiB "
+              f"(hold {r['hold']['peak_bytes'] / MIB:.1f}, "
+              f"serialize {r['serialize']['peak_bytes'] / MIB:.1f}), "
+              f"{r['hold']['seconds'] + r['serialize']['seconds']:.1f} s")
+    if len(set(payloads.values())) != 1:
+        sys.exit("the layouts serialize differently")
+    before = results["dicts"]
+    for layout in ("table", "stream"):
+        print(f"{layout:>6} vs dicts: held memory "
+              f"{before['held_bytes'] / results[layout]['held_bytes']:.1f}x smaller, "
+              f"peak {before['peak_bytes'] / results[layout]['peak_bytes']:.1f}x smaller")
+    print(f"JSON identical ({len(payloads['dicts']) / MIB:.1f} MiB)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"checkpoints": args.checkpoints, "rows": rows, **results}, f, indent=2)
+            f.write("\n")
+        print(f"Written {os.path.relpath(args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Measure --prefetch on the real build under injected filesystem latency.
+
+Local disks answer a stat or an open in microseconds, so the benefit of
+prefetch.py only shows on cluster filesystems.  This script simulates one:
+while it runs, every os.scandir(), os.stat() and open() below the results
+roots first sleeps for --latency milliseconds (a sleep releases the GIL, as
+a blocking network round trip does).  It then runs the build as the CLI
+does (build_data.main() with --single-file --no-store), for --prefetch 0
+and each N given, twice:
+
+    full    with --full, so every results file is read and hashed
+    cached  with the build cache the full run saved (stats only)
+
+and reports the scan and process phases of each (from --profile), checking
+that every run wrote the same docs/data.json.  The build cache is rewritten
+as by any build.
+
+Usage: python3 benchmarks/bench_prefetch.py [--latency MS] [--prefetch N ...]
+           [--output FILE]
+"""
+
+import argparse
+import builtins
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import build_data  # noqa: E402
+
+ROOTS = [build_data.RESULTS_DIR, build_data.RESULTS_INSTRUCT_DIR, build_data.PROGRESS_DIR]
+PHASES = ("scan", "process")
+
+
+@contextlib.contextmanager
+def injected_latency(seconds, prefixes):
+    """Delay os.scandir, os.stat and open calls on paths below prefixes."""
+    prefixes = tuple(str(p) for p in prefixes)
+    originals = os.scandir, os.stat, builtins.open
+    calls = [0]
+
+    def slow(fn):
+        def wrapper(path=".", *args, **kwargs):
+            if isinstance(path, (str, os.PathLike)) and os.fspath(path).startswith(prefixes):
+                calls[0] += 1
+                time.sleep(seconds)
+            return fn(path, *args, **kwargs)
+        return wrapper
+
+    os.scandir, os.stat, builtins.open = (slow(fn) for fn in originals)
+    try:
+        yield calls
+    finally:
+        os.scandir, os.stat, builtins.open = originals
+
+
+def run(prefetch, full, profile_file):
+    """Build once; returns ({phase: seconds}, SHA-1 of docs/data.json)."""
+    argv = ["--single-file", "--no-store", "--prefetch", str(prefetch),
+            "--profile", str(profile_file)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        build_data.main(["--full", *argv] if full else argv)
+    with open(profile_file) as f:
+        phases = json.load(f)["phases"]
+    with open(build_data.OUTPUT_FILE, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+    return {phase: phases[phase] for phase in PHASES}, digest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--latency", type=float, default=1.0,
+                        help="milliseconds added to every scandir/stat/open (default: 1)")
+    parser.add_argument("--prefetch", type=int, nargs="+", default=[8, 32],
+                        help="in-flight limits to compare against 0 (default: 8 32)")
+    parser.add_argument("--output", metavar="FILE",
+                        help="write the timings as JSON to FILE")
+    args = parser.parse_args()
+
+    timings = {}
+    reference = None
+    with tempfile.TemporaryDirectory() as tmp, \
+            injected_latency(args.latency / 1000, ROOTS) as calls:
+        for prefetch in [0, *args.prefetch]:
+            timings[prefetch] = {}
+            for run_name, full in (("full", True), ("cached", False)):
+                before = calls[0]
+                seconds, digest = run(prefetch, full, Path(tmp) / "profile.json")
+                if reference is None:
+                    reference = digest
+                elif digest != reference:
+                    sys.exit(f"prefetch {prefetch} ({run_name}): data.json differs "
+                             f"from prefetch 0")
+                timings[prefetch][run_name] = seconds
+                print(f"prefetch {prefetch:>3} {run_name:>6}: "
+                      + ", ".join(f"{phase} {s:7.2f} s" for phase, s in seconds.items())
+                      + f"  ({calls[0] - before} delayed calls)")
+
+    base = timings[0]
+    for prefetch in args.prefetch:
+        print(f"prefetch {prefetch:>3} speedup: " + ", ".join(
+            f"{run_name} {phase} {base[run_name][phase] / s:5.1f}x"
+            for run_name, seconds in timings[prefetch].items()
+            for phase, s in seconds.items()
+        ))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"latency_ms": args.latency, "seconds": timings}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Compare full json.load against the selective results-file reader.
+
+Times both ways of getting the "results" and "n-samples" sections out of
+every latest results file that build_data.py would read, and reports bytes
+read, bytes decoded and time per file.
+
+Usage: python3 benchmarks/bench_results_parse.py [--limit N] [--repeat R]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import build_data  # noqa: E402
+from results_index import read_results_sections, scan_results_root  # noqa: E402
+
+KEYS = ("results", "n-samples")
+
+
+def latest_files():
+    metrics_setup = build_data.load_metrics_setup()
+    files = []
+    for root in (build_data.RESULTS_DIR, build_data.RESULTS_INSTRUCT_DIR,
+                 build_data.PROGRESS_DIR):
+        index = scan_results_root(root, metrics_setup, build_data.SHOT_DIRS.values())
+        for model_index in index.values():
+            for shots in model_index.values():
+                files.extend(c.latest for c in shots.values() if c.latest)
+    return files
+
+
+def full_parse(path, stats):
+    with open(path, "rb") as f:
+        raw = f.read()
+    data = json.loads(raw)
+    stats["files"] = stats.get("files", 0) + 1
+    stats["bytes_read"] = stats.get("bytes_read", 0) + len(raw)
+    stats["bytes_decoded"] = stats.get("bytes_decoded", 0) + len(raw)
+    return {k: data[k] for k in KEYS if k in data}
+
+
+def selective_parse(path, stats):
+    return read_results_sections(path, KEYS, stats)
+
+
+def run(name, fn, files, repeat):
+    best = None
+    for _ in range(repeat):
+        stats = {}
+        start = time.perf_counter()
+        for path in files:
+            fn(path, stats)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best[0]:
+            best = (elapsed, stats)
+    elapsed, stats = best
+    n = max(stats.get("files", 0), 1)
+    print(f"{name:>10}: {elapsed:7.3f} s total, {elapsed / n * 1e6:8.1f} us/file, "
+          f"{stats['bytes_read'] / n / 1024:6.1f} KiB read/file, "
+          f"{stats['bytes_decoded'] / n / 1024:6.1f} KiB decoded/file")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--limit", type=int, default=0,
+                        help="only use the first N files (default: all)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="take the best of R runs (default: 3)")
+    args = parser.parse_args()
+
+    files = latest_files()
+    if args.limit:
+        files = files[:args.limit]
+    print(f"{len(files)} latest results files")
+
+    # Both readers must agree before timing means anything
+    for path in files:
+        if full_parse(path, {}) != selective_parse(path, {}):
+            sys.exit(f"mismatch: {path}")
+
+    full = run("json.load", full_parse, files, args.repeat)
+    selective = run("selective", selective_parse, files, args.repeat)
+    print(f"speedup: {full / selective:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
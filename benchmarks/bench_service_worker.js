@@ -0,0 +1,199 @@
+#!/usr/bin/env node
+// Check docs/sw.js caching against a local static server, offline.
+//
+// Copies the built docs/ (run build_data.py first) into a temporary
+// directory, serves it on 127.0.0.1 and runs sw.js in a VM context with a
+// minimal in-memory Cache Storage.  Each simulated visit navigates to the
+// page and requests what index.html, app.js and compute-worker.js request
+// (style.css, app.js, compute-worker.js, data.json and every shard listed in
+// data.json).  Visits:
+//
+//   first      empty cache: everything comes from the network
+//   repeat     only index.html and asset-manifest.json are fetched
+//   deploy     style.css changed and the manifest was rewritten with
+//              build_data.write_asset_manifest(): only style.css is fetched,
+//              and its old cached version is dropped
+//   offline    server stopped: every file is served from the cache
+//
+// Prints the requests and bytes per visit, and exits with status 1 if a
+// visit fetched more than expected.
+//
+// Usage: node benchmarks/bench_service_worker.js
+
+"use strict";
+
+const childProcess = require("child_process");
+const fs = require("fs");
+const http = require("http");
+const os = require("os");
+const path = require("path");
+const vm = require("vm");
+
+const ROOT = path.resolve(__dirname, "..");
+const DOCS = path.join(ROOT, "docs");
+const DOCS_FILES = ["index.html", "app.js", "compute-worker.js", "style.css", "sw.js", "data.json"];
+
+function copyDocs(dir) {
+  for (const name of DOCS_FILES) fs.copyFileSync(path.join(DOCS, name), path.join(dir, name));
+  const core = JSON.parse(fs.readFileSync(path.join(dir, "data.json"), "utf8"));
+  const shards = Object.values(core.shards || {});
+  for (const shard of shards) {
+    fs.mkdirSync(path.dirname(path.join(dir, shard)), { recursive: true });
+    fs.copyFileSync(path.join(DOCS, shard), path.join(dir, shard));
+  }
+  writeManifest(dir, shards);
+  return shards;
+}
+
+/** Rewrite dir/asset-manifest.json with build_data.write_asset_manifest(). */
+function writeManifest(dir, shards) {
+  const script = [
+    "import sys",
+    "sys.path.insert(0, sys.argv[1])",
+    "from build_data import write_asset_manifest",
+    "write_asset_manifest(sys.argv[2], [sys.argv[3] + '/' + s for s in sys.argv[4:]])",
+  ].join("\n");
+  childProcess.execFileSync("python3", ["-c", script, ROOT, path.join(dir, "data.json"), dir, ...shards]);
+}
+
+function serve(dir, log) {
+  const server = http.createServer((req, res) => {
+    const url = new URL(req.url, "http://localhost");
+    const file = path.join(dir, url.pathname === "/" ? "index.html" : decodeURIComponent(url.pathname));
+    fs.readFile(file, (err, body) => {
+      if (err) {
+        res.writeHead(404);
+        res.end();
+        return;
+      }
+      log.push({ url: req.url, bytes: body.length });
+      res.writeHead(200, { "Content-Type": file.endsWith(".json") ? "application/json" : "text/plain" });
+      res.end(body);
+    });
+  });
+  return new Promise((resolve) => server.listen(0, "127.0.0.1", () => resolve(server)));
+}
+
+/** In-memory stand-in for the Cache Storage API (one cache per name). */
+function makeCaches() {
+  const stores = new Map();
+  class MemoryCache {
+    constructor() { this.entries = new Map(); }
+    async match(request) {
+      const entry = this.entries.get(typeof request === "string" ? request : request.url);
+      return entry && new Response(entry.body, { headers: entry.headers });
+    }
+    async put(request, response) {
+      const body = await response.arrayBuffer();
+      this.entries.set(typeof request === "string" ? request : request.url,
+                       { body, headers: Object.fromEntries(response.headers) });
+    }
+    async keys() { return [...this.entries.keys()].map((url) => ({ url })); }
+    async delete(request) {
+      return this.entries.delete(typeof request === "string" ? request : request.url);
+    }
+  }
+  return {
+    stores,
+    async open(name) {
+      if (!stores.has(name)) stores.set(name, new MemoryCache());
+      return stores.get(name);
+    },
+  };
+}
+
+function loadServiceWorker(scope, caches) {
+  const listeners = {};
+  const context = {
+    registration: { scope },
+    location: new URL(scope),
+    clients: { claim: async () => {} },
+    skipWaiting: async () => {},
+    addEventListener: (type, fn) => { listeners[type] = fn; },
+    caches, fetch, crypto, Request, Response, Headers, URL, console,
+  };
+  context.self = context;
+  vm.createContext(context);
+  vm.runInContext(fs.readFileSync(path.join(DOCS, "sw.js"), "utf8"), context);
+  return listeners;
+}
+
+/** Dispatch a fetch event; resolves to the response (the network's if not intercepted). */
+async function dispatchFetch(listeners, url, mode) {
+  let response = null;
+  const pending = [];
+  listeners.fetch({
+    request: { url, method: "GET", mode },
+    respondWith(promise) { response = promise; },
+    waitUntil(promise) { pending.push(promise); },
+  });
+  const result = await (response || fetch(url));
+  await Promise.all(pending);
+  return result;
+}
+
+async function visit(listeners, scope) {
+  const navigation = await dispatchFetch(listeners, scope, "navigate");
+  if (!navigation.ok) throw new Error("index.html: HTTP " + navigation.status);
+  const get = async (name) => {
+    const response = await dispatchFetch(listeners, new URL(name, scope).href, "cors");
+    if (!response.ok) throw new Error(name + ": HTTP " + response.status);
+    return response;
+  };
+  // index.html, then the compute worker's importScripts("app.js") and fetches
+  await Promise.all(["style.css", "app.js", "compute-worker.js"].map(get));
+  const core = await (await get("data.json")).json();
+  await get("app.js");
+  await Promise.all(Object.values(core.shards || {}).map(get));
+}
+
+async function main() {
+  const dir = fs.mkdtempSync(path.join(os.tmpdir(), "noreval-sw-"));
+  let failed = false;
+  try {
+    const shards = copyDocs(dir);
+    const log = [];
+    let server = await serve(dir, log);
+    const scope = `http://127.0.0.1:${server.address().port}/`;
+    const caches = makeCaches();
+    const listeners = loadServiceWorker(scope, caches);
+
+    const run = async (name, expected) => {
+      log.length = 0;
+      await visit(listeners, scope);
+      const bytes = log.reduce((sum, entry) => sum + entry.bytes, 0);
+      const urls = log.map((entry) => entry.url.split("?")[0]).sort();
+      console.log(`${name.padEnd(8)} ${String(log.length).padStart(3)} requests ` +
+                  `${(bytes / 1024).toFixed(1).padStart(9)} KiB  ${urls.join(" ")}`);
+      if (expected && JSON.stringify(urls) !== JSON.stringify([...expected].sort())) {
+        console.log(`  expected: ${expected.join(" ")}`);
+        failed = true;
+      }
+    };
+
+    await run("first", null);
+    await run("repeat", ["/", "/asset-manifest.json"]);
+
+    fs.appendFileSync(path.join(dir, "style.css"), "\n/* deploy */\n");
+    writeManifest(dir, shards);
+    await run("deploy", ["/", "/asset-manifest.json", "/style.css"]);
+    const cached = [...caches.stores.values()][0];
+    const styles = (await cached.keys()).filter((r) => r.url.includes("style.css?v="));
+    if (styles.length !== 1) {
+      console.log(`  expected one cached style.css version, found ${styles.length}`);
+      failed = true;
+    }
+
+    await new Promise((resolve) => server.close(resolve));
+    server = null;
+    await run("offline", []);
+  } finally {
+    fs.rmSync(dir, { recursive: true, force: true });
+  }
+  if (failed) process.exit(1);
+}
+
+main().catch((err) => {
+  console.error(err);
+  process.exit(1);
+});
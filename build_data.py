@@ -5,27 +5,123 @@ Reads metrics_setup.yaml and all result JSONs from results/ and
 NorOLMo_progress/, extracting prompt-variant aggregation stats
 (max, mean, median) for each (model, benchmark, shot) combination.
 
-Output: docs/data.json
+Output: docs/data.json, a core manifest (metrics setup, model metadata, task
+groups), plus one content-hashed shard per score section in docs/data/
+(models, instruct_models, progress, ablations) that the frontend fetches
+only when a tab needs it. Pass --single-file for the old monolithic file,
+and --columnar to store the score sections as dictionary-encoded columns
+(see columnar.py) with precompressed .gz/.br sidecars.  --stream writes each
+file section by section instead of serializing it in memory first (see
+json_stream.py).
+
+Extraction results are cached per (model, benchmark, shot) cell in
+.build_cache/manifest.json, so rebuilds only re-parse results files that
+changed since the previous run. Pass --full to ignore the cache.
 """
 
+import argparse
+import cProfile
+import gzip
+import hashlib
 import json
 import math
 import os
-import glob
-import statistics
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import yaml
 
+try:
+    import brotli
+except ImportError:  # optional: without it only .gz sidecars are written
+    brotli = None
+
+from build_profile import BuildProfile, new_dir_stats
+from columnar import encode_section
+from json_stream import write_json
+from prefetch import PrefetchedFile, Prefetcher, fetch_results_file
+from prompt_stats import HAVE_NUMPY, aggregate_batch, aggregate_metric_values
+from results_archive import ArchiveEntry, ResultsArchive, entry_key, read_archive_entry
+from results_index import (
+    benchmark_aliases,
+    latest_results_file,
+    read_results_sections,
+    rename_alias_tasks,
+    resolve_aliases,
+    scan_model_dir,
+    scan_results_root,
+)
+from score_store import STORE_FILE, write_store
+from score_table import ScoreTable, json_default, record_hook, to_records
+from significance import SIGNIFICANCE_SECTIONS, build_significance
+
 BASE_DIR = Path(__file__).parent
 RESULTS_DIR = BASE_DIR / "results"
 RESULTS_INSTRUCT_DIR = BASE_DIR / "results-instruct"
 PROGRESS_DIR = BASE_DIR / "NorOLMo_progress"
 OUTPUT_FILE = BASE_DIR / "docs" / "data.json"
+SHARD_DIR = OUTPUT_FILE.parent / "data"
+CACHE_FILE = BASE_DIR / ".build_cache" / "manifest.json"
+# Content hashes of the dashboard files, for the service worker (docs/sw.js)
+ASSET_MANIFEST = "asset-manifest.json"
+# Sidecars written next to the output files by --columnar (write_precompressed)
+PRECOMPRESSED_SUFFIXES = (".gz", ".br")
+STATIC_ASSETS = ["app.js", "compute-worker.js", "style.css"]
+
+# Per-entity score sections, and everything split out of data.json into
+# lazily loaded shards (the score sections plus their normalization params,
+# the signal filter's inputs and the pairwise significance codes)
+SCORE_SECTIONS = ["models", "instruct_models", "progress", "ablations"]
+DERIVED_SECTIONS = ["norm_params", "progress_filter", "significance"]
+SHARDED_SECTIONS = SCORE_SECTIONS + DERIVED_SECTIONS
+
+PROMPT_AGGS = ["max", "mean", "median", "min"]
+# Per-checkpoint inputs of the training-progress signal filter in app.js
+FILTER_SERIES_FIELDS = PROMPT_AGGS + ["prompt_sd", "prompt_mad", "max_prompt_idx"]
+
+# Bump whenever extract_benchmark_scores() output changes for the same input
+# for reasons outside EXTRACTION_SOURCES, so that cached aggregates from older
+# code are discarded.
+EXTRACTION_VERSION = 1
+# Modules whose code determines the extracted scores.  Their content hash is
+# part of CACHE_VERSION, so editing any of them invalidates the build cache;
+# .github/workflows/deploy.yml keys its actions/cache on the same files.
+EXTRACTION_SOURCES = [
+    "build_data.py", "prefetch.py", "prompt_stats.py", "results_archive.py",
+    "results_index.py", "score_table.py",
+]
+
+
+def _cache_version():
+    digest = hashlib.sha1()
+    for name in EXTRACTION_SOURCES:
+        with open(BASE_DIR / name, "rb") as f:
+            digest.update(f.read())
+    return f"{EXTRACTION_VERSION}-{digest.hexdigest()[:12]}"
+
+
+CACHE_VERSION = _cache_version()
 
 SHOT_SETTINGS = ["0", "1", "5"]
 SHOT_DIRS = {"0": "0-shot", "1": "1-shot", "5": "5-shot"}
 
+# Run families of the checkpoint directories in NorOLMo_progress/.  Each
+# directory is assigned to the first pattern it matches and processed once:
+# with a "run" group it is step <step> of ablations[run], without one it is
+# step <step> of the main training run (progress).  Directories matching no
+# pattern (e.g. checkpoints of another training run) are reported and
+# skipped rather than mixed into either; add a pattern to include them.
+RUN_FAMILY_PATTERNS = [
+    re.compile(r"^NorOLMo-step-(?P<step>\d+)$"),
+    re.compile(r"^NorOLMo-(?P<run>.+)-step-(?P<step>\d+)$"),
+]
+ABLATION_NAME_MAP = {
+    "stage2-ablation-no-len-ext-stage1-data": "Stage 2 ablation (lr decay only)",
+}
+
 
 def load_models_setup():
     """Load model metadata from models_setup.yaml.
@@ -195,14 +291,24 @@ def load_metrics_setup():
         return yaml.safe_load(f)
 
 
-def find_latest_results_json(directory):
-    """Find the newest results_*.json file under directory (recursive)."""
-    pattern = os.path.join(directory, "**", "results_*.json")
-    files = glob.glob(pattern, recursive=True)
-    if not files:
-        return None
-    files.sort(key=lambda f: os.path.basename(f))
-    return files[-1]
+def load_results_data(results_file, stats=None):
+    """Return the "results" and "n-samples" sections of a results file.
+
+    results_file is either a path in a results tree, a PrefetchedFile read
+    from one, or an ArchiveEntry from a packed results archive.  If stats is
+    a dict, "files", "bytes_read" and "bytes_decoded" are accumulated in it
+    (see read_results_sections).
+    """
+    if isinstance(results_file, ArchiveEntry):
+        if stats is not None:
+            stats["files"] = stats.get("files", 0) + 1
+            stats["bytes_read"] = stats.get("bytes_read", 0) + results_file.length
+            stats["bytes_decoded"] = stats.get("bytes_decoded", 0) + results_file.length
+        return read_archive_entry(results_file)
+    if isinstance(results_file, PrefetchedFile):
+        return read_results_sections(results_file.path, ("results", "n-samples"), stats,
+                                     results_file.data)
+    return read_results_sections(results_file, ("results", "n-samples"), stats)
 
 
 def _get_stderr(task_results, metric_name, n_samples, metric_scale):
@@ -231,23 +337,25 @@ def _get_stderr(task_results, metric_name, n_samples, metric_scale):
     return None
 
 
-def extract_benchmark_scores(
-    results_json_path, benchmark_name, subtasks=None, metrics_setup_entry=None
+def collect_metric_values(
+    results_json_path, benchmark_name, subtasks=None, metrics_setup_entry=None,
+    stats=None,
 ):
-    """Extract max/mean/median of all non-stderr metrics across prompt variants.
+    """Collect (value, stderr) pairs of all non-stderr metrics across prompt variants.
 
-    For benchmarks with subtasks (e.g. noreval_multiblimp), also extracts
+    For benchmarks with subtasks (e.g. noreval_multiblimp), also collects
     per-subtask metrics as virtual metric names like "acc: Person: 1→2".
 
-    Returns dict {metric_name: {"max": ..., "mean": ..., "median": ..., "min": ...,
-                                 "max_stderr": ..., ...}, ...}
-    or None if no metrics found.
+    Returns dict {metric_name: [(value, stderr_or_None), ...]}, with one pair
+    per prompt variant (empty if no metrics found).  stats is passed on to
+    load_results_data().
     """
-    with open(results_json_path) as f:
-        data = json.load(f)
+    data = load_results_data(results_json_path, stats)
 
-    results = data.get("results", {})
-    n_samples_dict = data.get("n-samples", {})
+    # Runs stored under an alias name (see metrics_setup.yaml "aliases")
+    aliases = metrics_setup_entry.get("aliases") if metrics_setup_entry else None
+    results = rename_alias_tasks(data.get("results", {}), benchmark_name, aliases)
+    n_samples_dict = rename_alias_tasks(data.get("n-samples", {}), benchmark_name, aliases)
     bench_exclusions = EXCLUDED_METRICS | EXCLUDED_METRICS_PER_BENCHMARK.get(
         benchmark_name, set()
     )
@@ -307,91 +415,381 @@ def extract_benchmark_scores(
                         metric_values[virtual_name] = []
                     metric_values[virtual_name].append((val, se))
 
-    if not metric_values:
-        return None
+    return metric_values
 
-    out = {}
-    for metric_name, pairs in metric_values.items():
-        values = [v for v, _ in pairs]
-        stderrs = [se for _, se in pairs]
 
-        entry = {
-            "max": round(max(values), 6),
-            "mean": round(statistics.mean(values), 6),
-            "median": round(statistics.median(values), 6),
-            "min": round(min(values), 6),
-        }
+def extract_benchmark_scores(
+    results_json_path, benchmark_name, subtasks=None, metrics_setup_entry=None,
+    stats=None,
+):
+    """Extract max/mean/median of all non-stderr metrics across prompt variants.
+
+    Returns dict {metric_name: ScoreRecord} holding "max", "mean", "median",
+    "min", "max_stderr", ... (see prompt_stats.aggregate_metric_values and
+    score_table.py), or None if no metrics found.
+    """
+    return to_records(aggregate_metric_values(collect_metric_values(
+        results_json_path, benchmark_name, subtasks, metrics_setup_entry, stats
+    )))
+
 
-        # max_stderr: stderr of the variant that achieved the max score
-        max_idx = values.index(max(values))
-        entry["max_prompt_idx"] = max_idx
-        if stderrs[max_idx] is not None:
-            entry["max_stderr"] = round(stderrs[max_idx], 6)
-
-        # min_stderr: stderr of the variant that achieved the min score
-        min_idx = values.index(min(values))
-        if stderrs[min_idx] is not None:
-            entry["min_stderr"] = round(stderrs[min_idx], 6)
-
-        # mean_stderr: sqrt(sum(se^2)) / n  (error propagation for mean)
-        if all(se is not None for se in stderrs):
-            n = len(stderrs)
-            mean_se = math.sqrt(sum(se**2 for se in stderrs)) / n
-            entry["mean_stderr"] = round(mean_se, 6)
-
-        # median_stderr: stderr of the variant closest to the median
-        med = statistics.median(values)
-        closest_idx = min(range(len(values)), key=lambda i: abs(values[i] - med))
-        if stderrs[closest_idx] is not None:
-            entry["median_stderr"] = round(stderrs[closest_idx], 6)
-
-        # Prompt-variant spread (for prompt deviation error bars)
-        entry["n_prompts"] = len(values)
-        if len(values) >= 2:
-            entry["prompt_sd"] = round(statistics.stdev(values), 6)
-            med_val = statistics.median(values)
-            entry["prompt_mad"] = round(
-                statistics.median([abs(v - med_val) for v in values]), 6
+def benchmark_config_key(benchmark, config):
+    """Hash everything besides the results file that affects a cell's scores.
+
+    Covers the benchmark's metrics_setup.yaml entry, its metric exclusions and
+    CACHE_VERSION, so editing any of them invalidates cached cells.
+    """
+    exclusions = EXCLUDED_METRICS | EXCLUDED_METRICS_PER_BENCHMARK.get(
+        benchmark, set()
+    )
+    payload = json.dumps(
+        {
+            "version": CACHE_VERSION,
+            "config": config,
+            "excluded_metrics": sorted(exclusions),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _file_sha1(path):
+    if isinstance(path, PrefetchedFile):
+        if path.data is not None:
+            return hashlib.sha1(path.data).hexdigest()
+        path = path.path
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class BuildCache:
+    """Persistent manifest of extracted scores per (model, benchmark, shot) cell.
+
+    Each cell is keyed by its shot directory relative to BASE_DIR and records
+    the latest results file together with its size, mtime and SHA-1.  A cell
+    is reused when the same file is still the latest one and its fingerprint
+    and benchmark config key are unchanged.  If only the mtime differs (e.g.
+    after a fresh git checkout) the content hash decides.  Cells read from a
+    results archive are identified by their archive key and blob SHA-1.
+
+    Cells not visited during a build are dropped when the manifest is saved.
+    A cache kept across rebuilds (build_watch.py) also reuses the cells
+    extracted by the earlier ones, which take precedence over the loaded
+    manifest.
+    Cached scores are read straight into ScoreRecords, which the build's
+    ScoreTables share.
+    """
+
+    def __init__(self, cells=None):
+        self.previous = cells or {}
+        self.current = {}
+        self.hits = 0
+        self.misses = 0
+        self._config_keys = {}
+
+    @classmethod
+    def load(cls, path):
+        """Load a manifest, returning an empty cache if missing or outdated."""
+        try:
+            with open(path) as f:
+                raw = json.load(f, object_hook=record_hook)
+        except (OSError, ValueError):
+            return cls()
+        if raw.get("version") != CACHE_VERSION:
+            return cls()
+        return cls(raw.get("cells", {}))
+
+    def save(self, path):
+        """Write the cells visited in this build, replacing the file atomically."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {"version": CACHE_VERSION, "cells": self.current},
+                f, ensure_ascii=False, default=json_default,
             )
+        os.replace(tmp_path, path)
+
+    def subset(self, prefix):
+        """Return a new cache holding only the known cells under prefix."""
+        prefix = prefix.rstrip(os.sep) + os.sep
+        return BuildCache({
+            key: entry for key, entry in {**self.previous, **self.current}.items()
+            if key.startswith(prefix)
+        })
+
+    def merge(self, other):
+        """Fold the cells visited by another (worker) cache into this one."""
+        self.current.update(other.current)
+        self.hits += other.hits
+        self.misses += other.misses
+
+    def _config_key(self, benchmark, config):
+        config_key = self._config_keys.get(benchmark)
+        if config_key is None:
+            config_key = benchmark_config_key(benchmark, config)
+            self._config_keys[benchmark] = config_key
+        return config_key
+
+    def _known(self, cell_key):
+        return self.current.get(cell_key) or self.previous.get(cell_key)
+
+    def fetch(self, cell_key, results_file, benchmark, config):
+        """Fetch a cell's results file for lookup() as a PrefetchedFile.
+
+        Only the stat result is fetched when it matches the cached
+        fingerprint, i.e. when lookup() will hit.  Any other file is read
+        once, so that lookup() hashes the same bytes the extraction parses.
+        Safe to call from Prefetcher threads.
+        """
+        if not isinstance(results_file, str):
+            return results_file
+        entry = self._known(cell_key)
+        if (
+            entry is not None
+            and entry["file"] == os.path.relpath(results_file, BASE_DIR)
+            and entry["config"] == self._config_key(benchmark, config)
+        ):
+            fetched = fetch_results_file(results_file, read=False)
+            if (entry["size"], entry["mtime_ns"]) == (fetched.stat.st_size,
+                                                      fetched.stat.st_mtime_ns):
+                return fetched
+        return fetch_results_file(results_file)
+
+    def lookup(self, cell_key, results_file, benchmark, config):
+        """Check the cache for a cell.
+
+        Returns (scores, None) on a hit.  On a miss returns (None, pending),
+        where pending must be handed to store() with the extracted scores.
+        """
+        config_key = self._config_key(benchmark, config)
+        if isinstance(results_file, ArchiveEntry):
+            # Archived blobs are content-addressed, so the SHA-1 is known upfront
+            file_id, size, mtime_ns = entry_key(results_file), results_file.length, None
+            digest = results_file.sha1
         else:
-            entry["prompt_sd"] = 0.0
-            entry["prompt_mad"] = 0.0
+            if isinstance(results_file, PrefetchedFile):
+                path, st = results_file.path, results_file.stat
+            else:
+                path, st = results_file, os.stat(results_file)
+            file_id = os.path.relpath(path, BASE_DIR)
+            size, mtime_ns = st.st_size, st.st_mtime_ns
+            digest = None
+        entry = self._known(cell_key)
+        if (
+            entry is not None
+            and entry["file"] == file_id
+            and entry["config"] == config_key
+            and entry["size"] == size
+        ):
+            if entry["mtime_ns"] != mtime_ns:
+                digest = digest or _file_sha1(results_file)
+                if digest == entry["sha1"]:
+                    entry = dict(entry, mtime_ns=mtime_ns)
+                else:
+                    entry = None
+            if entry is not None:
+                self.current[cell_key] = entry
+                self.hits += 1
+                return entry["scores"], None
+
+        return None, {
+            "file": file_id,
+            "size": size,
+            "mtime_ns": mtime_ns,
+            "sha1": digest or _file_sha1(results_file),
+            "config": config_key,
+        }
+
+    def store(self, cell_key, pending, scores):
+        """Record freshly extracted scores for a cell that lookup() missed."""
+        self.misses += 1
+        self.current[cell_key] = dict(pending, scores=scores)
+
+    def extract(self, cell_key, results_file, benchmark, config, stats=None):
+        """Return extract_benchmark_scores() output, reusing the cached copy if valid."""
+        scores, pending = self.lookup(cell_key, results_file, benchmark, config)
+        if pending is None:
+            return scores
+        agg = extract_benchmark_scores(
+            results_file, benchmark, config.get("subtasks"), config, stats
+        )
+        self.store(cell_key, pending, agg)
+        return agg
 
-        out[metric_name] = entry
-    return out
 
+def classify_checkpoint_dir(name, patterns=RUN_FAMILY_PATTERNS):
+    """Return (run, step) for a checkpoint directory name, or None.
 
-def process_model_dir(model_path, metrics_setup):
+    run is None for the main training run (see RUN_FAMILY_PATTERNS).
+    """
+    for pattern in patterns:
+        match = pattern.match(name)
+        if match:
+            return match.groupdict().get("run"), int(match["step"])
+    return None
+
+
+def process_model_dir(model_path, metrics_setup, cache=None, model_index=None,
+                      batch=False, stats=None, prefetch=0):
     """Process a single model/checkpoint directory, returning scores dict.
 
-    Returns (scores, discovered_metrics) where discovered_metrics is
+    model_index is this directory's entry from scan_results_root(); if omitted
+    the directory is scanned here.  If a BuildCache is given, unchanged cells
+    are served from it instead of re-parsing their results file.  With
+    batch=True the prompt-variant values of all re-extracted cells are
+    aggregated together by prompt_stats.aggregate_batch().  With prefetch > 1,
+    up to that many results files are read ahead concurrently (see prefetch.py).
+
+    If stats is a build_profile.new_dir_stats() dict, the directory's
+    processing time, results files and bytes read, and one
+    [benchmark, shot, seconds, cached] entry per cell are recorded in it.
+
+    Returns (scores, discovered_metrics) where scores is {benchmark: {shot:
+    {metric: ScoreRecord}}} and discovered_metrics is
     {benchmark: set_of_metric_names}.
     """
-    scores = {}
-    discovered_metrics = {}
+    start = time.perf_counter()
+    if model_index is None:
+        aliases = benchmark_aliases(metrics_setup)
+        model_index = resolve_aliases(scan_model_dir(
+            model_path, [*metrics_setup, *aliases], SHOT_DIRS.values()
+        ), aliases)
+    all_scores = {}
+    cells = []  # (benchmark, config, shot_key, cell_key, results_file)
     for benchmark, config in metrics_setup.items():
-        subtasks = config.get("subtasks")
-        bench_scores = {}
+        all_scores[benchmark] = {}
         for shot_key, shot_dir_name in SHOT_DIRS.items():
-            shot_path = os.path.join(model_path, benchmark, shot_dir_name)
-            if not os.path.isdir(shot_path):
-                continue
-            results_file = find_latest_results_json(shot_path)
-            if results_file is None:
-                continue
-            agg = extract_benchmark_scores(
-                results_file, benchmark, subtasks, config
-            )
-            if agg is not None:
-                bench_scores[shot_key] = agg
-                if benchmark not in discovered_metrics:
-                    discovered_metrics[benchmark] = set()
-                discovered_metrics[benchmark].update(agg.keys())
+            results_file = latest_results_file(model_index, benchmark, shot_dir_name)
+            if results_file is not None:
+                cell_key = os.path.relpath(
+                    os.path.join(model_path, benchmark, shot_dir_name), BASE_DIR
+                )
+                cells.append((benchmark, config, shot_key, cell_key, results_file))
+
+    batched = []  # (bench_scores, shot_key, cell_key, pending, metric_values)
+    with Prefetcher(prefetch) as prefetcher:
+        if cache is not None:
+            # Cache hits only need the stat; every other file is read once
+            files = prefetcher.map(lambda cell: cache.fetch(cell[3], cell[4], *cell[:2]),
+                                   cells)
+        elif prefetch > 1:
+            files = prefetcher.map(fetch_results_file, [cell[4] for cell in cells])
+        else:
+            files = [cell[4] for cell in cells]
+        for (benchmark, config, shot_key, cell_key, _), results_file in zip(cells, files):
+            subtasks = config.get("subtasks")
+            bench_scores = all_scores[benchmark]
+            cell_start = time.perf_counter()
+            misses = cache.misses if cache is not None else 0
+            if batch:
+                agg, pending = (
+                    cache.lookup(cell_key, results_file, benchmark, config)
+                    if cache is not None else (None, {})
+                )
+                if pending is not None:
+                    # Placeholder keeps the shot order; filled in after aggregation
+                    bench_scores[shot_key] = None
+                    batched.append((bench_scores, shot_key, cell_key, pending,
+                                    collect_metric_values(results_file, benchmark,
+                                                          subtasks, config, stats)))
+                    if stats is not None:
+                        stats["cells"].append([benchmark, shot_key,
+                                               time.perf_counter() - cell_start, False])
+                    continue
+            elif cache is not None:
+                agg = cache.extract(cell_key, results_file, benchmark, config, stats)
+            else:
+                agg = extract_benchmark_scores(
+                    results_file, benchmark, subtasks, config, stats
+                )
+            bench_scores[shot_key] = agg
+            if stats is not None:
+                cached = cache is not None and (batch or cache.misses == misses)
+                stats["cells"].append([benchmark, shot_key,
+                                       time.perf_counter() - cell_start, cached])
+
+    if batched:
+        aggs = aggregate_batch([metric_values for *_, metric_values in batched])
+        for (bench_scores, shot_key, cell_key, pending, _), agg in zip(batched, aggs):
+            agg = to_records(agg)
+            bench_scores[shot_key] = agg
+            if cache is not None:
+                cache.store(cell_key, pending, agg)
+
+    scores = {}
+    discovered_metrics = {}
+    for benchmark, bench_scores in all_scores.items():
+        bench_scores = {k: v for k, v in bench_scores.items() if v is not None}
         if bench_scores:
             scores[benchmark] = bench_scores
+            discovered_metrics[benchmark] = set()
+            for agg in bench_scores.values():
+                discovered_metrics[benchmark].update(agg.keys())
+    if stats is not None:
+        stats["seconds"] += time.perf_counter() - start
     return scores, discovered_metrics
 
 
+def _process_model_dir_job(model_path, metrics_setup, cache, model_index, batch,
+                           profile, prefetch):
+    """Process-pool entry point: returns the worker's cache and stats alongside the scores."""
+    stats = new_dir_stats() if profile else None
+    scores, disc = process_model_dir(model_path, metrics_setup, cache, model_index,
+                                     batch, stats, prefetch)
+    return scores, disc, cache, stats
+
+
+def process_model_dirs(model_paths, metrics_setup, cache=None, jobs=1,
+                       model_indexes=None, batch=False, stats=None, prefetch=0):
+    """Run process_model_dir over many directories, optionally in parallel.
+
+    model_indexes, if given, holds the scan_results_root() entry for each of
+    model_paths; batch and prefetch are passed on to process_model_dir().  If
+    stats is a list, one new_dir_stats() dict per directory is appended to it
+    as the results are yielded.
+
+    With jobs > 1 (or 0 for one worker per CPU) the directories are fanned out
+    to a process pool.  Each worker receives only the cache cells under its
+    own directory and hands back the updated cells, which are merged into
+    cache.  Results are yielded as (scores, discovered_metrics) in the order
+    of model_paths, so the output does not depend on jobs.
+    """
+    if model_indexes is None:
+        model_indexes = [None] * len(model_paths)
+    if jobs == 1 or len(model_paths) <= 1:
+        for model_path, model_index in zip(model_paths, model_indexes):
+            dir_stats = new_dir_stats() if stats is not None else None
+            result = process_model_dir(model_path, metrics_setup, cache, model_index,
+                                       batch, dir_stats, prefetch)
+            if stats is not None:
+                stats.append(dir_stats)
+            yield result
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs or None) as pool:
+        futures = [
+            pool.submit(
+                _process_model_dir_job, model_path, metrics_setup,
+                cache.subset(os.path.relpath(model_path, BASE_DIR))
+                if cache is not None else None,
+                model_index, batch, stats is not None, prefetch,
+            )
+            for model_path, model_index in zip(model_paths, model_indexes)
+        ]
+        for future in futures:
+            scores, disc, worker_cache, dir_stats = future.result()
+            if cache is not None:
+                cache.merge(worker_cache)
+            if stats is not None:
+                stats.append(dir_stats)
+            yield scores, disc
+
+
 def build_metrics_info(metrics_setup, discovered_metrics):
     """Build the metrics_setup section for data.json."""
     info = {}
@@ -440,105 +838,298 @@ def build_metrics_info(metrics_setup, discovered_metrics):
     return info
 
 
-def main():
-    metrics_setup = load_metrics_setup()
-    (MODEL_DISPLAY_NAMES, MODEL_CATEGORIES, MODEL_ORGANIZATIONS,
-     MODEL_PARAMETERS, DEFAULT_MODELS, MODEL_COLOR_MAP,
-     MODEL_INFO, MODEL_FULLY_OPEN) = load_models_setup()
-    (INSTRUCT_DISPLAY_NAMES, INSTRUCT_CATEGORIES, INSTRUCT_ORGANIZATIONS,
-     INSTRUCT_PARAMETERS, INSTRUCT_DEFAULT_MODELS, INSTRUCT_COLOR_MAP,
-     INSTRUCT_INFO, INSTRUCT_FULLY_OPEN) = load_instruct_models_setup()
+def build_norm_params(table, metrics_setup):
+    """Precompute the frontend's normalization parameters for one ScoreTable.
 
-    os.makedirs(OUTPUT_FILE.parent, exist_ok=True)
+    The population is every entity of the section (steps in ascending order
+    for progress and ablations), main metric only.  Returns
+    {shot: {prompt_agg: {benchmark: {"mean", "std", "sorted"}}}}, where mean
+    and std (population SD) drive z-score normalization and the ascending
+    values give min-max bounds and percentile ranks by binary search.
+    """
+    entities = list(table)
+    order = range(len(entities))
+    if all(isinstance(e, int) for e in entities):
+        order = sorted(order, key=entities.__getitem__)
+    params = {}
+    for shot in SHOT_SETTINGS:
+        for agg in PROMPT_AGGS:
+            for benchmark, config in metrics_setup.items():
+                column = table.column(benchmark, shot, config["main_metric"])
+                values = []
+                for i in order:
+                    record = column[i]
+                    value = getattr(record, agg) if record is not None else None
+                    if value is not None:
+                        values.append(value)
+                if not values:
+                    continue
+                # Same summation order as applyNorm() in app.js
+                total = 0.0
+                for v in values:
+                    total += v
+                mean = total / len(values)
+                ss = 0.0
+                for v in values:
+                    ss += (v - mean) ** 2
+                params.setdefault(shot, {}).setdefault(agg, {})[benchmark] = {
+                    "mean": mean,
+                    "std": math.sqrt(ss / len(values)),
+                    "sorted": sorted(values),
+                }
+    return params
 
-    # Process models in results/
-    models = {}
-    all_discovered_metrics = {}  # benchmark -> set of metric names
-    if RESULTS_DIR.is_dir():
-        for model_dir in sorted(os.listdir(RESULTS_DIR)):
-            model_path = RESULTS_DIR / model_dir
-            if not model_path.is_dir():
-                continue
-            print(f"Processing model: {model_dir}")
-            scores, disc = process_model_dir(str(model_path), metrics_setup)
-            models[model_dir] = scores
-            for bench, mset in disc.items():
-                if bench not in all_discovered_metrics:
-                    all_discovered_metrics[bench] = set()
-                all_discovered_metrics[bench].update(mset)
 
-    # Process instruct models in results-instruct/
-    instruct_models = {}
-    if RESULTS_INSTRUCT_DIR.is_dir():
-        for model_dir in sorted(os.listdir(RESULTS_INSTRUCT_DIR)):
-            model_path = RESULTS_INSTRUCT_DIR / model_dir
-            if not model_path.is_dir():
-                continue
-            print(f"Processing instruct model: {model_dir}")
-            scores, disc = process_model_dir(str(model_path), metrics_setup)
-            instruct_models[model_dir] = scores
-            for bench, mset in disc.items():
-                if bench not in all_discovered_metrics:
-                    all_discovered_metrics[bench] = set()
-                all_discovered_metrics[bench].update(mset)
+def build_progress_filter(progress, metrics_setup):
+    """Lay out the training-progress signal filter's inputs as step-aligned series.
 
-    # Process checkpoints in NorOLMo_progress/
-    progress = {}
-    if PROGRESS_DIR.is_dir():
-        for ckpt_dir in sorted(os.listdir(PROGRESS_DIR)):
-            ckpt_path = PROGRESS_DIR / ckpt_dir
-            if not ckpt_path.is_dir():
-                continue
-            parts = ckpt_dir.split("-")
-            step_str = parts[-1] if parts else ""
-            if not step_str.isdigit():
+    Returns {"steps": [ascending steps], "series": {shot: {benchmark:
+    {field: [value or None per step]}}}} for the main metric of the progress
+    ScoreTable, with one list per FILTER_SERIES_FIELDS entry.  The frontend builds prefix sums and a
+    range-maximum table over each series once per prompt aggregation and
+    normalization, so any step window is answered without rescanning the
+    progress section.
+    """
+    entities = list(progress)
+    order = sorted(range(len(entities)), key=entities.__getitem__)
+    series = {}
+    for shot in SHOT_SETTINGS:
+        for benchmark, config in metrics_setup.items():
+            column = progress.column(benchmark, shot, config["main_metric"])
+            entries = [column[i] for i in order]
+            if not any(entries):
                 continue
-            step = int(step_str)
-            print(f"Processing checkpoint: step {step}")
-            scores, disc = process_model_dir(str(ckpt_path), metrics_setup)
-            progress[step] = scores
-            for bench, mset in disc.items():
-                if bench not in all_discovered_metrics:
-                    all_discovered_metrics[bench] = set()
-                all_discovered_metrics[bench].update(mset)
+            series.setdefault(shot, {})[benchmark] = {
+                field: [getattr(entry, field) if entry else None
+                        for entry in entries]
+                for field in FILTER_SERIES_FIELDS
+            }
+    return {"steps": [entities[i] for i in order], "series": series}
+
 
-    ABLATION_NAME_MAP = {
-        "stage2-ablation-no-len-ext-stage1-data": "Stage 2 ablation (lr decay only)",
+def write_precompressed(path):
+    """Write path.gz (and path.br if the brotli module is installed) next to path.
+
+    Static servers configured for precompressed assets serve these directly
+    instead of compressing data.json and the shards on every request.  A
+    path.br left from a build with brotli is removed if it is not rewritten.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    sidecars = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        sidecars[".br"] = brotli.compress(data, quality=11)
+    for suffix, compressed in sidecars.items():
+        with open(str(path) + suffix, "wb") as f:
+            f.write(compressed)
+    remove_precompressed(path, keep=sidecars)
+
+
+def remove_precompressed(path, keep=()):
+    """Delete the .gz/.br sidecars of path (except the suffixes in keep).
+
+    Called for every file a build rewrites without --columnar, so that no
+    sidecar outlives the file it was compressed from.
+    """
+    for suffix in PRECOMPRESSED_SUFFIXES:
+        if suffix not in keep and os.path.exists(str(path) + suffix):
+            os.remove(str(path) + suffix)
+
+
+def _content_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()[:12]
+
+
+def write_asset_manifest(output_file=OUTPUT_FILE, data_files=()):
+    """Write the ASSET_MANIFEST next to output_file that docs/sw.js caches by.
+
+    Maps the STATIC_ASSETS, output_file itself and data_files (e.g. the
+    shards) to the first 12 hex digits of their SHA-1, keyed by path relative
+    to output_file's directory.  The service worker keeps one cached copy per
+    path and hash, so after a deploy browsers only download the files whose
+    hash changed.
+    """
+    docs_dir = Path(output_file).parent
+    manifest_file = docs_dir / ASSET_MANIFEST
+    files = [docs_dir / name for name in STATIC_ASSETS]
+    files += [Path(output_file), *map(Path, data_files)]
+    assets = {
+        Path(os.path.relpath(path, docs_dir)).as_posix(): _content_hash(path)
+        for path in files if path.exists()
     }
+    tmp = Path(str(manifest_file) + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump({"assets": dict(sorted(assets.items()))}, f, indent=2)
+        f.write("\n")
+    os.replace(tmp, manifest_file)
+    return assets
+
+
+def write_sharded_output(output, output_file=OUTPUT_FILE, shard_dir=SHARD_DIR,
+                         columnar=False, stream=False):
+    """Write output as a core manifest plus one shard file per score section.
+
+    Each section in SHARDED_SECTIONS is moved to
+    <shard_dir>/<section>.<hash>.json, where hash is derived from the shard
+    content, so unchanged sections keep their URL (and browser cache entry)
+    across rebuilds.  The manifest gets "shards" (section -> path relative to
+    output_file) and "shard_keys" (section -> entity keys), so model and
+    checkpoint names are known before any shard is fetched.  Shards from
+    previous builds that are no longer referenced are removed.
+
+    output is the data.json dict or an iterator of its (key, value) pairs
+    (iter_output); each shard is written as soon as its section arrives, and
+    not referenced here afterwards.  With columnar=True, shards hold
+    columnar.encode_section() tables and every written file gets
+    precompressed sidecars.  With stream=True each file is streamed to a
+    temporary file by json_stream.write_json() (hashed on the way) instead of
+    being serialized in memory first; the bytes are the same.
+
+    Returns {section: shard path}.
+    """
+    os.makedirs(shard_dir, exist_ok=True)
+    core = {}
+    shards = {}
+    shard_keys = {}
+    written = {}
+    for section, data in (output.items() if isinstance(output, dict) else output):
+        if section not in SHARDED_SECTIONS:
+            core[section] = data
+            continue
+        shard_keys[section] = [str(k) for k in data]
+        if columnar and section in SCORE_SECTIONS:
+            data = encode_section(section, data)
+        if stream:
+            tmp = Path(shard_dir) / f"{section}.json.tmp"
+            digest = write_json(None, data, tmp)[:12]
+            shard_path = Path(shard_dir) / f"{section}.{digest}.json"
+            if shard_path.exists():
+                os.remove(tmp)
+            else:
+                os.replace(tmp, shard_path)
+        else:
+            payload = json.dumps(
+                data, ensure_ascii=False, default=json_default
+            ).encode("utf-8")
+            digest = hashlib.sha1(payload).hexdigest()[:12]
+            shard_path = Path(shard_dir) / f"{section}.{digest}.json"
+            if not shard_path.exists():
+                tmp = shard_path.with_suffix(".json.tmp")
+                with open(tmp, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp, shard_path)
+            del payload
+        del data  # before the next section is produced
+        if columnar:
+            write_precompressed(shard_path)
+        else:
+            remove_precompressed(shard_path)
+        written[section] = shard_path
+        shards[section] = Path(
+            os.path.relpath(shard_path, Path(output_file).parent)
+        ).as_posix()
+    core["shards"] = {section: shards[section] for section in SHARDED_SECTIONS}
+    core["shard_keys"] = {section: shard_keys[section] for section in SHARDED_SECTIONS}
+
+    if stream:
+        write_json(output_file, core)
+    else:
+        tmp = Path(str(output_file) + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(core, f, ensure_ascii=False)
+        os.replace(tmp, output_file)
+    if columnar:
+        write_precompressed(output_file)
+    else:
+        remove_precompressed(output_file)
+
+    # Drop unreferenced shards of earlier builds, with their sidecars
+    keep = {p.name for p in written.values()}
+    for name in os.listdir(shard_dir):
+        base = name[:-3] if name.endswith(PRECOMPRESSED_SUFFIXES) else name
+        if base.endswith(".json") and base.split(".")[0] in SHARDED_SECTIONS and base not in keep:
+            os.remove(os.path.join(shard_dir, name))
+    return written
+
+
+def plan_units(results_index, instruct_index, progress_index):
+    """Assign every model/checkpoint directory to its place in the output.
+
+    Returns (units, sections).  sections holds the (still empty) "models",
+    "instruct_models" and "progress" ScoreTables, "ablations" (one ScoreTable
+    per ablation) and "ablation_display_names"; each unit is (target table,
+    key, directory, index entry, progress message), in output order, and its
+    scores are added to the target table under key.
+    """
+    units = []
+
+    # Models in results/
+    models = ScoreTable()
+    for model_dir, model_index in results_index.items():
+        units.append((models, model_dir, str(RESULTS_DIR / model_dir), model_index,
+                      f"Processing model: {model_dir}"))
+
+    # Instruct models in results-instruct/
+    instruct_models = ScoreTable()
+    for model_dir, model_index in instruct_index.items():
+        units.append((instruct_models, model_dir, str(RESULTS_INSTRUCT_DIR / model_dir),
+                      model_index, f"Processing instruct model: {model_dir}"))
+
+    # Checkpoints and ablation studies in NorOLMo_progress/, classified into
+    # run families in one pass (see RUN_FAMILY_PATTERNS)
+    progress = ScoreTable()
+    ablations = {}  # {ablation_name: ScoreTable of steps}
+    ablation_display_names = {}
+    for ckpt_dir, ckpt_index in progress_index.items():
+        family = classify_checkpoint_dir(ckpt_dir)
+        if family is None:
+            print(f"Warning: skipping {PROGRESS_DIR.name}/{ckpt_dir}: no run family "
+                  f"in RUN_FAMILY_PATTERNS matches it", file=sys.stderr)
+            continue
+        ablation_name, step = family
+        if ablation_name is None:
+            units.append((progress, step, str(PROGRESS_DIR / ckpt_dir), ckpt_index,
+                          f"Processing checkpoint: step {step}"))
+            continue
+        if ablation_name not in ablations:
+            ablations[ablation_name] = ScoreTable()
+            ablation_display_names[ablation_name] = ABLATION_NAME_MAP.get(
+                ablation_name, ablation_name.replace("-", " ").title()
+            )
+        units.append((ablations[ablation_name], step, str(PROGRESS_DIR / ckpt_dir),
+                      ckpt_index, f"Processing ablation {ablation_name}: step {step}"))
 
-    # Process ablation studies in NorOLMo_progress/
-    # Ablation dirs match pattern: NorOLMo-{ablation_name}-step-{N}
-    # where ablation_name is everything between "NorOLMo-" and the final "-step-{N}"
-    ablations = {}  # {ablation_name: {step: scores}}
-    ABLATION_DISPLAY_NAMES = {}
-    if PROGRESS_DIR.is_dir():
-        for ckpt_dir in sorted(os.listdir(PROGRESS_DIR)):
-            ckpt_path = PROGRESS_DIR / ckpt_dir
-            if not ckpt_path.is_dir():
-                continue
-            # Skip non-ablation dirs (already handled as regular progress)
-            if not ckpt_dir.startswith("NorOLMo-") or ckpt_dir.startswith("NorOLMo-step-"):
-                continue
-            parts = ckpt_dir.split("-")
-            step_str = parts[-1] if parts else ""
-            if not step_str.isdigit():
-                continue
-            step = int(step_str)
-            # Extract ablation name: everything between "NorOLMo-" and "-step-{N}"
-            suffix = ckpt_dir[len("NorOLMo-"):]  # e.g. "stage2-ablation-no-len-ext-stage1-data-step-29000"
-            ablation_name = suffix[:suffix.rfind("-step-")]  # e.g. "stage2-ablation-no-len-ext-stage1-data"
-            if ablation_name not in ablations:
-                ablations[ablation_name] = {}
-                ABLATION_DISPLAY_NAMES[ablation_name] = ABLATION_NAME_MAP.get(
-                    ablation_name, ablation_name.replace("-", " ").title()
-                )
-            print(f"Processing ablation {ablation_name}: step {step}")
-            scores, disc = process_model_dir(str(ckpt_path), metrics_setup)
-            ablations[ablation_name][step] = scores
-            for bench, mset in disc.items():
-                if bench not in all_discovered_metrics:
-                    all_discovered_metrics[bench] = set()
-                all_discovered_metrics[bench].update(mset)
+    sections = {
+        "models": models,
+        "instruct_models": instruct_models,
+        "progress": progress,
+        "ablations": ablations,
+        "ablation_display_names": ablation_display_names,
+    }
+    return units, sections
+
+
+def iter_output(metrics_setup, models_setup, instruct_setup, sections,
+                discovered_metrics):
+    """Yield data.json's (key, value) pairs in order from filled plan_units() sections.
+
+    models_setup and instruct_setup are the load_models_setup() and
+    load_instruct_models_setup() tuples.  The derived sections (metrics
+    info, normalization params, progress filter, significance) are computed
+    only when they are reached, so a streaming writer can write each one and
+    release it before the next is computed.
+    """
+    (MODEL_DISPLAY_NAMES, MODEL_CATEGORIES, MODEL_ORGANIZATIONS,
+     MODEL_PARAMETERS, DEFAULT_MODELS, MODEL_COLOR_MAP,
+     MODEL_INFO, MODEL_FULLY_OPEN) = models_setup
+    (INSTRUCT_DISPLAY_NAMES, INSTRUCT_CATEGORIES, INSTRUCT_ORGANIZATIONS,
+     INSTRUCT_PARAMETERS, INSTRUCT_DEFAULT_MODELS, INSTRUCT_COLOR_MAP,
+     INSTRUCT_INFO, INSTRUCT_FULLY_OPEN) = instruct_setup
+    models = sections["models"]
+    instruct_models = sections["instruct_models"]
+    progress = sections["progress"]
+    ablations = sections["ablations"]
 
     # Language benchmark lists
     nno_benchmarks = [b for b in metrics_setup if "_nno" in b]
@@ -551,9 +1142,8 @@ def main():
     # Benchmarks that belong to both Bokmål and Nynorsk
     shared_language_benchmarks = ["slide"]
 
-    # Build output
-    output = {
-        "metrics_setup": build_metrics_info(metrics_setup, all_discovered_metrics),
+    yield "metrics_setup", build_metrics_info(metrics_setup, discovered_metrics)
+    yield from {
         "task_groups": TASK_GROUPS,
         "standalone_benchmarks": STANDALONE_BENCHMARKS,
         "nno_benchmarks": sorted(nno_benchmarks),
@@ -580,21 +1170,333 @@ def main():
         "instruct_models": instruct_models,
         "progress": progress,
         "ablations": ablations,
-        "ablation_display_names": ABLATION_DISPLAY_NAMES,
+        "ablation_display_names": sections["ablation_display_names"],
+    }.items()
+    yield "norm_params", {
+        "models": build_norm_params(models, metrics_setup),
+        "instruct_models": build_norm_params(instruct_models, metrics_setup),
+        "progress": build_norm_params(progress, metrics_setup),
+        "ablations": {
+            name: build_norm_params(steps, metrics_setup)
+            for name, steps in ablations.items()
+        },
+    }
+    yield "progress_filter", build_progress_filter(progress, metrics_setup)
+    yield "significance", {
+        section: build_significance(sections[section], metrics_setup,
+                                    SHOT_SETTINGS, PROMPT_AGGS)
+        for section in SIGNIFICANCE_SECTIONS
     }
 
-    with open(OUTPUT_FILE, "w") as f:
-        json.dump(output, f, ensure_ascii=False)
+
+def _retain(pairs, kept, skip):
+    """Pass (key, value) pairs through, keeping those not in skip in kept."""
+    for key, value in pairs:
+        if key not in skip:
+            kept[key] = value
+        yield key, value
+        del value
+
+
+def assemble_output(metrics_setup, models_setup, instruct_setup, sections,
+                    discovered_metrics):
+    """Build the data.json dict from filled plan_units() sections (see iter_output)."""
+    return dict(iter_output(metrics_setup, models_setup, instruct_setup, sections,
+                            discovered_metrics))
+
+
+def write_output(output, single_file=False, columnar=False, output_file=OUTPUT_FILE,
+                 stream=False):
+    """Write output as data.json plus shards (or one file if single_file).
+
+    output is the data.json dict or an iterator of its (key, value) pairs,
+    as from iter_output().  data.json is replaced atomically, so a page
+    (re)loading during a rebuild never reads a partial file.  With
+    stream=True the files are written section by section (see
+    json_stream.py) rather than serialized whole in memory, and an iterator
+    is consumed one section at a time, so each derived section is written
+    before the next one is computed.  The asset manifest is rewritten to
+    match (see write_asset_manifest).  Returns write_sharded_output()'s shard
+    map ({} for single_file).
+    """
+    if not single_file:
+        shards = write_sharded_output(output, output_file, columnar=columnar,
+                                      stream=stream)
+        write_asset_manifest(output_file, shards.values())
+        return shards
+    pairs = iter(output.items() if isinstance(output, dict) else output)
+    if columnar:
+        pairs = (
+            (key, encode_section(key, value) if key in SCORE_SECTIONS else value)
+            for key, value in pairs
+        )
+    if stream:
+        write_json(output_file, pairs)
+    else:
+        tmp = Path(str(output_file) + ".tmp")
+        with open(tmp, "w") as f:
+            f.write(json.dumps(dict(pairs), ensure_ascii=False, default=json_default))
+        os.replace(tmp, output_file)
+    if columnar:
+        write_precompressed(output_file)
+    else:
+        remove_precompressed(output_file)
+    write_asset_manifest(output_file)
+    return {}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="ignore the build cache and re-extract every results file",
+    )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=1,
+        metavar="N",
+        help="process model/checkpoint directories in N worker processes "
+             "(0 = one per CPU; default: 1)",
+    )
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        default=0,
+        metavar="N",
+        help="keep up to N directory listings and results file reads in "
+             "flight ahead of processing, for high-latency filesystems such "
+             "as Lustre or NFS (see prefetch.py; default: 0 = off)",
+    )
+    parser.add_argument(
+        "--from-archive",
+        nargs="?",
+        const=str(BASE_DIR / "archive"),
+        metavar="DIR",
+        help="read results from a packed archive (see results_archive.py) "
+             "instead of walking the results trees (default DIR: archive/)",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="aggregate the prompt variants of each directory's re-extracted "
+             "cells in one vectorized NumPy pass (requires numpy)",
+    )
+    parser.add_argument(
+        "--single-file",
+        action="store_true",
+        help="write all sections into docs/data.json instead of a core "
+             "manifest plus per-section shards in docs/data/",
+    )
+    parser.add_argument(
+        "--columnar",
+        action="store_true",
+        help="encode the score sections as dictionary-encoded columns "
+             "(see columnar.py) and write .gz/.br sidecars",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="write data.json and the shards section by section through a "
+             "temporary file instead of serializing each file in memory "
+             "(same bytes; see json_stream.py)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=str(BASE_DIR / "build_profile.json"),
+        metavar="FILE",
+        help="write per-phase, per-root, slowest-directory and slowest-cell "
+             "timings as JSON (see build_profile.py; default FILE: "
+             "build_profile.json)",
+    )
+    parser.add_argument(
+        "--profile-stats",
+        metavar="FILE",
+        help="run the build under cProfile and dump pstats data to FILE "
+             "(main process only; -j workers are not included)",
+    )
+    parser.add_argument(
+        "--store",
+        default=str(STORE_FILE),
+        metavar="FILE",
+        help="SQLite store of the scores for `build_data.py query` (see "
+             "score_store.py; default: scores.sqlite)",
+    )
+    parser.add_argument(
+        "--no-store",
+        dest="store",
+        action="store_const",
+        const=None,
+        help="do not write the score store",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="after building, rebuild incrementally whenever results or YAML "
+             "configs change and serve docs/ with live reload (see build_watch.py)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8000,
+        help="port for --watch to serve docs/ on (0 = do not serve; default: 8000)",
+    )
+    args = parser.parse_args(argv)
+    if args.watch and args.from_archive:
+        parser.error("--watch reads the results trees; it cannot be used with --from-archive")
+    if args.batch and not HAVE_NUMPY:
+        parser.error("--batch requires numpy (pip install numpy)")
+    return args
+
+
+def build(args):
+    """Run the build for parsed command-line arguments."""
+    profile = BuildProfile()
+    metrics_setup = load_metrics_setup()
+    models_setup = load_models_setup()
+    instruct_setup = load_instruct_models_setup()
+
+    os.makedirs(OUTPUT_FILE.parent, exist_ok=True)
+    cache = BuildCache() if args.full else BuildCache.load(CACHE_FILE)
+
+    # Index each results root in a single directory walk, or from the archive;
+    # alias benchmark directories are folded into their canonical benchmark
+    aliases = benchmark_aliases(metrics_setup)
+    benchmarks = [*metrics_setup, *aliases]
+    shot_dirs = list(SHOT_DIRS.values())
+    if args.from_archive:
+        archive = ResultsArchive(args.from_archive)
+        print(f"Reading {len(archive)} results files from {archive.pack_path}")
+
+        def index_root(root):
+            source = os.path.relpath(root, BASE_DIR)
+            return archive.index_root(source, benchmarks, shot_dirs)
+    else:
+        def index_root(root):
+            return scan_results_root(root, benchmarks, shot_dirs, args.prefetch)
+
+    def timed_index_root(root):
+        start = time.perf_counter()
+        index = index_root(root)
+        for model_index in index.values():
+            resolve_aliases(model_index, aliases)
+        profile.add_scan(os.path.relpath(root, BASE_DIR), time.perf_counter() - start)
+        return index
+
+    with profile.phase("scan"):
+        results_index = timed_index_root(RESULTS_DIR)
+        instruct_index = timed_index_root(RESULTS_INSTRUCT_DIR)
+        progress_index = timed_index_root(PROGRESS_DIR)
+
+    # Collect every model/checkpoint directory to process, in output order
+    units, sections = plan_units(results_index, instruct_index, progress_index)
+    models = sections["models"]
+    instruct_models = sections["instruct_models"]
+    progress = sections["progress"]
+    ablations = sections["ablations"]
+
+    all_discovered_metrics = {}  # benchmark -> set of metric names
+    dir_stats = [] if args.profile else None
+    with profile.phase("process"):
+        results = process_model_dirs(
+            [model_path for _, _, model_path, _, _ in units],
+            metrics_setup, cache, args.jobs,
+            [model_index for _, _, _, model_index, _ in units],
+            args.batch, dir_stats, args.prefetch,
+        )
+        for target, key, _, _, message in units:
+            print(message)
+            scores, disc = next(results)
+            target.add(key, scores)
+            for bench, mset in disc.items():
+                if bench not in all_discovered_metrics:
+                    all_discovered_metrics[bench] = set()
+                all_discovered_metrics[bench].update(mset)
+    if dir_stats is not None:
+        for (_, _, model_path, _, _), stats in zip(units, dir_stats):
+            root, directory = os.path.split(os.path.relpath(model_path, BASE_DIR))
+            profile.add_dir(root, directory, stats)
+
+    if args.stream:
+        # Derived sections are computed while writing and dropped once
+        # written; the rest is kept for the score store
+        output = {}
+        with profile.phase("derive_serialize"):
+            shards = write_output(
+                _retain(iter_output(metrics_setup, models_setup, instruct_setup,
+                                    sections, all_discovered_metrics),
+                        output, DERIVED_SECTIONS),
+                args.single_file, args.columnar, stream=True,
+            )
+    else:
+        with profile.phase("derive"):
+            output = assemble_output(metrics_setup, models_setup, instruct_setup,
+                                     sections, all_discovered_metrics)
+        with profile.phase("serialize"):
+            shards = write_output(output, args.single_file, args.columnar)
+    if args.store:
+        with profile.phase("store"):
+            store_rows = write_store(output, args.store)
+    with profile.phase("cache_save"):
+        cache.save(CACHE_FILE)
 
     size_kb = os.path.getsize(OUTPUT_FILE) / 1024
     print(f"\nWritten {OUTPUT_FILE} ({size_kb:.1f} KB)")
-    print(f"  Models: {list(models.keys())}")
-    print(f"  Instruct models: {list(instruct_models.keys())}")
-    print(f"  Checkpoints: {sorted(progress.keys())}")
-    print(f"  Ablations: {list(ablations.keys())}")
+    for section, shard_path in shards.items():
+        shard_kb = os.path.getsize(shard_path) / 1024
+        print(f"  {section}: {os.path.relpath(shard_path, BASE_DIR)} ({shard_kb:.1f} KB)")
+    print(f"  Models: {list(models)}")
+    print(f"  Instruct models: {list(instruct_models)}")
+    print(f"  Checkpoints: {sorted(progress)}")
+    print(f"  Ablations: {list(ablations)}")
     for abl_name, abl_data in ablations.items():
-        print(f"    {abl_name}: steps {sorted(abl_data.keys())}")
+        print(f"    {abl_name}: steps {sorted(abl_data)}")
     print(f"  Benchmarks per model: {len(metrics_setup)}")
+    print(f"  Cache: {cache.hits} cells reused, {cache.misses} re-extracted")
+    if args.store:
+        print(f"  Score store: {os.path.relpath(args.store, BASE_DIR)} ({store_rows} rows; "
+              f"python3 build_data.py query --help)")
+
+    if args.profile:
+        profile.write(args.profile, extra={
+            "cache": {"hits": cache.hits, "misses": cache.misses},
+            "options": {
+                "full": args.full, "jobs": args.jobs, "batch": args.batch,
+                "from_archive": args.from_archive, "single_file": args.single_file,
+                "columnar": args.columnar, "stream": args.stream,
+            },
+        })
+        phases = ", ".join(f"{name} {seconds:.2f}s"
+                           for name, seconds in profile.phases.items())
+        print(f"  Profile: {args.profile} ({phases})")
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ["query"]:
+        from score_store import main as query
+
+        query(argv[1:])
+        return
+    args = parse_args(argv)
+    if args.watch:
+        from build_watch import watch  # imports this module
+
+        watch(args)
+        return
+    if not args.profile_stats:
+        build(args)
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(build, args)
+    finally:
+        profiler.dump_stats(args.profile_stats)
+    print(f"  cProfile stats: {args.profile_stats} "
+          f"(python3 -m pstats {args.profile_stats})")
 
 
 if __name__ == "__main__":
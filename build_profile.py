@@ -0,0 +1,99 @@
+"""Per-phase timing and I/O accounting for build_data.py --profile.
+
+BuildProfile collects:
+
+- wall time per build phase (scan, process, derive, serialize, ...);
+- per results root: time spent scanning it (the latest-file selection),
+  processing time, results files and bytes read/decoded, and cells taken
+  from the build cache versus re-extracted;
+- per model/checkpoint directory and per (benchmark, shot) cell: processing
+  time, so the slowest ones can be listed.
+
+Per-directory numbers come from the stats dicts that process_model_dir()
+fills in (also in worker processes), so they are CPU time of one worker,
+while phase times are wall time of the whole build.  report() turns all of
+it into a JSON-serializable dict.
+"""
+
+import json
+import time
+from contextlib import contextmanager
+
+ROOT_COUNTERS = ("files", "bytes_read", "bytes_decoded", "cells_extracted", "cells_cached")
+
+
+def new_dir_stats():
+    """Empty stats dict for process_model_dir()."""
+    return {"seconds": 0.0, "files": 0, "bytes_read": 0, "bytes_decoded": 0,
+            "cells": []}
+
+
+class BuildProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}  # name -> seconds, in first-seen order
+        self.roots = {}  # root -> counters
+        self.dirs = []  # (seconds, root, directory, stats)
+
+    @contextmanager
+    def phase(self, name):
+        """Add the wall time of the with-block to phase name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def _root(self, root):
+        if root not in self.roots:
+            self.roots[root] = dict.fromkeys(ROOT_COUNTERS, 0)
+            self.roots[root].update(scan_seconds=0.0, process_seconds=0.0)
+        return self.roots[root]
+
+    def add_scan(self, root, seconds):
+        self._root(root)["scan_seconds"] += seconds
+
+    def add_dir(self, root, directory, stats):
+        """Record the stats dict process_model_dir() filled for one directory."""
+        counters = self._root(root)
+        counters["process_seconds"] += stats["seconds"]
+        for key in ("files", "bytes_read", "bytes_decoded"):
+            counters[key] += stats[key]
+        for *_, cached in stats["cells"]:
+            counters["cells_cached" if cached else "cells_extracted"] += 1
+        self.dirs.append((stats["seconds"], root, directory, stats))
+
+    def report(self, top=10, extra=None):
+        """Return the profile as a dict; extra entries are merged in at the top level."""
+        cells = [
+            (seconds, root, directory, benchmark, shot, cached)
+            for _, root, directory, stats in self.dirs
+            for benchmark, shot, seconds, cached in stats["cells"]
+        ]
+        cells.sort(key=lambda c: -c[0])
+        slowest_dirs = sorted(self.dirs, key=lambda d: -d[0])[:top]
+        report = {
+            "total_seconds": round(time.perf_counter() - self.started, 6),
+            "phases": {name: round(seconds, 6) for name, seconds in self.phases.items()},
+            "roots": {
+                root: {k: round(v, 6) if isinstance(v, float) else v for k, v in counters.items()}
+                for root, counters in self.roots.items()
+            },
+            "slowest_dirs": [
+                {"root": root, "dir": directory, "seconds": round(seconds, 6),
+                 "files": stats["files"], "bytes_read": stats["bytes_read"]}
+                for seconds, root, directory, stats in slowest_dirs
+            ],
+            "slowest_cells": [
+                {"root": root, "dir": directory, "benchmark": benchmark, "shot": shot,
+                 "seconds": round(seconds, 6), "cached": cached}
+                for seconds, root, directory, benchmark, shot, cached in cells[:top]
+            ],
+        }
+        report.update(extra or {})
+        return report
+
+    def write(self, path, top=10, extra=None):
+        with open(path, "w") as f:
+            json.dump(self.report(top, extra), f, indent=2)
+            f.write("\n")
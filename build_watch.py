@@ -0,0 +1,375 @@
+"""Watch mode for build_data.py: incremental rebuilds plus a live-reload server.
+
+python3 build_data.py --watch builds once, then polls the results roots and
+the YAML configs.  Results roots are polled through directory mtimes (a new
+results_*.json changes the mtime of the directory it lands in), which takes
+a stat per known directory instead of a full walk.  The results files of a
+changed directory are then also polled by size and mtime until the next
+successful rebuild, so a rebuild that failed on a half-written file is
+retried once the write completes.  When a model/checkpoint
+directory changes, only that directory is re-indexed and re-processed (the
+build cache skips its unchanged cells); every other directory's scores are
+reused from memory.  The derived sections are recomputed and data.json and
+its shards rewritten atomically.  A YAML change reloads the configs and
+re-processes everything, which the build cache keeps cheap.  The build cache
+and the score store are only written when watch mode stops, as they take
+longer than a rebuild.
+
+docs/ is served on http://localhost:PORT with a server-sent events endpoint
+(LIVE_RELOAD_PATH) that app.js listens to when loaded from localhost; the
+page reloads, keeping its URL state, after every successful rebuild.
+"""
+
+import http.server
+import os
+import threading
+import time
+
+from build_data import (
+    BASE_DIR,
+    CACHE_FILE,
+    OUTPUT_FILE,
+    PROGRESS_DIR,
+    RESULTS_DIR,
+    RESULTS_INSTRUCT_DIR,
+    SHOT_DIRS,
+    BuildCache,
+    assemble_output,
+    load_instruct_models_setup,
+    load_metrics_setup,
+    load_models_setup,
+    plan_units,
+    process_model_dirs,
+    write_output,
+)
+from results_index import (
+    benchmark_aliases,
+    resolve_aliases,
+    scan_model_dir,
+    scan_results_root,
+)
+from score_store import write_store
+
+ROOTS = [str(RESULTS_DIR), str(RESULTS_INSTRUCT_DIR), str(PROGRESS_DIR)]
+CONFIG_FILES = [
+    str(BASE_DIR / "metrics_setup.yaml"),
+    str(BASE_DIR / "models_setup.yaml"),
+    str(BASE_DIR / "models_instruct_setup.yaml"),
+]
+POLL_SECONDS = 0.25
+MAX_RETRIES = 8  # polls to retry a failed rebuild for (a file may be half-written)
+LIVE_RELOAD_PATH = "/__livereload"
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _fingerprint(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+class TreeSnapshot:
+    """Directory mtimes below the results roots, for cheap change polling.
+
+    Results files in changed directories are polled by (size, mtime) until
+    settle() is called, as writing to a file does not touch its directory.
+    """
+
+    def __init__(self, roots):
+        self.roots = roots
+        self.mtimes = {}
+        self.files = {}  # results file -> (size, mtime) of recently changed dirs
+        for root in roots:
+            self._add_tree(root)
+
+    def _add_tree(self, path):
+        for dirpath, dirnames, _ in os.walk(path):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            self.mtimes[dirpath] = _mtime(dirpath)
+
+    def _owner(self, path):
+        """Return (root, model) for a directory below a root, or (root, None) for the root."""
+        for root in self.roots:
+            if path == root:
+                return root, None
+            if path.startswith(root + os.sep):
+                return root, os.path.relpath(path, root).split(os.sep)[0]
+        return None
+
+    def poll(self):
+        """Return the (root, model) directories that changed since the last poll.
+
+        model is None if the root itself changed (directories added or
+        removed); the caller then re-lists it.
+        """
+        changed = set()
+        for path, fingerprint in list(self.files.items()):
+            current = _fingerprint(path)
+            if current == fingerprint:
+                continue
+            changed.add(self._owner(path))
+            if current is None:
+                del self.files[path]
+            else:
+                self.files[path] = current
+        for path, mtime in list(self.mtimes.items()):
+            current = _mtime(path)
+            if current == mtime or path not in self.mtimes:
+                continue
+            changed.add(self._owner(path))
+            if current is None:  # removed, with everything below it
+                for sub in [p for p in self.mtimes if p == path or p.startswith(path + os.sep)]:
+                    del self.mtimes[sub]
+                continue
+            self.mtimes[path] = current
+            try:
+                with os.scandir(path) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            new_dirs = [e.path for e in entries if e.is_dir() and not e.name.startswith(".")
+                        and e.path not in self.mtimes]
+            for e in entries:
+                if (e.name.startswith("results_") and e.name.endswith(".json")
+                        and e.path not in self.files):
+                    self.files[e.path] = _fingerprint(e.path)
+            for sub in new_dirs:
+                self._add_tree(sub)
+        changed.discard(None)
+        return changed
+
+    def settle(self):
+        """Stop polling the results files once a rebuild has read them."""
+        self.files.clear()
+
+
+class IncrementalBuild:
+    """In-memory build state: indexes and per-directory scores of the last build."""
+
+    def __init__(self, args):
+        self.args = args
+        self.cache = BuildCache() if args.full else BuildCache.load(CACHE_FILE)
+        self.indexes = {}  # root -> {model: model index}
+        self.results = {}  # directory -> (scores, discovered metrics)
+        self.output = None  # of the last rebuild, for the score store
+
+    def _scan_model(self, root, model):
+        path = os.path.join(root, model)
+        return resolve_aliases(
+            scan_model_dir(path, self.benchmarks, SHOT_DIRS.values()), self.aliases
+        )
+
+    def build_all(self):
+        """Reload the configs, re-index every root and process every directory."""
+        self.metrics_setup = load_metrics_setup()
+        self.models_setup = load_models_setup()
+        self.instruct_setup = load_instruct_models_setup()
+        self.aliases = benchmark_aliases(self.metrics_setup)
+        self.benchmarks = [*self.metrics_setup, *self.aliases]
+        self.indexes = {}
+        for root in ROOTS:
+            index = scan_results_root(root, self.benchmarks, SHOT_DIRS.values(),
+                                      self.args.prefetch)
+            for model_index in index.values():
+                resolve_aliases(model_index, self.aliases)
+            self.indexes[root] = index
+        self.results = {}
+        return self.rebuild(set())
+
+    def update(self, changed):
+        """Re-index the changed (root, model) directories and rebuild."""
+        dirty = set()
+        for root, model in changed:
+            index = self.indexes[root]
+            if model is None:
+                try:
+                    listing = {
+                        e.name for e in os.scandir(root)
+                        if e.is_dir() and not e.name.startswith(".")
+                    }
+                except OSError:
+                    listing = set()
+                for gone in set(index) - listing:
+                    del index[gone]
+                models = listing - set(index)
+            else:
+                models = {model}
+            for name in models:
+                if os.path.isdir(os.path.join(root, name)):
+                    index[name] = self._scan_model(root, name)
+                    dirty.add(os.path.join(root, name))
+                else:
+                    index.pop(name, None)
+        for root in {root for root, _ in changed}:
+            # Keep the scan_results_root() order (sorted by name)
+            self.indexes[root] = dict(sorted(self.indexes[root].items()))
+        return self.rebuild(dirty)
+
+    def rebuild(self, dirty):
+        """Process the dirty (and never processed) directories and rewrite the output.
+
+        Returns the number of directories processed.
+        """
+        units, sections = plan_units(*(self.indexes[root] for root in ROOTS))
+        todo = [
+            (model_path, model_index)
+            for _, _, model_path, model_index, _ in units
+            if model_path in dirty or model_path not in self.results
+        ]
+        processed = process_model_dirs(
+            [model_path for model_path, _ in todo], self.metrics_setup, self.cache,
+            self.args.jobs, [model_index for _, model_index in todo], self.args.batch,
+            prefetch=self.args.prefetch,
+        )
+        for (model_path, _), result in zip(todo, processed):
+            self.results[model_path] = result
+
+        discovered = {}
+        live = set()
+        for target, key, model_path, _, _ in units:
+            scores, disc = self.results[model_path]
+            target.add(key, scores)
+            live.add(model_path)
+            for bench, mset in disc.items():
+                discovered.setdefault(bench, set()).update(mset)
+        for model_path in set(self.results) - live:
+            del self.results[model_path]
+
+        self.output = assemble_output(self.metrics_setup, self.models_setup,
+                                      self.instruct_setup, sections, discovered)
+        write_output(self.output, self.args.single_file, self.args.columnar,
+                     stream=self.args.stream)
+        return len(todo)
+
+    def save(self):
+        """Write the build cache and the score store of the last rebuild."""
+        self.cache.save(CACHE_FILE)
+        if self.args.store and self.output is not None:
+            write_store(self.output, self.args.store)
+            print(f"Score store written to {self.args.store}")
+
+
+class LiveReload:
+    """Build version shared between the watch loop and the event streams."""
+
+    def __init__(self):
+        self.version = f"{time.time_ns()}-0"
+        self._builds = 0
+        self._cond = threading.Condition()
+
+    def bump(self):
+        with self._cond:
+            self._builds += 1
+            self.version = f"{self.version.split('-')[0]}-{self._builds}"
+            self._cond.notify_all()
+
+    def wait(self, seen, timeout):
+        """Return the current version once it differs from seen, or after timeout."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.version != seen, timeout)
+            return self.version
+
+
+def serve(live, port):
+    """Serve docs/ and LIVE_RELOAD_PATH on localhost:port in a background thread."""
+    docs_dir = str(OUTPUT_FILE.parent)
+
+    class Handler(http.server.SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=docs_dir, **kwargs)
+
+        def end_headers(self):
+            # Always revalidate, so a reload picks up the rewritten data.json
+            self.send_header("Cache-Control", "no-cache")
+            super().end_headers()
+
+        def do_GET(self):
+            if self.path.split("?")[0] != LIVE_RELOAD_PATH:
+                return super().do_GET()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            seen = None
+            try:
+                while True:
+                    version = live.wait(seen, 15)
+                    if version == seen:
+                        self.wfile.write(b": keepalive\n\n")
+                    else:
+                        self.wfile.write(f"data: {version}\n\n".encode("ascii"))
+                        seen = version
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, format, *args):
+            pass  # keep the console for build messages
+
+    server = http.server.ThreadingHTTPServer(("localhost", port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def watch(args):
+    """Build, then rebuild incrementally on every change until interrupted."""
+    build = IncrementalBuild(args)
+    live = LiveReload()
+    start = time.perf_counter()
+    print("Building...")
+    count = build.build_all()
+    print(f"Built {count} directories in {time.perf_counter() - start:.2f}s")
+    snapshot = TreeSnapshot(ROOTS)
+    config_mtimes = {path: _mtime(path) for path in CONFIG_FILES}
+    if args.port:
+        serve(live, args.port)
+        print(f"Serving {OUTPUT_FILE.parent} on http://localhost:{args.port}/ "
+              f"(live reload on)")
+    print("Watching for changes (Ctrl-C to stop)")
+
+    pending = set()
+    retries = 0  # polls left to retry a failed rebuild without new changes
+    try:
+        while True:
+            time.sleep(POLL_SECONDS)
+            changed = snapshot.poll()
+            current = {path: _mtime(path) for path in CONFIG_FILES}
+            config_changed = current != config_mtimes
+            if not changed and not config_changed and not retries:
+                continue
+            pending |= changed
+            start = time.perf_counter()
+            misses = build.cache.misses
+            try:
+                if config_changed:
+                    count = build.build_all()
+                    config_mtimes = current
+                else:
+                    count = build.update(pending)
+            except Exception as e:  # e.g. a results file still being written
+                # pending is kept, and the snapshot keeps polling its files
+                retries = retries - 1 if retries else MAX_RETRIES
+                if not retries:
+                    print(f"Rebuild failed, waiting for the next change: {e!r}")
+                continue
+            retries = 0
+            snapshot.settle()
+            names = sorted(os.path.relpath(os.path.join(root, model or ""), BASE_DIR)
+                           for root, model in pending)
+            pending = set()
+            live.bump()
+            print(f"Rebuilt in {time.perf_counter() - start:.2f}s: "
+                  f"{'configs, ' if config_changed else ''}{', '.join(names) or '-'} "
+                  f"({count} directories, {build.cache.misses - misses} cells re-extracted)")
+    except KeyboardInterrupt:
+        print("\nStopping")
+    finally:
+        build.save()
@@ -1,18 +1,41 @@
 """Check for missing evaluation results across all models and checkpoints.
 
 Reads metrics_setup.yaml as the canonical list of expected benchmarks,
-then checks that every model/checkpoint has all benchmarks x shot settings
-with valid results JSON files containing the expected main_metric.
+then checks that every model/checkpoint in results/, results-instruct/ and
+NorOLMo_progress/ has all benchmarks x shot settings with valid results JSON
+files containing the expected main_metric.
+
+With --since REV (or --changed-only, for uncommitted changes against HEAD)
+only the model/checkpoint directories touched by the git diff are checked,
+plus every benchmark whose metrics_setup.yaml entry changed; other
+directories are never walked.  --json prints a machine-readable report and
+exits with status 1 if anything is missing, for use as a CI gate.
 """
 
-import os
-import glob
+import argparse
 import json
+import os
+import subprocess
+import sys
 
 import yaml
 
+from results_index import (
+    benchmark_aliases,
+    read_results_sections,
+    rename_alias_tasks,
+    resolve_aliases,
+    scan_model_dir,
+    scan_results_root,
+)
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 SHOT_SETTINGS = ["0-shot", "1-shot", "5-shot"]
+ROOTS = {  # root directory -> what its subdirectories are
+    "results": "models",
+    "results-instruct": "instruct models",
+    "NorOLMo_progress": "checkpoints",
+}
 
 
 def load_metrics_setup():
@@ -22,152 +45,296 @@ def load_metrics_setup():
         return yaml.safe_load(f)
 
 
-def find_results_json(path, latest_only=False):
-    """Find results_*.json files under path. If latest_only, return only the newest."""
-    files = glob.glob(os.path.join(path, "**", "results_*.json"), recursive=True)
-    if latest_only and len(files) > 1:
-        files.sort(key=os.path.getmtime)
-        return [files[-1]]
-    return files
+def check_model_dir(model_index, benchmarks):
+    """Check a single model directory for missing benchmarks/shots.
 
-
-def check_model_dir(model_path, benchmarks):
-    """Check a single model directory for missing benchmarks/shots."""
+    model_index is the model's entry from results_index.scan_results_root().
+    """
     missing = []
     for benchmark in benchmarks:
-        bench_path = os.path.join(model_path, benchmark)
-        if not os.path.isdir(bench_path):
+        shots = model_index.get(benchmark)
+        if shots is None:
             missing.append((benchmark, "ALL", "benchmark directory missing"))
             continue
         for shot in SHOT_SETTINGS:
-            shot_path = os.path.join(bench_path, shot)
-            if not os.path.isdir(shot_path):
+            cell = shots.get(shot)
+            if cell is None:
                 missing.append((benchmark, shot, "shot directory missing"))
                 continue
-            results = find_results_json(shot_path)
-            if not results:
+            if not cell.files:
                 missing.append((benchmark, shot, "no results JSON found"))
     return missing
 
 
-def check_main_metrics(base_paths, metrics_setup):
-    """Check that each results JSON contains its expected main_metric.
+def check_main_metrics(root_indexes, metrics_setup):
+    """Check that each latest results JSON contains its expected main_metric.
 
-    For benchmarks with subtasks (e.g. noreval_multiblimp), also checks
-    that all expected subtask entries are present in the results.
+    root_indexes is a list of scan_results_root() maps.  For benchmarks with
+    subtasks (e.g. noreval_multiblimp), also checks that all expected
+    subtask entries are present in the results.
     """
     issues = []
-    for base_path in base_paths:
-        if not os.path.isdir(base_path):
-            continue
-        for model_dir in sorted(os.listdir(base_path)):
-            model_path = os.path.join(base_path, model_dir)
-            if not os.path.isdir(model_path):
-                continue
+    for root_index in root_indexes:
+        for model_dir, model_index in root_index.items():
             for benchmark, config in metrics_setup.items():
                 main_metric = config["main_metric"]
                 metric_key = f"{main_metric},none"
                 subtasks = config.get("subtasks", {})
-                bench_path = os.path.join(model_path, benchmark)
-                if not os.path.isdir(bench_path):
+                shots = model_index.get(benchmark)
+                if shots is None:
                     continue
                 for shot in SHOT_SETTINGS:
-                    shot_path = os.path.join(bench_path, shot)
-                    if not os.path.isdir(shot_path):
+                    cell = shots.get(shot)
+                    if cell is None or cell.latest is None:
+                        continue
+                    results_file = cell.latest
+                    try:
+                        results = rename_alias_tasks(
+                            read_results_sections(results_file, ("results",))
+                            .get("results", {}),
+                            benchmark, config.get("aliases"),
+                        )
+                    except Exception as e:
+                        issues.append((
+                            model_dir, benchmark, shot, results_file,
+                            f"error reading JSON: {e}",
+                        ))
                         continue
-                    for results_file in find_results_json(shot_path, latest_only=True):
-                        try:
-                            with open(results_file) as f:
-                                data = json.load(f)
-                            results = data.get("results", {})
-
-                            # Check main_metric in all result entries
-                            for task_name, task_results in results.items():
-                                if metric_key not in task_results:
-                                    issues.append((
-                                        model_dir, benchmark, shot, task_name,
-                                        f"missing {metric_key}",
-                                    ))
-
-                            # For benchmarks with subtasks, check each expected subtask
-                            if subtasks:
-                                for subtask_key in subtasks:
-                                    full_key = f"{benchmark}_{subtask_key}"
-                                    if full_key not in results:
-                                        issues.append((
-                                            model_dir, benchmark, shot, full_key,
-                                            "missing subtask entry",
-                                        ))
-                        except Exception as e:
+
+                    # Check main_metric in all result entries
+                    for task_name, task_results in results.items():
+                        if metric_key not in task_results:
                             issues.append((
-                                model_dir, benchmark, shot, results_file,
-                                f"error reading JSON: {e}",
+                                model_dir, benchmark, shot, task_name,
+                                f"missing {metric_key}",
                             ))
+
+                    # For benchmarks with subtasks, check each expected subtask
+                    if subtasks:
+                        for subtask_key in subtasks:
+                            full_key = f"{benchmark}_{subtask_key}"
+                            if full_key not in results:
+                                issues.append((
+                                    model_dir, benchmark, shot, full_key,
+                                    "missing subtask entry",
+                                ))
     return issues
 
 
-def main():
-    metrics_setup = load_metrics_setup()
-    benchmarks = sorted(metrics_setup.keys())
-    found_issues = False
-
-    # Check results/ (cross-model comparison)
-    results_dir = os.path.join(BASE_DIR, "results")
-    if os.path.isdir(results_dir):
-        models = sorted(os.listdir(results_dir))
-        print(f"=== results/ ({len(models)} models, {len(benchmarks)} expected benchmarks) ===\n")
-        for model in models:
-            model_path = os.path.join(results_dir, model)
-            if not os.path.isdir(model_path):
-                continue
-            missing = check_model_dir(model_path, benchmarks)
-            if missing:
-                found_issues = True
-                print(f"  {model}:")
-                for bench, shot, reason in missing:
-                    print(f"    MISSING: {bench} / {shot} — {reason}")
-                print()
-            else:
-                print(f"  {model}: OK ({len(benchmarks)} benchmarks x {len(SHOT_SETTINGS)} shots)")
+def _git(*args):
+    """Run a git command in the repository and return its stdout."""
+    return subprocess.run(
+        ["git", *args], cwd=BASE_DIR, check=True, capture_output=True, text=True
+    ).stdout
+
+
+def changed_paths(since=None):
+    """Paths (relative to BASE_DIR) changed since git revision since.
+
+    Compares the working tree against since (HEAD if None) and includes
+    untracked files, so uncommitted results are picked up as well.
+    """
+    paths = _git("diff", "--name-only", "--relative", since or "HEAD", "--").splitlines()
+    paths += _git("ls-files", "--others", "--exclude-standard").splitlines()
+    return sorted(set(paths))
+
+
+def changed_model_dirs(paths):
+    """Map each results root to the set of its model directories in paths."""
+    dirs = {root: set() for root in ROOTS}
+    for path in paths:
+        parts = path.split("/")
+        if len(parts) >= 3 and parts[0] in ROOTS:
+            dirs[parts[0]].add(parts[1])
+    return dirs
+
+
+def changed_benchmarks(metrics_setup, since=None):
+    """Benchmarks whose metrics_setup.yaml entry differs from revision since."""
+    try:
+        old = yaml.safe_load(_git("show", f"{since or 'HEAD'}:./metrics_setup.yaml"))
+    except subprocess.CalledProcessError:  # file did not exist at since
+        old = None
+    old = old or {}
+    return sorted(b for b, config in metrics_setup.items() if old.get(b) != config)
+
 
-    # Check NorOLMo_progress/ (training checkpoints)
-    progress_dir = os.path.join(BASE_DIR, "NorOLMo_progress")
-    if os.path.isdir(progress_dir):
-        checkpoints = sorted(
-            os.listdir(progress_dir),
+def _dir_order(root, names):
+    if root == "NorOLMo_progress":
+        return sorted(
+            names,
             key=lambda x: int(x.split("-")[-1]) if x.split("-")[-1].isdigit() else 0,
         )
-        print(f"\n=== NorOLMo_progress/ ({len(checkpoints)} checkpoints) ===\n")
-        for ckpt in checkpoints:
-            ckpt_path = os.path.join(progress_dir, ckpt)
-            if not os.path.isdir(ckpt_path):
-                continue
-            missing = check_model_dir(ckpt_path, benchmarks)
+    return sorted(names)
+
+
+def index_roots(benchmarks, scope=None, aliases=None):
+    """Index the results roots for checking.
+
+    Returns {root: {model: (model_index, expected_benchmarks)}}.  Without a
+    scope every directory is indexed and expected to have all benchmarks.
+    scope is (changed_dirs, changed_benchmarks) from changed_model_dirs()
+    and changed_benchmarks(): changed directories are checked in full, all
+    other directories only for the changed benchmarks.  aliases is
+    benchmark_aliases() output; alias directories count as their canonical
+    benchmark.
+    """
+    aliases = aliases or {}
+
+    def scan(scan_fn, path, wanted):
+        wanted_aliases = {a: b for a, b in aliases.items() if b in wanted}
+        return scan_fn(path, [*wanted, *wanted_aliases], SHOT_SETTINGS), wanted_aliases
+
+    indexes = {}
+    for root in ROOTS:
+        root_dir = os.path.join(BASE_DIR, root)
+        if not os.path.isdir(root_dir):
+            continue
+        if scope is None:
+            root_index, root_aliases = scan(scan_results_root, root_dir, benchmarks)
+            index = {
+                model: (resolve_aliases(model_index, root_aliases), benchmarks)
+                for model, model_index in root_index.items()
+            }
+        else:
+            dirs, bench_changes = scope
+            index = {}
+            if bench_changes:
+                root_index, root_aliases = scan(scan_results_root, root_dir, bench_changes)
+                for model, model_index in root_index.items():
+                    index[model] = (resolve_aliases(model_index, root_aliases),
+                                    bench_changes)
+            for model in dirs[root]:
+                model_path = os.path.join(root_dir, model)
+                if os.path.isdir(model_path):  # skip deleted directories
+                    model_index, model_aliases = scan(scan_model_dir, model_path,
+                                                      benchmarks)
+                    index[model] = (resolve_aliases(model_index, model_aliases),
+                                    benchmarks)
+        indexes[root] = {model: index[model] for model in _dir_order(root, index)}
+    return indexes
+
+
+def run_checks(indexes, metrics_setup):
+    """Run the completeness and main_metric checks over index_roots() output.
+
+    Returns a JSON-serializable report with one entry per problem.
+    """
+    missing = []
+    metric_issues = []
+    for root, index in indexes.items():
+        for model, (model_index, benchmarks) in index.items():
+            for bench, shot, reason in check_model_dir(model_index, benchmarks):
+                missing.append({"root": root, "model": model, "benchmark": bench,
+                                "shot": shot, "reason": reason})
+        root_index = {model: model_index for model, (model_index, _) in index.items()}
+        for model, bench, shot, task, reason in check_main_metrics(
+            [root_index], metrics_setup
+        ):
+            metric_issues.append({"root": root, "model": model, "benchmark": bench,
+                                  "shot": shot, "task": task, "reason": reason})
+    return {
+        "ok": not missing and not metric_issues,
+        "checked": {root: sorted(index) for root, index in indexes.items()},
+        "missing": missing,
+        "metric_issues": metric_issues,
+    }
+
+
+def print_report(report, indexes, benchmarks):
+    """Print run_checks() output in the human-readable format."""
+    missing_by_dir = {}
+    for entry in report["missing"]:
+        missing_by_dir.setdefault((entry["root"], entry["model"]), []).append(entry)
+
+    for root, index in indexes.items():
+        if root == "results":
+            print(f"=== {root}/ ({len(index)} {ROOTS[root]}, "
+                  f"{len(benchmarks)} expected benchmarks) ===\n")
+        else:
+            print(f"\n=== {root}/ ({len(index)} {ROOTS[root]}) ===\n")
+        for model, (_, expected) in index.items():
+            missing = missing_by_dir.get((root, model))
             if missing:
-                found_issues = True
-                print(f"  {ckpt}:")
-                for bench, shot, reason in missing:
-                    print(f"    MISSING: {bench} / {shot} — {reason}")
+                print(f"  {model}:")
+                for entry in missing:
+                    print(f"    MISSING: {entry['benchmark']} / {entry['shot']} — "
+                          f"{entry['reason']}")
                 print()
             else:
-                print(f"  {ckpt}: OK")
+                print(f"  {model}: OK ({len(expected)} benchmarks x "
+                      f"{len(SHOT_SETTINGS)} shots)")
 
     # Check that main_metric exists in every results JSON
     print(f"\n=== main_metric integrity check ===\n")
-    base_paths = [results_dir, progress_dir]
-    metric_issues = check_main_metrics(base_paths, metrics_setup)
-    if metric_issues:
-        found_issues = True
-        for model, bench, shot, task, reason in metric_issues:
-            print(f"  {model} / {bench} / {shot} / {task} — {reason}")
+    if report["metric_issues"]:
+        for entry in report["metric_issues"]:
+            print(f"  {entry['model']} / {entry['benchmark']} / {entry['shot']} / "
+                  f"{entry['task']} — {entry['reason']}")
     else:
         print("  All results contain their expected main_metric.")
 
-    if not found_issues:
+    if report["ok"]:
         print("\n\nAll evaluations complete!")
     else:
         print("\n\nSome evaluations are missing (see above).")
 
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    scope = parser.add_mutually_exclusive_group()
+    scope.add_argument(
+        "--since",
+        metavar="REV",
+        help="only check directories changed since git revision REV (and "
+             "benchmarks whose metrics_setup.yaml entry changed)",
+    )
+    scope.add_argument(
+        "--changed-only",
+        action="store_true",
+        help="like --since HEAD: only check uncommitted and untracked changes",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="print the report as JSON and exit with status 1 on any issue",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    metrics_setup = load_metrics_setup()
+    benchmarks = sorted(metrics_setup.keys())
+
+    # Index every root once (or only the changed parts); all checks query these maps
+    scope = None
+    if args.since or args.changed_only:
+        try:
+            paths = changed_paths(args.since)
+        except subprocess.CalledProcessError as e:
+            sys.exit(f"git diff failed: {e.stderr.strip()}")
+        bench_changes = (
+            changed_benchmarks(metrics_setup, args.since)
+            if "metrics_setup.yaml" in paths else []
+        )
+        scope = (changed_model_dirs(paths), bench_changes)
+    indexes = index_roots(benchmarks, scope, benchmark_aliases(metrics_setup))
+    report = run_checks(indexes, metrics_setup)
+
+    if args.json:
+        if scope is not None:
+            report["since"] = args.since or "HEAD"
+            report["changed_benchmarks"] = scope[1]
+        json.dump(report, sys.stdout, indent=2)
+        print()
+        sys.exit(0 if report["ok"] else 1)
+    if scope is not None:
+        print(f"Checking changes since {args.since or 'HEAD'}: "
+              f"{sum(len(index) for index in indexes.values())} directories, "
+              f"changed benchmarks: {', '.join(scope[1]) or 'none'}\n")
+    print_report(report, indexes, benchmarks)
+
+
 if __name__ == "__main__":
     main()
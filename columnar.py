@@ -0,0 +1,138 @@
+"""Columnar encoding of the per-entity score sections of data.json.
+
+A score section maps {entity: {benchmark: {shot: {metric: {stat: value}}}}},
+which repeats every benchmark, metric and stat name once per cell.  The
+columnar form (build_data.py --columnar) stores the same data as
+
+    {
+      "format": "noreval-columnar-1",
+      "entities": [...], "benchmarks": [...], "shots": [...], "metrics": [...],
+      "rows": {"entity": [ids], "benchmark": [ids], "shot": [ids], "metric": [ids]},
+      "columns": {stat: {"values": [...], "mask": "<base64>"}, ...}
+    }
+
+with one row per (entity, benchmark, shot, metric) cell.  Each stat column
+holds the values of the rows that have that stat, in row order; "mask" is a
+little-endian bitmap over rows (bit set = value present) and is omitted when
+every row has the stat.  Float columns whose values all have at most
+MAX_DECIMALS decimals are stored as integers scaled by 10**"decimals", which
+is shorter and decodes back to exactly the same doubles.  Entities without any scores are kept in "entities".
+
+docs/app.js decodes tables into typed arrays (decodeScoreTable), so score
+lookups become array indexing instead of nested object access.
+"""
+
+import base64
+
+FORMAT = "noreval-columnar-1"
+ROW_FIELDS = ("entity", "benchmark", "shot", "metric")
+DICTIONARIES = {"entity": "entities", "benchmark": "benchmarks",
+                "shot": "shots", "metric": "metrics"}
+MAX_DECIMALS = 9
+
+
+def _dictionary(value, ids):
+    """Return the id of value in the ids map, adding it if new."""
+    if value not in ids:
+        ids[value] = len(ids)
+    return ids[value]
+
+
+def encode_mask(present):
+    """Encode a list of booleans as a base64 little-endian bitmap."""
+    bits = bytearray((len(present) + 7) // 8)
+    for i, p in enumerate(present):
+        if p:
+            bits[i >> 3] |= 1 << (i & 7)
+    return base64.b64encode(bytes(bits)).decode("ascii")
+
+
+def decode_mask(mask, n):
+    """Inverse of encode_mask() for n rows."""
+    bits = base64.b64decode(mask)
+    return [bool(bits[i >> 3] & (1 << (i & 7))) for i in range(n)]
+
+
+def scale_column(values):
+    """Return (decimals, scaled ints) for a float column, or (None, values).
+
+    Picks the smallest number of decimals for which every value survives
+    int -> value / 10**decimals unchanged.
+    """
+    if not any(isinstance(v, float) for v in values):
+        return None, values
+    for decimals in range(MAX_DECIMALS + 1):
+        factor = 10 ** decimals
+        scaled = [round(v * factor) for v in values]
+        if all(i / factor == v for i, v in zip(scaled, values)):
+            return decimals, scaled
+    return None, values
+
+
+def encode_scores(section):
+    """Encode one score section (a score_table.ScoreTable) as a columnar table."""
+    ids = {field: {} for field in ROW_FIELDS}
+    rows = {field: [] for field in ROW_FIELDS}
+    cells = []
+    stats = {}
+    for entity in section:
+        _dictionary(str(entity), ids["entity"])
+    for entity, benchmark, shot, metric, record in section.rows():
+        key = (str(entity), benchmark, shot, metric)
+        for field, value in zip(ROW_FIELDS, key):
+            rows[field].append(_dictionary(value, ids[field]))
+        cells.append(record)
+        for stat in record.as_dict():
+            _dictionary(stat, stats)
+
+    columns = {}
+    for stat in stats:
+        present = [getattr(record, stat) is not None for record in cells]
+        decimals, column_values = scale_column(
+            [getattr(record, stat) for record, p in zip(cells, present) if p]
+        )
+        column = {"values": column_values}
+        if decimals is not None:
+            column["decimals"] = decimals
+        if not all(present):
+            column["mask"] = encode_mask(present)
+        columns[stat] = column
+
+    table = {"format": FORMAT}
+    for field in ROW_FIELDS:
+        table[DICTIONARIES[field]] = list(ids[field])
+    table["rows"] = rows
+    table["columns"] = columns
+    return table
+
+
+def decode_scores(table):
+    """Inverse of encode_scores(); entity keys come back as strings."""
+    n = len(table["rows"]["entity"])
+    section = {entity: {} for entity in table["entities"]}
+    cells = []
+    for i in range(n):
+        entity, benchmark, shot, metric = (
+            table[DICTIONARIES[field]][table["rows"][field][i]] for field in ROW_FIELDS
+        )
+        cell = {}
+        section[entity].setdefault(benchmark, {}).setdefault(shot, {})[metric] = cell
+        cells.append(cell)
+    for stat, column in table["columns"].items():
+        present = decode_mask(column["mask"], n) if "mask" in column else [True] * n
+        values = column["values"]
+        if "decimals" in column:
+            factor = 10 ** column["decimals"]
+            values = [v / factor for v in values]
+        values = iter(values)
+        for cell, p in zip(cells, present):
+            if p:
+                cell[stat] = next(values)
+    return section
+
+
+def encode_section(name, data):
+    """Encode a data.json score section; ablations hold one table per ablation."""
+    if name == "ablations":
+        return {ablation: encode_scores(steps) for ablation, steps in data.items()}
+    return encode_scores(data)
@@ -42,8 +42,10 @@ let filterCriteria = {
     tooltip: "Difference between the maximum score in the window and the task\u2019s random baseline. Verifies that the model actually learned the task beyond chance. Higher is better. Default threshold: \u2265 5." },
 };
 let filterResults = {};
+let filterStateKey = null;
 let allFilterBenchmarks = new Set();
 let filterTableExpanded = false;
+let significanceExpanded = false;
 
 const MODEL_COLORS = [
   "#6366f1", "#f43f5e", "#10b981", "#f59e0b", "#8b5cf6",
@@ -245,8 +247,7 @@ function getModelColor(modelDir) {
   const allColors = Object.assign({}, DATA.model_colors || {}, DATA.instruct_model_colors || {});
   const assignedColors = new Set(Object.values(allColors));
   const availableColors = MODEL_COLORS.filter((c) => !assignedColors.has(c));
-  const modelsData = getModelsData();
-  const unassignedModels = Object.keys(modelsData).filter((m) => !allColors[m]);
+  const unassignedModels = getModelDirs().filter((m) => !allColors[m]);
   const idx = unassignedModels.indexOf(modelDir);
   return availableColors[idx % availableColors.length];
 }
@@ -260,6 +261,11 @@ function getModelsData() {
   return currentTab === "instruct" ? DATA.instruct_models : DATA.models;
 }
 
+/** Return the model dirs of the active comparison tab (available before its shard is loaded). */
+function getModelDirs() {
+  return getSectionKeys(currentTab === "instruct" ? "instruct_models" : "models");
+}
+
 /** Return the checked-models set for the active comparison tab. */
 function getCheckedModels() {
   return currentTab === "instruct" ? checkedInstructModels : checkedModels;
@@ -267,8 +273,8 @@ function getCheckedModels() {
 
 /** Return the default-models list for the active comparison tab. */
 function getDefaultModels() {
-  if (currentTab === "instruct") return DATA.instruct_default_models || Object.keys(DATA.instruct_models);
-  return DATA.default_models || Object.keys(DATA.models);
+  if (currentTab === "instruct") return DATA.instruct_default_models || getSectionKeys("instruct_models");
+  return DATA.default_models || getSectionKeys("models");
 }
 
 /** Look up a model metadata field, checking instruct metadata first if on instruct tab. */
@@ -279,6 +285,113 @@ function getModelMeta(field, modelDir) {
   return undefined;
 }
 
+// ============================================================
+// Columnar score tables
+// ============================================================
+
+// build_data.py --columnar stores each score section as a table of
+// dictionary-encoded row IDs plus one value column per statistic (see
+// columnar.py). decodeScoreTable() turns that into typed arrays; a dense
+// Int32Array maps (entity, benchmark, shot, metric) IDs to a row, so lookups
+// are plain array indexing. Missing values decode to NaN.
+const COLUMNAR_FORMAT = "noreval-columnar-1";
+
+function isEncodedScoreTable(obj) {
+  return obj !== null && typeof obj === "object" && obj.format === COLUMNAR_FORMAT;
+}
+
+function indexMap(names) {
+  const map = new Map();
+  names.forEach((name, i) => map.set(name, i));
+  return map;
+}
+
+function decodeColumn(column, nRows) {
+  const out = new Float64Array(nRows).fill(NaN);
+  const values = column.values;
+  const factor = column.decimals ? 10 ** column.decimals : 1;
+  if (!column.mask) {
+    for (let i = 0; i < nRows; i++) out[i] = values[i] / factor;
+    return out;
+  }
+  const bits = atob(column.mask);
+  let next = 0;
+  for (let i = 0; i < nRows; i++) {
+    if (bits.charCodeAt(i >> 3) & (1 << (i & 7))) out[i] = values[next++] / factor;
+  }
+  return out;
+}
+
+/** Decode a columnar.encode_scores() table. */
+function decodeScoreTable(enc) {
+  const nRows = enc.rows.entity.length;
+  const nB = enc.benchmarks.length, nS = enc.shots.length, nM = enc.metrics.length;
+  const cellRow = new Int32Array(enc.entities.length * nB * nS * nM).fill(-1);
+  const { entity, benchmark, shot, metric } = enc.rows;
+  for (let i = 0; i < nRows; i++) {
+    cellRow[((entity[i] * nB + benchmark[i]) * nS + shot[i]) * nM + metric[i]] = i;
+  }
+  const columns = {};
+  for (const [stat, column] of Object.entries(enc.columns)) columns[stat] = decodeColumn(column, nRows);
+  return {
+    columnar: true,
+    entities: enc.entities,
+    entityIds: indexMap(enc.entities),
+    benchmarkIds: indexMap(enc.benchmarks),
+    shotIds: indexMap(enc.shots),
+    metricIds: indexMap(enc.metrics),
+    nB, nS, nM, cellRow, columns,
+  };
+}
+
+/** Decode a data.json score section if it is columnar (ablations hold one table per ablation). */
+function decodeSection(section, data) {
+  if (section === "ablations") {
+    const out = {};
+    for (const [name, table] of Object.entries(data)) {
+      out[name] = isEncodedScoreTable(table) ? decodeScoreTable(table) : table;
+    }
+    return out;
+  }
+  return isEncodedScoreTable(data) ? decodeScoreTable(data) : data;
+}
+
+/** Entity keys (model dirs or steps) of a score data source in either format. */
+function getEntities(dataSource) {
+  return dataSource.columnar ? dataSource.entities : Object.keys(dataSource);
+}
+
+/** Row index of a cell in a decoded table, or -1. */
+function getTableRow(table, entity, bench, shot, metric) {
+  const e = table.entityIds.get(String(entity));
+  const b = table.benchmarkIds.get(bench);
+  const s = table.shotIds.get(String(shot));
+  const m = table.metricIds.get(metric);
+  if (e === undefined || b === undefined || s === undefined || m === undefined) return -1;
+  return table.cellRow[((e * table.nB + b) * table.nS + s) * table.nM + m];
+}
+
+/** Value of one statistic at a table row, or undefined if missing. */
+function getTableStat(table, stat, row) {
+  const column = table.columns[stat];
+  if (!column || row < 0) return undefined;
+  const v = column[row];
+  return Number.isNaN(v) ? undefined : v;
+}
+
+/** All statistics of a cell as an object ({max, mean, ..., prompt_sd}), in either format. */
+function getCellStats(dataSource, entity, bench, shot, metric) {
+  if (!dataSource.columnar) return dataSource[entity]?.[bench]?.[shot]?.[metric];
+  const row = getTableRow(dataSource, entity, bench, shot, metric);
+  if (row < 0) return undefined;
+  const obj = {};
+  for (const stat of Object.keys(dataSource.columns)) {
+    const v = getTableStat(dataSource, stat, row);
+    if (v !== undefined) obj[stat] = v;
+  }
+  return obj;
+}
+
 // ============================================================
 // Score access (prompt aggregation aware)
 // ============================================================
@@ -287,6 +400,9 @@ function getModelMeta(field, modelDir) {
  *  metric defaults to the benchmark's main_metric if not provided. */
 function getScore(dataSource, entity, bench, shot, metric) {
   metric = metric || DATA.metrics_setup[bench]?.main_metric;
+  if (dataSource.columnar) {
+    return getTableStat(dataSource, currentPromptAgg, getTableRow(dataSource, entity, bench, shot, metric));
+  }
   const obj = dataSource[entity]?.[bench]?.[shot]?.[metric];
   if (obj === undefined || obj === null) return undefined;
   if (typeof obj === "number") return obj; // backward compat
@@ -296,10 +412,13 @@ function getScore(dataSource, entity, bench, shot, metric) {
 /** Get raw stderr from data source, respecting prompt aggregation mode. */
 function getStderr(dataSource, entity, bench, shot, metric) {
   metric = metric || DATA.metrics_setup[bench]?.main_metric;
+  const key = currentPromptAgg + "_stderr";
+  if (dataSource.columnar) {
+    return getTableStat(dataSource, key, getTableRow(dataSource, entity, bench, shot, metric));
+  }
   const obj = dataSource[entity]?.[bench]?.[shot]?.[metric];
   if (obj === undefined || obj === null) return undefined;
   if (typeof obj === "number") return undefined; // old format, no stderr
-  const key = currentPromptAgg + "_stderr";
   const se = obj[key];
   return (se !== undefined && se !== null) ? se : undefined;
 }
@@ -307,10 +426,17 @@ function getStderr(dataSource, entity, bench, shot, metric) {
 /** Get prompt-variant SE: SD(prompt_scores) / sqrt(n_prompts). */
 function getPromptSE(dataSource, entity, bench, shot, metric) {
   metric = metric || DATA.metrics_setup[bench]?.main_metric;
-  const obj = dataSource[entity]?.[bench]?.[shot]?.[metric];
-  if (!obj || typeof obj === "number") return undefined;
-  const sd = obj.prompt_sd;
-  const n = obj.n_prompts;
+  let sd, n;
+  if (dataSource.columnar) {
+    const row = getTableRow(dataSource, entity, bench, shot, metric);
+    sd = getTableStat(dataSource, "prompt_sd", row);
+    n = getTableStat(dataSource, "n_prompts", row);
+  } else {
+    const obj = dataSource[entity]?.[bench]?.[shot]?.[metric];
+    if (!obj || typeof obj === "number") return undefined;
+    sd = obj.prompt_sd;
+    n = obj.n_prompts;
+  }
   if (sd == null || n == null || n < 2) return undefined;
   return sd / Math.sqrt(n);
 }
@@ -324,7 +450,8 @@ function getCombinedSE(dataSource, entity, bench, shot, metric) {
 }
 
 /** Scale a raw stderr value for display, applying the same linear transform as the score.
- *  For min-max and z-score, pass allRaw = array of all raw scores for this benchmark. */
+ *  For min-max and z-score, pass allRaw = array of all raw scores for this benchmark
+ *  (or their normParams). */
 function scaleStderr(se, benchmark, metric, allRaw) {
   if (se === undefined || se === null) return undefined;
   if (currentNormalization === "none") return toDisplayScale(se, benchmark, metric);
@@ -333,16 +460,14 @@ function scaleStderr(se, benchmark, metric, allRaw) {
     const range = info.max_performance - info.random_baseline;
     return range === 0 ? 0 : (se / range) * 100;
   }
+  const p = normParams(allRaw);
   if (currentNormalization === "minmax") {
-    if (!allRaw || allRaw.length < 2) return toDisplayScale(se, benchmark, metric);
-    const mn = Math.min(...allRaw), mx = Math.max(...allRaw);
-    return mx === mn ? 0 : (se / (mx - mn)) * 100;
+    if (!p || p.n < 2) return toDisplayScale(se, benchmark, metric);
+    return p.max === p.min ? 0 : (se / (p.max - p.min)) * 100;
   }
   if (currentNormalization === "zscore") {
-    if (!allRaw || allRaw.length < 2) return 0;
-    const mean = allRaw.reduce((a, b) => a + b, 0) / allRaw.length;
-    const std = Math.sqrt(allRaw.reduce((s, v) => s + (v - mean) ** 2, 0) / allRaw.length);
-    return std === 0 ? 0 : se / std;
+    if (!p || p.n < 2) return 0;
+    return p.std === 0 ? 0 : se / p.std;
   }
   return undefined; // not supported for percentile (non-linear)
 }
@@ -377,28 +502,110 @@ function baselineNorm(raw, benchmark) {
   return max === base ? 0 : ((raw - base) / (max - base)) * 100;
 }
 
+/** Summary of a normalization population: count, min, max, mean, population SD.
+ *  The ascending values for percentile ranks are sorted on first use. */
+function normParamsFromValues(values) {
+  const n = values.length;
+  const mean = n ? values.reduce((a, b) => a + b, 0) / n : NaN;
+  return {
+    n,
+    min: Math.min(...values),
+    max: Math.max(...values),
+    mean,
+    std: n ? Math.sqrt(values.reduce((s, v) => s + (v - mean) ** 2, 0) / n) : NaN,
+    values,
+    sorted: null,
+  };
+}
+
+/** Accept either an array of raw scores or precomputed normParams. */
+function normParams(allRaw) {
+  if (!allRaw) return null;
+  return Array.isArray(allRaw) ? normParamsFromValues(allRaw) : allRaw;
+}
+
+/** Number of sorted values < x (strict) or <= x, by binary search. */
+function countBelow(sorted, x, inclusive) {
+  let lo = 0, hi = sorted.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (sorted[mid] < x || (inclusive && sorted[mid] === x)) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+}
+
+/** Normalization parameters from build_data.py's norm_params section, which covers
+ *  the main metric over every entity of a score section. */
+function decodePrebuiltNormParams(entry) {
+  const sorted = entry.sorted;
+  return {
+    n: sorted.length, min: sorted[0], max: sorted[sorted.length - 1],
+    mean: entry.mean, std: entry.std, values: sorted, sorted,
+  };
+}
+
+/** Prebuilt parameters for dataSource in the current shot/prompt aggregation,
+ *  if the population is the data source's full entity set. */
+function getPrebuiltNormParams(dataSource, entities, shot) {
+  const table = DATA.norm_params;
+  if (!table || entities.length !== getEntities(dataSource).length) return null;
+  let section = null;
+  if (dataSource === DATA.models) section = table.models;
+  else if (dataSource === DATA.instruct_models) section = table.instruct_models;
+  else if (dataSource === DATA.progress) section = table.progress;
+  else {
+    for (const ablName of getAblations()) {
+      if (DATA.ablations[ablName] === dataSource) section = table.ablations?.[ablName];
+    }
+  }
+  return section?.[shot]?.[currentPromptAgg] || null;
+}
+
+/** Return a memoized (benchmark, metric) -> normParams lookup for one render, with the
+ *  scores of entities in dataSource as population. Avoids rebuilding the population
+ *  for every entity of an aggregate view. */
+function makeNormLookup(dataSource, entities, shot) {
+  const cache = new Map();
+  const prebuilt = getPrebuiltNormParams(dataSource, entities, shot);
+  return (bench, metric) => {
+    const key = metric ? bench + "\u0000" + metric : bench;
+    let p = cache.get(key);
+    if (p === undefined) {
+      const isMain = !metric || metric === DATA.metrics_setup[bench]?.main_metric;
+      if (prebuilt && isMain && prebuilt[bench]) {
+        p = decodePrebuiltNormParams(prebuilt[bench]);
+      } else {
+        p = normParamsFromValues(entities.map((e) => getScore(dataSource, e, bench, shot, metric)).filter((v) => v !== undefined));
+      }
+      cache.set(key, p);
+    }
+    return p;
+  };
+}
+
 /** Apply current normalization to a raw score.
- *  For min-max, z-score, and percentile, pass allRaw = array of all raw scores for this benchmark.
+ *  For min-max, z-score, and percentile, pass allRaw = array of all raw scores for this
+ *  benchmark, or their normParams (cheaper when normalizing many scores).
  *  Optional metric parameter for correct display scale of non-main metrics. */
 function applyNorm(raw, benchmark, allRaw, metric) {
   if (currentNormalization === "none") return toDisplayScale(raw, benchmark, metric);
   if (currentNormalization === "baseline") return baselineNorm(raw, benchmark);
+  const p = normParams(allRaw);
   if (currentNormalization === "minmax") {
-    if (!allRaw || allRaw.length < 2) return toDisplayScale(raw, benchmark, metric);
-    const mn = Math.min(...allRaw), mx = Math.max(...allRaw);
-    return mx === mn ? 50 : ((raw - mn) / (mx - mn)) * 100;
+    if (!p || p.n < 2) return toDisplayScale(raw, benchmark, metric);
+    return p.max === p.min ? 50 : ((raw - p.min) / (p.max - p.min)) * 100;
   }
   if (currentNormalization === "zscore") {
-    if (!allRaw || allRaw.length < 2) return 0;
-    const mean = allRaw.reduce((a, b) => a + b, 0) / allRaw.length;
-    const std = Math.sqrt(allRaw.reduce((s, v) => s + (v - mean) ** 2, 0) / allRaw.length);
-    return std === 0 ? 0 : (raw - mean) / std;
+    if (!p || p.n < 2) return 0;
+    return p.std === 0 ? 0 : (raw - p.mean) / p.std;
   }
   if (currentNormalization === "percentile") {
-    if (!allRaw || allRaw.length < 2) return 50;
-    const below = allRaw.filter((v) => v < raw).length;
-    const equal = allRaw.filter((v) => v === raw).length;
-    return ((below + (equal - 1) / 2) / (allRaw.length - 1)) * 100;
+    if (!p || p.n < 2) return 50;
+    if (!p.sorted) p.sorted = Float64Array.from(p.values).sort();
+    const below = countBelow(p.sorted, raw, false);
+    const equal = countBelow(p.sorted, raw, true) - below;
+    return ((below + (equal - 1) / 2) / (p.n - 1)) * 100;
   }
   return toDisplayScale(raw, benchmark, metric);
 }
@@ -434,6 +641,113 @@ function updateStderrToggleState() {
   // Error bars are always shown; this is kept as a no-op for call-site compatibility.
 }
 
+// ============================================================
+// Memo cache
+// ============================================================
+
+// Normalized cells and normalization lookups are reused across the bars, error
+// bars and y range of a render, and across renders with the same selection.
+// Cached values depend on the state in getMemoStateKey(); syncMemoState() drops
+// them all when it changes, and the least recently used entries go once the
+// cache holds MEMO_MAX_ENTRIES.  Open the page with ?debug to see the counters.
+
+const MEMO_MAX_ENTRIES = 50000;
+const DEBUG = typeof location !== "undefined" && new URLSearchParams(location.search).has("debug");
+const memoStats = { hits: 0, misses: 0, evictions: 0 };
+const _memo = new Map();  // key -> value, least recently used first
+let _memoStateKey = null;
+
+function getMemoStateKey() {
+  return JSON.stringify([currentTab, currentShot, currentPromptAgg, currentNormalization, currentMetric,
+    [...getCheckedModels()], currentSizeMin, currentSizeMax, fullyOpenOnly]);
+}
+
+/** Clear the memo cache if the state it was filled for has changed. */
+function syncMemoState() {
+  const key = getMemoStateKey();
+  if (key === _memoStateKey) return;
+  memoStats.evictions += _memo.size;
+  _memo.clear();
+  _memoStateKey = key;
+}
+
+function memo(key, compute) {
+  if (_memo.has(key)) {
+    const value = _memo.get(key);
+    _memo.delete(key);
+    _memo.set(key, value);
+    memoStats.hits++;
+    return value;
+  }
+  memoStats.misses++;
+  const value = compute();
+  _memo.set(key, value);
+  if (_memo.size > MEMO_MAX_ENTRIES) {
+    _memo.delete(_memo.keys().next().value);
+    memoStats.evictions++;
+  }
+  return value;
+}
+
+function getMemoStats() {
+  return { ...memoStats, size: _memo.size };
+}
+
+/** Score section for a source id: "models", "instruct_models", "progress" or "ablation:<name>". */
+function getSourceById(sourceId) {
+  if (sourceId.startsWith("ablation:")) return DATA.ablations[sourceId.slice(9)];
+  return DATA[sourceId];
+}
+
+/** Memoized makeNormLookup() for a source's aggregate-chart population: the model
+ *  list on the comparison tabs, every step for progress and ablations. */
+function getSourceNormLookup(sourceId, shot) {
+  return memo("norm|" + sourceId + "|" + shot, () => {
+    const needAllRaw = currentNormalization === "minmax" || currentNormalization === "zscore" || currentNormalization === "percentile";
+    if (!needAllRaw) return null;
+    let population;
+    if (sourceId === "models" || sourceId === "instruct_models") population = getModelList();
+    else if (sourceId === "progress") population = getSteps().map(String);
+    else population = getAblationSteps(sourceId.slice(9)).map(String);
+    return makeNormLookup(getSourceById(sourceId), population, shot);
+  });
+}
+
+/** Normalized main-metric score of one cell with its scaled stderr ({score, stderr}),
+ *  or undefined if the cell is missing. */
+function getNormalizedCell(sourceId, entity, bench, shot) {
+  return memo("cell|" + sourceId + "|" + entity + "|" + bench + "|" + shot, () => {
+    const dataSource = getSourceById(sourceId);
+    const raw = getScore(dataSource, entity, bench, shot);
+    if (raw === undefined) return undefined;
+    const normFor = getSourceNormLookup(sourceId, shot);
+    const allRaw = normFor ? normFor(bench) : null;
+    const wantSE = (showStderr || showPromptDeviation) && isStderrCompatible();
+    const score = applyNorm(raw, bench, allRaw);
+    const se = wantSE ? scaleStderr(getCombinedSE(dataSource, entity, bench, shot), bench, undefined, allRaw) : undefined;
+    return { score, stderr: se };
+  });
+}
+
+function updateDebugOverlay(workerStats) {
+  if (!DEBUG) return;
+  let el = document.getElementById("debug-overlay");
+  if (!el) {
+    el = document.createElement("div");
+    el.id = "debug-overlay";
+    document.body.appendChild(el);
+  }
+  if (workerStats) el.dataset.worker = JSON.stringify(workerStats);
+  const line = (label, s) => {
+    const total = s.hits + s.misses;
+    const rate = total ? ((s.hits / total) * 100).toFixed(1) : "0.0";
+    return `${label}: ${s.hits} hits / ${s.misses} misses (${rate}%), ${s.size} entries, ${s.evictions} evicted`;
+  };
+  const lines = [line("memo (main)", getMemoStats())];
+  if (el.dataset.worker) lines.push(line("memo (worker)", JSON.parse(el.dataset.worker)));
+  el.textContent = lines.join("\n");
+}
+
 // ============================================================
 // Metric selector
 // ============================================================
@@ -569,13 +883,13 @@ function slugify(str) {
 
 function buildUrlMaps() {
   // Model aliases: slugified display name → dir name
-  for (const dir of Object.keys(DATA.models)) {
+  for (const dir of getSectionKeys("models")) {
     const alias = slugify(getModelLabel(dir));
     _modelDirToAlias[dir] = alias;
     _modelAliasToDir[alias] = dir;
   }
   // Also build aliases for instruct models
-  for (const dir of Object.keys(DATA.instruct_models || {})) {
+  for (const dir of getSectionKeys("instruct_models")) {
     const alias = slugify(getModelLabel(dir));
     _modelDirToAlias[dir] = alias;
     _modelAliasToDir[alias] = dir;
@@ -647,10 +961,9 @@ function stateToUrl() {
   if (currentNormalization !== autoNorm) params.set("norm", currentNormalization);
 
   // Models: omit for defaults, "all" for all, aliases otherwise
-  const modelsData = getModelsData();
   const checked = getCheckedModels();
-  const allModelSet = new Set(Object.keys(modelsData));
-  const defaultModelSet = new Set(getDefaultModels().filter((m) => m in modelsData));
+  const allModelSet = new Set(getModelDirs());
+  const defaultModelSet = new Set(getDefaultModels().filter((m) => allModelSet.has(m)));
   if (!setsEqual(checked, defaultModelSet)) {
     if (setsEqual(checked, allModelSet)) {
       params.set("models", "all");
@@ -709,10 +1022,10 @@ function loadStateFromHash() {
 
   if (params.has("models")) {
     const val = params.get("models");
-    const modelsData = getModelsData();
+    const modelDirs = new Set(getModelDirs());
     const parsed = val === "all"
-      ? new Set(Object.keys(modelsData))
-      : (val ? new Set(val.split(",").map((a) => _modelAliasToDir[a] || a).filter((m) => m in modelsData)) : new Set());
+      ? modelDirs
+      : (val ? new Set(val.split(",").map((a) => _modelAliasToDir[a] || a).filter((m) => modelDirs.has(m))) : new Set());
     if (currentTab === "instruct") checkedInstructModels = parsed;
     else checkedModels = parsed;
     loaded = true;
@@ -735,20 +1048,290 @@ function loadStateFromHash() {
   return loaded;
 }
 
+// ============================================================
+// Lazy data shards
+// ============================================================
+
+// data.json holds everything except the per-entity scores, which build_data.py
+// writes to content-hashed shards listed in DATA.shards. A shard is fetched
+// the first time a tab needs it; a monolithic data.json (no DATA.shards)
+// already contains every section.
+const _shardRequests = {};
+
+/** Entity keys of a score section (model dirs, steps, ablation names), loaded or not. */
+function getSectionKeys(section) {
+  if (DATA[section]) return section === "ablations" ? Object.keys(DATA.ablations) : getEntities(DATA[section]);
+  return (DATA.shard_keys && DATA.shard_keys[section]) || [];
+}
+
+/** Data sections the current tab, task selection and normalization read from. */
+function getRequiredSections() {
+  const sections = currentTab === "progress"
+    ? ["progress", "ablations"]
+    : [currentTab === "instruct" ? "instruct_models" : "models"];
+  // The signal filter is computed on the training-progress checkpoints
+  if (currentTaskSelection === "__filtered__") {
+    sections.push(DATA.shards && DATA.shards.progress_filter ? "progress_filter" : "progress");
+  }
+  // Population-based normalizations use the precomputed parameters
+  if (currentNormalization === "minmax" || currentNormalization === "zscore" || currentNormalization === "percentile") {
+    sections.push("norm_params");
+  }
+  return sections;
+}
+
+function sectionsLoaded(sections) {
+  return sections.every((section) => DATA[section] || !(DATA.shards && DATA.shards[section]));
+}
+
+/** Fetch the shards of the given sections into DATA (each at most once). */
+function loadSections(sections) {
+  return Promise.all(sections.map((section) => {
+    if (DATA[section] || !(DATA.shards && DATA.shards[section])) return Promise.resolve();
+    if (!_shardRequests[section]) {
+      _shardRequests[section] = fetch(DATA.shards[section])
+        .then((response) => {
+          if (!response.ok) throw new Error("HTTP " + response.status + " for " + DATA.shards[section]);
+          return response.json();
+        })
+        .then((data) => {
+          DATA[section] = decodeSection(section, data);
+          shareWithWorker(section);
+        })
+        .catch((err) => { delete _shardRequests[section]; throw err; });
+    }
+    return _shardRequests[section];
+  }));
+}
+
+function setChartLoading(loading) {
+  const el = document.getElementById("chart-container");
+  if (el) el.classList.toggle("loading", loading);
+}
+
+// ============================================================
+// Compute jobs (compute-worker.js)
+// ============================================================
+
+// Score aggregation and the signal filter run in a Web Worker that loads this
+// file.  It fetches no data itself: the main thread sends it DATA when it
+// starts and every section decoded afterwards, and loads the sections a job
+// reads before posting the job.  A job is a generator function that yields
+// between units of work, so the worker can drop it once cancelled, and returns
+// a structured-clonable result.  Requests on the same channel supersede each
+// other: the older one is cancelled and its promise rejects with STALE_REQUEST.
+// Without a worker (e.g. file:// pages) jobs run synchronously on the main thread.
+
+const COMPUTE_JOBS = {
+  filter: filterJob,
+  aggregateBars: aggregateBarsJob,
+  aggregateProgress: aggregateProgressJob,
+};
+const STALE_REQUEST = { stale: true };
+
+let _computeWorker;  // undefined = not started yet, null = unavailable
+let _computeSeq = 0;
+const _computePending = new Map();  // request id -> { channel, job, resolve, reject }
+const _computeLatest = {};  // channel -> id of its newest request
+
+/** Fetch data.json into DATA and decode the sections it carries inline. */
+async function loadData() {
+  const response = await fetch("data.json");
+  DATA = await response.json();
+  for (const section of ["models", "instruct_models", "progress", "ablations"]) {
+    if (DATA[section]) DATA[section] = decodeSection(section, DATA[section]);
+  }
+}
+
+/** UI state read by the compute jobs, as sent to the worker. */
+function getComputeState() {
+  return {
+    tab: currentTab, shot: currentShot, taskSelection: currentTaskSelection,
+    promptAgg: currentPromptAgg, normalization: currentNormalization,
+    checkedTasks: [...checkedTasks], checkedModels: [...checkedModels],
+    checkedInstructModels: [...checkedInstructModels],
+    sizeMin: currentSizeMin, sizeMax: currentSizeMax, fullyOpenOnly,
+    filterBenchmarks: [...allFilterBenchmarks], filterCriteria,
+    sections: getRequiredSections(),
+  };
+}
+
+function applyComputeState(state) {
+  currentTab = state.tab;
+  currentShot = state.shot;
+  currentTaskSelection = state.taskSelection;
+  currentPromptAgg = state.promptAgg;
+  currentNormalization = state.normalization;
+  checkedTasks = new Set(state.checkedTasks);
+  checkedModels = new Set(state.checkedModels);
+  checkedInstructModels = new Set(state.checkedInstructModels);
+  currentSizeMin = state.sizeMin;
+  currentSizeMax = state.sizeMax;
+  fullyOpenOnly = state.fullyOpenOnly;
+  allFilterBenchmarks = new Set(state.filterBenchmarks);
+  filterCriteria = state.filterCriteria;
+  syncMemoState();
+}
+
+/** Run a job to completion on the current thread. */
+function runComputeJob(job) {
+  syncMemoState();
+  const it = COMPUTE_JOBS[job]();
+  let step = it.next();
+  while (!step.done) step = it.next();
+  return step.value;
+}
+
+function getComputeWorker() {
+  if (_computeWorker !== undefined) return _computeWorker;
+  _computeWorker = null;
+  if (typeof Worker === "undefined" || location.protocol === "file:") return null;
+  try {
+    _computeWorker = new Worker("compute-worker.js");
+  } catch (err) {
+    console.warn("compute worker unavailable, computing on the main thread:", err);
+    return null;
+  }
+  _computeWorker.postMessage({ type: "data", data: DATA });
+  _computeWorker.onmessage = (e) => {
+    const { id, result, error, memoStats: workerStats } = e.data;
+    updateDebugOverlay(workerStats);
+    const request = _computePending.get(id);
+    if (!request) return;  // superseded
+    _computePending.delete(id);
+    if (error) request.reject(new Error(error));
+    else request.resolve(result);
+  };
+  _computeWorker.onerror = (e) => {
+    console.warn("compute worker failed, computing on the main thread:", e.message);
+    _computeWorker.terminate();
+    _computeWorker = null;
+    for (const [id, request] of _computePending) {
+      _computePending.delete(id);
+      try { request.resolve(runComputeJob(request.job)); } catch (err) { request.reject(err); }
+    }
+  };
+  return _computeWorker;
+}
+
+/** Cancel the pending request of a channel, if any. */
+function cancelCompute(channel) {
+  const id = _computeLatest[channel];
+  const request = _computePending.get(id);
+  if (!request) return;
+  _computePending.delete(id);
+  if (_computeWorker) _computeWorker.postMessage({ type: "cancel", id });
+  request.reject(STALE_REQUEST);
+}
+
+/** Run a compute job for the current UI state; resolves with its result. */
+function requestCompute(channel, job) {
+  cancelCompute(channel);
+  const id = ++_computeSeq;
+  _computeLatest[channel] = id;
+  const worker = getComputeWorker();
+  if (!worker) {
+    try {
+      return Promise.resolve(runComputeJob(job));
+    } catch (err) {
+      return Promise.reject(err);
+    }
+  }
+  return new Promise((resolve, reject) => {
+    _computePending.set(id, { channel, job, resolve, reject });
+    const state = getComputeState();
+    loadSections(state.sections).then(() => {
+      if (_computePending.has(id)) worker.postMessage({ type: "run", id, job, state });
+    }, (err) => {
+      if (_computePending.delete(id)) reject(err);
+    });
+  });
+}
+
+/** Send a decoded data section to the compute worker, if one is running. */
+function shareWithWorker(section) {
+  if (_computeWorker) _computeWorker.postMessage({ type: "section", section, data: DATA[section] });
+}
+
+function onComputeError(err) {
+  if (err === STALE_REQUEST) return;
+  console.error("compute request failed:", err);
+  setChartLoading(false);
+}
+
+// ============================================================
+// Live reload (build_data.py --watch)
+// ============================================================
+
+const LIVE_RELOAD_URL = "__livereload";
+
+/**
+ * Reload the page whenever the watch server reports a new build. The view
+ * survives the reload through the URL hash. Only tried on localhost, where
+ * build_data.py --watch serves docs/; elsewhere no request is made.
+ *
+ * The service worker is registered unless the watch server answers: it would
+ * serve app.js and style.css by the hashes of the last build, not the files
+ * being edited.
+ */
+function connectLiveReload() {
+  const local = ["localhost", "127.0.0.1", "[::1]"].includes(location.hostname);
+  if (typeof EventSource === "undefined" || !local) {
+    registerServiceWorker();
+    return;
+  }
+  const source = new EventSource(LIVE_RELOAD_URL);
+  let version = null;
+  source.onopen = () => unregisterServiceWorker();
+  source.onmessage = (event) => {
+    if (version !== null && event.data !== version) location.reload();
+    version = event.data;
+  };
+  // A plain static server answers 404, which closes the stream for good
+  source.onerror = () => {
+    if (source.readyState === EventSource.CLOSED && version === null) registerServiceWorker();
+  };
+}
+
+// ============================================================
+// Service worker (sw.js)
+// ============================================================
+
+// sw.js caches app.js, style.css, data.json and the shards by the content
+// hashes in asset-manifest.json (written by build_data.py), so repeat visits
+// only download what changed since the last deploy.
+const SERVICE_WORKER_URL = "sw.js";
+
+function registerServiceWorker() {
+  if (!("serviceWorker" in navigator) || !/^https?:$/.test(location.protocol)) return;
+  navigator.serviceWorker.register(SERVICE_WORKER_URL).catch((err) => {
+    console.warn("Service worker registration failed:", err);
+  });
+}
+
+function unregisterServiceWorker() {
+  if (!("serviceWorker" in navigator)) return;
+  navigator.serviceWorker.getRegistrations().then((registrations) => {
+    for (const registration of registrations) registration.unregister();
+  });
+}
+
 // ============================================================
 // Initialization
 // ============================================================
 
 async function init() {
+  connectLiveReload();
   try {
-  const response = await fetch("data.json");
-  DATA = await response.json();
+  await loadData();
 
   // Set defaults — use default_models if available, otherwise all models
-  const defaultModels = DATA.default_models || Object.keys(DATA.models);
-  checkedModels = new Set(defaultModels.filter((m) => m in DATA.models));
-  const defaultInstructModels = DATA.instruct_default_models || Object.keys(DATA.instruct_models || {});
-  checkedInstructModels = new Set(defaultInstructModels.filter((m) => m in (DATA.instruct_models || {})));
+  const modelDirs = new Set(getSectionKeys("models"));
+  const defaultModels = DATA.default_models || [...modelDirs];
+  checkedModels = new Set(defaultModels.filter((m) => modelDirs.has(m)));
+  const instructModelDirs = new Set(getSectionKeys("instruct_models"));
+  const defaultInstructModels = DATA.instruct_default_models || [...instructModelDirs];
+  checkedInstructModels = new Set(defaultInstructModels.filter((m) => instructModelDirs.has(m)));
   checkedTasks = new Set(Object.keys(DATA.metrics_setup));
 
   // Build URL alias maps, then restore state from URL hash
@@ -953,7 +1536,6 @@ function bindEventListeners() {
       allFilterBenchmarks = new Set(Object.keys(DATA.metrics_setup));
       checkedTasks = new Set(allFilterBenchmarks);
       showFilterUI();
-      runFilter();
     } else {
       hideFilterUI();
       const benchmarks = getBenchmarksForSelection(currentTaskSelection);
@@ -968,7 +1550,6 @@ function bindEventListeners() {
     if (currentTaskSelection === "__filtered__") {
       allFilterBenchmarks = new Set(Object.keys(DATA.metrics_setup));
       syncCheckboxStates();
-      runFilter();
       renderChart();
     } else {
       checkedTasks = new Set(Object.keys(DATA.metrics_setup));
@@ -983,7 +1564,6 @@ function bindEventListeners() {
     if (currentTaskSelection === "__filtered__") {
       allFilterBenchmarks.clear();
       syncCheckboxStates();
-      runFilter();
       renderChart();
     } else {
       checkedTasks.clear();
@@ -996,9 +1576,8 @@ function bindEventListeners() {
   document.querySelectorAll(".model-select-all").forEach((btn) => {
     btn.addEventListener("click", () => {
       const cat = btn.dataset.category;
-      const modelsData = getModelsData();
       const checked = getCheckedModels();
-      for (const m of Object.keys(modelsData)) {
+      for (const m of getModelDirs()) {
         if ((getModelMeta("model_categories", m) || "multilingual") === cat) {
           checked.add(m);
         }
@@ -1010,9 +1589,8 @@ function bindEventListeners() {
   document.querySelectorAll(".model-select-none").forEach((btn) => {
     btn.addEventListener("click", () => {
       const cat = btn.dataset.category;
-      const modelsData = getModelsData();
       const checked = getCheckedModels();
-      for (const m of Object.keys(modelsData)) {
+      for (const m of getModelDirs()) {
         if ((getModelMeta("model_categories", m) || "multilingual") === cat) {
           checked.delete(m);
         }
@@ -1245,7 +1823,6 @@ function onTaskCheckboxChange() {
     document.querySelectorAll("#checkbox-grid input[data-bench]").forEach((cb) => {
       if (cb.checked) allFilterBenchmarks.add(cb.dataset.bench);
     });
-    runFilter();
     renderChart();
     return;
   }
@@ -1428,12 +2005,11 @@ function applySizeFilter() {
 }
 
 function buildModelCheckboxes() {
-  const modelsData = getModelsData();
   const checked = getCheckedModels();
 
   // Group models by category, then by organization
   const catModels = { norwegian: {}, multilingual: {} };
-  for (const modelDir of Object.keys(modelsData)) {
+  for (const modelDir of getModelDirs()) {
     const cat = getModelMeta("model_categories", modelDir) || "multilingual";
     const org = getModelMeta("model_organizations", modelDir) || "Other";
     if (!catModels[cat]) catModels[cat] = {};
@@ -1529,11 +2105,11 @@ function syncModelCheckboxStates() {
   document.querySelectorAll(".model-checkbox-grid input[data-model]").forEach((cb) => {
     cb.checked = checked.has(cb.dataset.model);
   });
-  const modelsData = getModelsData();
+  const modelDirs = getModelDirs();
   document.querySelectorAll(".model-group-checkbox").forEach((gcb) => {
     const org = gcb.dataset.org;
     const cat = gcb.dataset.cat;
-    const models = Object.keys(modelsData).filter(
+    const models = modelDirs.filter(
       (m) => (getModelMeta("model_categories", m) || "multilingual") === cat && (getModelMeta("model_organizations", m) || "Other") === org
     );
     const allChecked = models.length > 0 && models.every((m) => checked.has(m));
@@ -1654,14 +2230,28 @@ function renderChart() {
   if (controlsEl) controlsEl.style.display = isAbout ? "none" : "";
   // Also hide conditionally-visible elements when on About
   if (isAbout) {
-    for (const id of ["task-description", "filter-panel", "filter-table-container"]) {
+    for (const id of ["task-description", "filter-panel", "filter-table-container", "significance-container"]) {
       const el = document.getElementById(id);
       if (el) el.style.display = "none";
     }
   }
 
+  // Results of an aggregate chart requested for the previous state are no longer wanted
+  cancelCompute("chart");
   if (isAbout) { stateToUrl(); return; }
 
+  // Fetch the score shards this view needs, then render again
+  const sections = getRequiredSections();
+  if (!sectionsLoaded(sections)) {
+    setChartLoading(true);
+    loadSections(sections).then(() => renderChart(), (err) => {
+      console.error("loading data shards failed:", err);
+      setChartLoading(false);
+    });
+    return;
+  }
+  setChartLoading(false);
+
   // Show/hide metric selector based on task selection
   const sel = currentTaskSelection;
   if (isAggregateSelection(sel)) {
@@ -1679,7 +2269,12 @@ function renderChart() {
       allFilterBenchmarks = new Set(Object.keys(DATA.metrics_setup));
     }
     showFilterUI();
-    runFilter();
+    // Filter criteria come from the compute worker; render once they are current
+    if (filterStateKey !== getFilterStateKey()) {
+      setChartLoading(true);
+      runFilter().then(() => renderChart(), onComputeError);
+      return;
+    }
   } else {
     hideFilterUI();
   }
@@ -1694,6 +2289,7 @@ function renderChart() {
   if (fullyOpenContainer) fullyOpenContainer.style.display = isProgress ? "none" : "";
   if (isComparison) renderComparisonChart();
   else renderProgressChart();
+  renderSignificancePanel();
   stateToUrl();
 }
 
@@ -1822,7 +2418,7 @@ function renderComparisonChart() {
 function getModelList() {
   const modelsData = getModelsData();
   const checked = getCheckedModels();
-  return Object.keys(modelsData).filter((m) => checked.has(m) && isModelInSizeRange(m))
+  return getEntities(modelsData).filter((m) => checked.has(m) && isModelInSizeRange(m))
     .sort((a, b) => {
       const orgA = getModelMeta("model_organizations", a) || "";
       const orgB = getModelMeta("model_organizations", b) || "";
@@ -1928,6 +2524,7 @@ function plotChart(traces, layout) {
   const chartEl = document.getElementById("chart");
   chartEl.on("plotly_hover", onChartHover);
   chartEl.on("plotly_unhover", hideTooltip);
+  updateDebugOverlay();
 }
 
 function onChartHover(data) {
@@ -1996,32 +2593,37 @@ function onChartHover(data) {
 }
 
 function renderAggregateBarChart() {
+  setChartLoading(true);
+  requestCompute("chart", "aggregateBars").then(drawAggregateBarChart, onComputeError);
+}
+
+/** Compute job: per-model task averages of the aggregate bar chart and its y range. */
+function* aggregateBarsJob() {
   const modelsData = getModelsData();
   const modelNames = getModelList();
-  const labels = modelNames.map(getModelLabel);
   const scores = [];
   const taskCounts = [];
   const aggStderrs = [];
-  const colors = modelNames.map(getModelColor);
 
-  const needAllRaw = currentNormalization === "minmax" || currentNormalization === "zscore" || currentNormalization === "percentile";
-  const wantSE = (showStderr || showPromptDeviation) && isStderrCompatible();
+  const sourceId = currentTab === "instruct" ? "instruct_models" : "models";
   const macro = isMacroSelection();
   for (const m of modelNames) {
-    const result = aggregateScores(checkedTasks, (bench) => {
-      const raw = getScore(modelsData, m, bench, currentShot);
-      if (raw === undefined) return undefined;
-      const allRaw = needAllRaw
-        ? modelNames.map((mm) => getScore(modelsData, mm, bench, currentShot)).filter((v) => v !== undefined)
-        : null;
-      const score = applyNorm(raw, bench, allRaw);
-      const se = wantSE ? scaleStderr(getCombinedSE(modelsData, m, bench, currentShot), bench, undefined, allRaw) : undefined;
-      return { score, stderr: se };
-    }, macro);
+    const result = aggregateScores(checkedTasks, (bench) => getNormalizedCell(sourceId, m, bench, currentShot), macro);
     scores.push(result ? result.score : 0);
     taskCounts.push(result ? result.count : 0);
     aggStderrs.push(result ? result.stderr : 0);
+    yield;
   }
+  const yRange = computeAggregateYRange(modelsData, checkedTasks);
+  return { modelNames, scores, taskCounts, aggStderrs, yRange };
+}
+
+function drawAggregateBarChart({ modelNames, scores, taskCounts, aggStderrs, yRange }) {
+  setChartLoading(false);
+  const labels = modelNames.map(getModelLabel);
+  const colors = modelNames.map(getModelColor);
+  const wantSE = (showStderr || showPromptDeviation) && isStderrCompatible();
+  const macro = isMacroSelection();
 
   const fmt = currentNormalization === "zscore" ? 2 : 1;
   const trace = {
@@ -2039,7 +2641,6 @@ function renderAggregateBarChart() {
   }
 
   const avgLabel = macro ? "category average" : "task average";
-  const yRange = computeAggregateYRange(modelsData, checkedTasks);
   const layoutOpts = {
     title: { text: getAggregateLabel() + " \u2013 " + avgLabel + " (" + currentShot + "-shot)", font: { size: 16 } },
     yaxis: { title: getNormYLabel(), range: yRange, showgrid: false, zeroline: currentNormalization === "zscore" },
@@ -2072,7 +2673,7 @@ function renderGroupedBarChart(groupName) {
   const groupSeArrs = [];     // per-group SE arrays for annotations
   const dataTraces = group.benchmarks.map((bench, i) => {
     const allRaw = needAllRaw
-      ? modelNames.map((mm) => getScore(modelsData, mm, bench, currentShot, metric)).filter((v) => v !== undefined)
+      ? normParamsFromValues(modelNames.map((mm) => getScore(modelsData, mm, bench, currentShot, metric)).filter((v) => v !== undefined))
       : null;
     const values = modelNames.map((m) => {
       const raw = getScore(modelsData, m, bench, currentShot, metric);
@@ -2115,7 +2716,8 @@ function renderGroupedBarChart(groupName) {
     for (const shot of ALL_SHOTS) {
       for (const bench of group.benchmarks) {
         const raws = modelNames.map((m) => getScore(modelsData, m, bench, shot, metric)).filter((v) => v !== undefined);
-        for (const raw of raws) vals.push(applyNorm(raw, bench, needAllRaw ? raws : null, metric));
+        const norm = needAllRaw ? normParamsFromValues(raws) : null;
+        for (const raw of raws) vals.push(applyNorm(raw, bench, norm, metric));
       }
     }
     yRange = computeYRange(vals);
@@ -2160,7 +2762,7 @@ function renderSingleBenchmarkBarChart(benchmark) {
   const labels = modelNames.map(getModelLabel);
   const colors = modelNames.map(getModelColor);
   const allRaw = (currentNormalization !== "none")
-    ? modelNames.map((mm) => getScore(modelsData, mm, benchmark, currentShot, metric)).filter((v) => v !== undefined)
+    ? normParamsFromValues(modelNames.map((mm) => getScore(modelsData, mm, benchmark, currentShot, metric)).filter((v) => v !== undefined))
     : null;
   const values = modelNames.map((m) => {
     const raw = getScore(modelsData, m, benchmark, currentShot, metric);
@@ -2209,6 +2811,173 @@ function renderSingleBenchmarkBarChart(benchmark) {
   plotChart(traces, getPlotlyLayout(layoutOpts));
 }
 
+// ============================================================
+// Pairwise significance (significance shard)
+// ============================================================
+
+// build_data.py precomputes a two-sided z-test for every pair of models per
+// (shot, prompt aggregation, benchmark), plus the task and category averages
+// at random-baseline normalization, as upper-triangle strings with one
+// character per pair: "." = no test, else the signed level int(c) - 3 (> 0:
+// the first model is better at p < 0.05 / 0.01 / 0.001). See significance.py.
+// The shard is only fetched once the panel is opened.
+
+const SIGNIFICANCE_P_LABELS = ["p \u2265 0.05", "p < 0.05", "p < 0.01", "p < 0.001"];
+
+/**
+ * Codes for the current view: { entities, codes } or { reason } when the view
+ * has no precomputed matrix (groups, subsets, other metrics or normalizations).
+ */
+function getSignificanceCodes(sourceId) {
+  const section = DATA.significance && DATA.significance[sourceId];
+  if (!section) return { reason: "No significance data for this tab." };
+  const sel = currentTaskSelection;
+  let codes;
+  if (sel === "__all__" || sel === "__all_macro__") {
+    if (currentNormalization !== "baseline" || checkedTasks.size !== Object.keys(DATA.metrics_setup).length) {
+      return { reason: "Aggregate significance is precomputed for all tasks with random-baseline normalization." };
+    }
+    codes = section.aggregate[currentShot]?.[currentPromptAgg]?.[sel === "__all__" ? "tasks" : "categories"];
+  } else if (DATA.metrics_setup[sel]) {
+    if (getEffectiveMetric(sel) !== DATA.metrics_setup[sel].main_metric) {
+      return { reason: "Significance is precomputed for the main metric only." };
+    }
+    codes = section.benchmarks[currentShot]?.[currentPromptAgg]?.[sel];
+  } else {
+    return { reason: "Significance is available for single tasks and the all-task averages." };
+  }
+  if (!codes) return { reason: "No scores for this task and shot setting." };
+  return { entities: section.entities, codes };
+}
+
+/** Signed significance level of entity i over entity j (-3..3), or null if untested. */
+function significanceLevel(codes, n, i, j) {
+  if (i === j) return null;
+  if (i > j) {
+    const level = significanceLevel(codes, n, j, i);
+    return level ? -level : level;  // keeps null and avoids -0
+  }
+  const c = codes.charCodeAt((i * (2 * n - i - 1)) / 2 + (j - i - 1));
+  return c === 46 ? null : c - 51;  // "." / "3"
+}
+
+/**
+ * Split models sorted by score (best first) into tie groups: a model joins the
+ * current group unless the group's leader is significantly better than it.
+ */
+function significanceTieGroups(order, levelOf) {
+  const groups = [];
+  for (const m of order) {
+    const group = groups[groups.length - 1];
+    if (group && !(levelOf(group[0], m) > 0)) group.push(m);
+    else groups.push([m]);
+  }
+  return groups;
+}
+
+/** Current-view score of each model, for ordering the significance panel. */
+function getSignificanceScores(sourceId, modelNames) {
+  const sel = currentTaskSelection;
+  const scores = new Map();
+  for (const m of modelNames) {
+    let score;
+    if (DATA.metrics_setup[sel]) {
+      score = getScore(getSourceById(sourceId), m, sel, currentShot);
+    } else {
+      const result = aggregateScores(checkedTasks, (bench) => getNormalizedCell(sourceId, m, bench, currentShot), isMacroSelection());
+      score = result ? result.score : undefined;
+    }
+    if (score !== undefined) scores.set(m, score);
+  }
+  return scores;
+}
+
+function renderSignificancePanel() {
+  const container = document.getElementById("significance-container");
+  if (!container) return;
+  const isComparison = currentTab === "comparison" || currentTab === "instruct";
+  const available = DATA.significance || (DATA.shards && DATA.shards.significance);
+  container.style.display = isComparison && available ? "" : "none";
+  if (!isComparison || !available) return;
+
+  const toggleBtn = document.getElementById("significance-toggle");
+  const content = document.getElementById("significance-content");
+  const summary = document.getElementById("significance-summary");
+  toggleBtn.textContent = significanceExpanded ? "Hide significance" : "Show significance";
+  toggleBtn.onclick = () => {
+    significanceExpanded = !significanceExpanded;
+    renderSignificancePanel();
+  };
+  content.style.display = significanceExpanded ? "" : "none";
+  summary.textContent = "";
+  if (!significanceExpanded) return;
+  if (!sectionsLoaded(["significance"])) {
+    summary.textContent = "Loading\u2026";
+    loadSections(["significance"]).then(renderSignificancePanel, (err) => {
+      console.error("loading significance shard failed:", err);
+      summary.textContent = "Could not load significance data.";
+    });
+    return;
+  }
+
+  const sourceId = currentTab === "instruct" ? "instruct_models" : "models";
+  const groupsEl = document.getElementById("significance-groups");
+  const heatmapEl = document.getElementById("significance-heatmap");
+  const { entities, codes, reason } = getSignificanceCodes(sourceId);
+  if (reason) {
+    summary.textContent = reason;
+    groupsEl.innerHTML = "";
+    Plotly.purge(heatmapEl);
+    return;
+  }
+  const index = new Map(entities.map((e, i) => [e, i]));
+  const scores = getSignificanceScores(sourceId, getModelList().filter((m) => index.has(m)));
+  const order = [...scores.keys()].sort((a, b) => scores.get(b) - scores.get(a));
+  const levelOf = (a, b) => significanceLevel(codes, entities.length, index.get(a), index.get(b));
+  const groups = significanceTieGroups(order, levelOf);
+  summary.textContent = order.length + " models in " + groups.length
+    + " tie group" + (groups.length === 1 ? "" : "s") + " (two-sided z-test, p < 0.05)";
+
+  groupsEl.innerHTML = "";
+  const list = document.createElement("ol");
+  list.className = "significance-group-list";
+  for (const group of groups) {
+    const item = document.createElement("li");
+    item.textContent = group.map(getModelLabel).join(", ");
+    list.appendChild(item);
+  }
+  groupsEl.appendChild(list);
+
+  const labels = order.map(getModelLabel);
+  const z = order.map((a) => order.map((b) => levelOf(a, b)));
+  const text = order.map((a, i) => order.map((b, j) => {
+    const level = z[i][j];
+    if (a === b) return labels[i];
+    if (level === null) return labels[i] + " vs " + labels[j] + ": not tested";
+    if (level === 0) return labels[i] + " vs " + labels[j] + ": no significant difference";
+    const better = level > 0 ? labels[i] : labels[j];
+    return labels[i] + " vs " + labels[j] + ": " + better + " better (" + SIGNIFICANCE_P_LABELS[Math.abs(level)] + ")";
+  }));
+  const trace = {
+    type: "heatmap", z, x: labels, y: labels, text, hoverinfo: "text",
+    zmin: -3, zmax: 3, xgap: 1, ygap: 1,
+    colorscale: [[0, "#b2182b"], [0.5, "#f7f7f7"], [1, "#2166ac"]],
+    colorbar: {
+      tickvals: [-3, -2, -1, 0, 1, 2, 3],
+      ticktext: ["worse, p<0.001", "p<0.01", "p<0.05", "no difference", "p<0.05", "p<0.01", "better, p<0.001"],
+      thickness: 12,
+    },
+  };
+  const size = Math.max(320, 22 * order.length + 200);
+  Plotly.newPlot(heatmapEl, [trace], getPlotlyLayout({
+    title: { text: "Row model vs column model (" + currentShot + "-shot, " + currentPromptAgg + ")", font: { size: 14 } },
+    height: size,
+    xaxis: { tickangle: computeTickAngle(labels), showgrid: false, side: "top" },
+    yaxis: { autorange: "reversed", showgrid: false, automargin: true },
+    margin: { l: 60, r: 20, t: 140, b: 20 },
+  }), PLOTLY_CONFIG);
+}
+
 // ============================================================
 // Training Progress charts
 // ============================================================
@@ -2223,7 +2992,7 @@ function renderProgressChart() {
 const TOKENS_PER_STEP = 8192 * 1024; // 8,388,608 tokens per training step
 
 function getSteps() {
-  return Object.keys(DATA.progress).map(Number).sort((a, b) => a - b);
+  return getEntities(DATA.progress).map(Number).sort((a, b) => a - b);
 }
 
 function stepsToTokens(steps) {
@@ -2236,7 +3005,7 @@ function getAblations() {
 
 function getAblationSteps(ablationName) {
   if (!DATA.ablations || !DATA.ablations[ablationName]) return [];
-  return Object.keys(DATA.ablations[ablationName]).map(Number).sort((a, b) => a - b);
+  return getEntities(DATA.ablations[ablationName]).map(Number).sort((a, b) => a - b);
 }
 
 function getAblationDisplayName(ablationName) {
@@ -2266,23 +3035,36 @@ function makeBandTrace(xValues, yValues, seValues, color) {
 }
 
 function renderAggregateProgressChart() {
+  setChartLoading(true);
+  requestCompute("chart", "aggregateProgress").then(drawAggregateProgressChart, onComputeError);
+}
+
+/** Aggregate scores of a progress-like source ("progress", "ablation:<name>") at every step. */
+function aggregateStepScores(sourceId, steps) {
+  const macro = isMacroSelection();
+  return steps.map((step) =>
+    aggregateScores(checkedTasks, (bench) => getNormalizedCell(sourceId, String(step), bench, currentShot), macro));
+}
+
+/** Compute job: NorOLMo and ablation task averages per step, and the y range. */
+function* aggregateProgressJob() {
   const steps = getSteps();
-  const allStepEntities = steps.map(String);
+  const aggResults = aggregateStepScores("progress", steps);
+  yield;
+  const ablations = [];
+  for (const ablName of getAblations()) {
+    const ablSteps = getAblationSteps(ablName);
+    if (!ablSteps.length) continue;
+    ablations.push({ name: ablName, steps: ablSteps, aggResults: aggregateStepScores("ablation:" + ablName, ablSteps) });
+    yield;
+  }
+  return { steps, aggResults, ablations, yRange: computeProgressAggregateYRange() };
+}
+
+function drawAggregateProgressChart({ steps, aggResults, ablations, yRange }) {
+  setChartLoading(false);
   const macro = isMacroSelection();
-  const needAllRaw = currentNormalization === "minmax" || currentNormalization === "zscore" || currentNormalization === "percentile";
   const wantSE = (showStderr || showPromptDeviation) && isStderrCompatible();
-  const aggResults = steps.map((step) => {
-    return aggregateScores(checkedTasks, (bench) => {
-      const raw = getScore(DATA.progress, step, bench, currentShot);
-      if (raw === undefined) return undefined;
-      const allRaw = needAllRaw
-        ? allStepEntities.map((s) => getScore(DATA.progress, s, bench, currentShot)).filter((v) => v !== undefined)
-        : null;
-      const score = applyNorm(raw, bench, allRaw);
-      const se = wantSE ? scaleStderr(getCombinedSE(DATA.progress, step, bench, currentShot), bench, undefined, allRaw) : undefined;
-      return { score, stderr: se };
-    }, macro);
-  });
   const scores = aggResults.map((r) => r ? r.score : null);
   const aggSes = aggResults.map((r) => r ? r.stderr : null);
 
@@ -2300,23 +3082,8 @@ function renderAggregateProgressChart() {
   });
 
   // Add ablation traces
-  for (const ablName of getAblations()) {
-    const ablSteps = getAblationSteps(ablName);
-    if (!ablSteps.length) continue;
+  for (const { name: ablName, steps: ablSteps, aggResults: ablAggResults } of ablations) {
     const ablTokens = stepsToTokens(ablSteps);
-    const ablAllStepEntities = ablSteps.map(String);
-    const ablAggResults = ablSteps.map((step) => {
-      return aggregateScores(checkedTasks, (bench) => {
-        const raw = getScore(DATA.ablations[ablName], step, bench, currentShot);
-        if (raw === undefined) return undefined;
-        const allRaw = needAllRaw
-          ? ablAllStepEntities.map((s) => getScore(DATA.ablations[ablName], s, bench, currentShot)).filter((v) => v !== undefined)
-          : null;
-        const score = applyNorm(raw, bench, allRaw);
-        const se = wantSE ? scaleStderr(getCombinedSE(DATA.ablations[ablName], step, bench, currentShot), bench, undefined, allRaw) : undefined;
-        return { score, stderr: se };
-      }, macro);
-    });
     const ablScores = ablAggResults.map((r) => r ? r.score : null);
     const ablSes = ablAggResults.map((r) => r ? r.stderr : null);
     if (wantSE) {
@@ -2332,7 +3099,6 @@ function renderAggregateProgressChart() {
   }
 
   const avgLabel = macro ? "category average" : "task average";
-  const yRange = computeProgressAggregateYRange();
   const hasAblations = getAblations().length > 0;
   const layout = getPlotlyLayout({
     title: { text: "NorOLMo progress \u2013 " + getAggregateLabel() + " \u2013 " + avgLabel + " (" + currentShot + "-shot)", font: { size: 16 } },
@@ -2360,7 +3126,7 @@ function renderGroupProgressChart(groupName) {
   const traces = [];
   group.benchmarks.forEach((bench, i) => {
     const allRaw = needAllRaw
-      ? allStepEntities.map((s) => getScore(DATA.progress, s, bench, currentShot, metric)).filter((v) => v !== undefined)
+      ? normParamsFromValues(allStepEntities.map((s) => getScore(DATA.progress, s, bench, currentShot, metric)).filter((v) => v !== undefined))
       : null;
     const ys = steps.map((s) => {
       const raw = getScore(DATA.progress, s, bench, currentShot, metric);
@@ -2395,7 +3161,7 @@ function renderGroupProgressChart(groupName) {
     const ablDisplayName = getAblationDisplayName(ablName);
     group.benchmarks.forEach((bench, i) => {
       const allRaw = needAllRaw
-        ? ablAllStepEntities.map((s) => getScore(DATA.ablations[ablName], s, bench, currentShot, metric)).filter((v) => v !== undefined)
+        ? normParamsFromValues(ablAllStepEntities.map((s) => getScore(DATA.ablations[ablName], s, bench, currentShot, metric)).filter((v) => v !== undefined))
         : null;
       const ys = ablSteps.map((s) => {
         const raw = getScore(DATA.ablations[ablName], s, bench, currentShot, metric);
@@ -2427,7 +3193,8 @@ function renderGroupProgressChart(groupName) {
     const vals = [];
     for (const bench of group.benchmarks) {
       const raws = allStepEntities.map((s) => getScore(DATA.progress, s, bench, currentShot, metric)).filter((v) => v !== undefined);
-      for (const raw of raws) vals.push(applyNorm(raw, bench, needAllRaw ? raws : null, metric));
+      const norm = needAllRaw ? normParamsFromValues(raws) : null;
+      for (const raw of raws) vals.push(applyNorm(raw, bench, norm, metric));
     }
     yRange = computeYRange(vals);
   } else {
@@ -2527,22 +3294,10 @@ function computeYRange(values) {
 
 function computeAggregateYRange(dataSource, benchmarks) {
   const allAvgs = [];
-  const entities = Object.keys(dataSource);
-  const needAllRaw = currentNormalization === "minmax" || currentNormalization === "zscore" || currentNormalization === "percentile";
+  const sourceId = dataSource === DATA.instruct_models ? "instruct_models" : "models";
   const macro = isMacroSelection();
-  const isComparisonData = dataSource === DATA.models || dataSource === DATA.instruct_models;
-  const modelNames = isComparisonData ? getModelList() : null;
-  for (const entity of entities) {
-    if (isComparisonData && (!getCheckedModels().has(entity) || !isModelInSizeRange(entity))) continue;
-    const result = aggregateScores(benchmarks, (bench) => {
-      const raw = getScore(dataSource, entity, bench, currentShot);
-      if (raw === undefined) return undefined;
-      if (needAllRaw && modelNames) {
-        const allRaw = modelNames.map((mm) => getScore(dataSource, mm, bench, currentShot)).filter((v) => v !== undefined);
-        return applyNorm(raw, bench, allRaw);
-      }
-      return applyNorm(raw, bench, null);
-    }, macro);
+  for (const entity of getModelList()) {
+    const result = aggregateScores(benchmarks, (bench) => getNormalizedCell(sourceId, entity, bench, currentShot), macro);
     if (result) allAvgs.push(result.score);
   }
   return computeYRange(allAvgs);
@@ -2551,7 +3306,7 @@ function computeAggregateYRange(dataSource, benchmarks) {
 function computeRawYMax_display(dataSource, benchmarks, metric) {
   const isComparisonData = dataSource === DATA.models || dataSource === DATA.instruct_models;
   const vals = [];
-  for (const entity of Object.keys(dataSource)) {
+  for (const entity of getEntities(dataSource)) {
     if (isComparisonData && (!getCheckedModels().has(entity) || !isModelInSizeRange(entity))) continue;
     for (const bench of benchmarks) {
       const v = getScore(dataSource, entity, bench, currentShot, metric);
@@ -2570,7 +3325,7 @@ function collectProgressVals(benchmarks, metric) {
   const sources = [DATA.progress];
   for (const ablName of getAblations()) sources.push(DATA.ablations[ablName]);
   for (const ds of sources) {
-    for (const entity of Object.keys(ds)) {
+    for (const entity of getEntities(ds)) {
       for (const bench of benchmarks) {
         const v = getScore(ds, entity, bench, currentShot, metric);
         if (v != null) vals.push(toDisplayScale(v, bench, metric));
@@ -2595,43 +3350,23 @@ function computeProgressRawYRange(benchmarks, metric) {
 function computeSingleYRange(dataSource, benchmark, metric) {
   const isComparisonData = dataSource === DATA.models || dataSource === DATA.instruct_models;
   const vals = [];
-  const entities = Object.keys(dataSource).filter((e) => !isComparisonData || (getCheckedModels().has(e) && isModelInSizeRange(e)));
+  const entities = getEntities(dataSource).filter((e) => !isComparisonData || (getCheckedModels().has(e) && isModelInSizeRange(e)));
   const raws = entities.map((e) => getScore(dataSource, e, benchmark, currentShot, metric)).filter((v) => v !== undefined);
+  const norm = normParamsFromValues(raws);
   for (const raw of raws) {
     if (currentNormalization === "none") vals.push(toDisplayScale(raw, benchmark, metric));
-    else vals.push(applyNorm(raw, benchmark, raws, metric));
+    else vals.push(applyNorm(raw, benchmark, norm, metric));
   }
   return computeYRange(vals);
 }
 
 function computeProgressAggregateYRange() {
   const allAvgs = [];
-  const allStepEntities = Object.keys(DATA.progress);
-  const needAllRaw = currentNormalization === "minmax" || currentNormalization === "zscore" || currentNormalization === "percentile";
-  const macro = isMacroSelection();
-  for (const step of allStepEntities) {
-    const result = aggregateScores(checkedTasks, (bench) => {
-      const raw = getScore(DATA.progress, step, bench, currentShot);
-      if (raw === undefined) return undefined;
-      const allRaw = needAllRaw
-        ? allStepEntities.map((s) => getScore(DATA.progress, s, bench, currentShot)).filter((v) => v !== undefined)
-        : null;
-      return applyNorm(raw, bench, allRaw);
-    }, macro);
-    if (result) allAvgs.push(result.score);
-  }
+  const sources = [["progress", getSteps()]];
   // Include ablation data in Y-range computation
-  for (const ablName of getAblations()) {
-    const ablStepEntities = Object.keys(DATA.ablations[ablName]);
-    for (const step of ablStepEntities) {
-      const result = aggregateScores(checkedTasks, (bench) => {
-        const raw = getScore(DATA.ablations[ablName], step, bench, currentShot);
-        if (raw === undefined) return undefined;
-        const allRaw = needAllRaw
-          ? ablStepEntities.map((s) => getScore(DATA.ablations[ablName], s, bench, currentShot)).filter((v) => v !== undefined)
-          : null;
-        return applyNorm(raw, bench, allRaw);
-      }, macro);
+  for (const ablName of getAblations()) sources.push(["ablation:" + ablName, getAblationSteps(ablName)]);
+  for (const [sourceId, steps] of sources) {
+    for (const result of aggregateStepScores(sourceId, steps)) {
       if (result) allAvgs.push(result.score);
     }
   }
@@ -2716,43 +3451,160 @@ function getNoiseScaleFactor(benchmark) {
   return info.metric_scale === "unit" ? 100 : 1;
 }
 
+// ============================================================
+// Training-progress filter index
+// ============================================================
+
+const FILTER_SERIES_FIELDS = ["max", "mean", "median", "min", "prompt_sd", "prompt_mad", "max_prompt_idx"];
+
+/** Index per benchmark|shot|prompt agg|normalization (see buildFilterIndex). */
+const _filterIndexCache = new Map();
+
+/** Step-aligned main-metric series of one benchmark and shot ({steps, max, mean, ...},
+ *  null = missing), from the progress_filter section, or gathered from DATA.progress
+ *  when the data was built without it. */
+function getFilterSeries(benchmark, shot) {
+  if (DATA.progress_filter) {
+    const series = DATA.progress_filter.series[shot]?.[benchmark];
+    return series ? Object.assign({ steps: DATA.progress_filter.steps }, series) : null;
+  }
+  if (!DATA.progress) return null;
+  const mainMetric = DATA.metrics_setup[benchmark].main_metric;
+  const steps = getEntities(DATA.progress).map(Number).sort((a, b) => a - b);
+  const series = { steps };
+  for (const field of FILTER_SERIES_FIELDS) series[field] = [];
+  for (const s of steps) {
+    const obj = getCellStats(DATA.progress, String(s), benchmark, shot, mainMetric);
+    for (const field of FILTER_SERIES_FIELDS) {
+      series[field].push(obj && obj[field] != null ? obj[field] : null);
+    }
+  }
+  return series;
+}
+
+/** Precompute everything the filter criteria need for one benchmark/shot in the
+ *  current prompt aggregation and normalization: normalized scores (population =
+ *  all steps), prefix sums of scores, squared scores, prompt noise and best-prompt
+ *  switches, and sparse tables for range maxima and minima.  Sums are taken relative to the
+ *  overall mean to keep the variance well conditioned. */
+function buildFilterIndex(benchmark, shot) {
+  const series = getFilterSeries(benchmark, shot);
+  if (!series) return null;
+  const steps = series.steps;
+  const raw = series[currentPromptAgg];
+  const n = steps.length;
+  const params = normParamsFromValues(raw.filter((v) => v !== null));
+  const noiseFactor = getNoiseScaleFactor(benchmark);
+
+  const score = new Float64Array(n).fill(NaN);
+  let total = 0;
+  for (let i = 0; i < n; i++) {
+    if (raw[i] === null) continue;
+    score[i] = applyNorm(raw[i], benchmark, params);
+    total += score[i];
+  }
+  const ref = params.n ? total / params.n : 0;
+
+  const count = new Int32Array(n + 1);
+  const sum = new Float64Array(n + 1);
+  const sumSq = new Float64Array(n + 1);
+  const noise = new Float64Array(n + 1);
+  const switches = new Int32Array(n + 1);
+  const missingIdx = new Int32Array(n + 1);
+  const switched = new Uint8Array(n);  // best prompt differs from the previous present step
+  let prevIdx, hasPrev = false;
+  for (let i = 0; i < n; i++) {
+    const present = raw[i] !== null;
+    count[i + 1] = count[i] + (present ? 1 : 0);
+    sum[i + 1] = sum[i];
+    sumSq[i + 1] = sumSq[i];
+    noise[i + 1] = noise[i];
+    switches[i + 1] = switches[i];
+    missingIdx[i + 1] = missingIdx[i];
+    if (!present) continue;
+    const d = score[i] - ref;
+    sum[i + 1] += d;
+    sumSq[i + 1] += d * d;
+    noise[i + 1] += currentPromptAgg === "median"
+      ? 1.4826 * (series.prompt_mad[i] || 0) * noiseFactor
+      : (series.prompt_sd[i] || 0) * noiseFactor;
+    const idx = series.max_prompt_idx[i];
+    if (idx === null) missingIdx[i + 1]++;
+    if (hasPrev && idx !== prevIdx) { switched[i] = 1; switches[i + 1]++; }
+    prevIdx = idx;
+    hasPrev = true;
+  }
+
+  // nextPresent[i]: first step index >= i with a score (n if none)
+  const nextPresent = new Int32Array(n + 1).fill(n);
+  for (let i = n - 1; i >= 0; i--) nextPresent[i] = raw[i] !== null ? i : nextPresent[i + 1];
+
+  const maxTable = buildSparseTable(score, Math.max, -Infinity);
+  const minTable = buildSparseTable(score, Math.min, Infinity);
+
+  const info = DATA.metrics_setup[benchmark];
+  return {
+    steps, score, promptMad: series.prompt_mad, noiseFactor, ref,
+    count, sum, sumSq, noise, switches, missingIdx, switched, nextPresent, maxTable, minTable,
+    normBaseline: applyNorm(info.random_baseline || 0, benchmark, params),
+  };
+}
+
+function getFilterIndex(benchmark, shot) {
+  const key = [benchmark, shot, currentPromptAgg, currentNormalization].join("|");
+  if (!_filterIndexCache.has(key)) _filterIndexCache.set(key, buildFilterIndex(benchmark, shot));
+  return _filterIndexCache.get(key);
+}
+
+/** Sparse table for O(1) range queries: table[j][i] = op over values[i .. i + 2^j - 1],
+ *  with NaN (missing) replaced by the identity of op. */
+function buildSparseTable(values, op, identity) {
+  const n = values.length;
+  const table = [Float64Array.from(values, (v) => (Number.isNaN(v) ? identity : v))];
+  for (let j = 1; (1 << j) <= n; j++) {
+    const prev = table[j - 1], half = 1 << (j - 1);
+    const level = new Float64Array(n - (1 << j) + 1);
+    for (let i = 0; i < level.length; i++) level[i] = op(prev[i], prev[i + half]);
+    table.push(level);
+  }
+  return table;
+}
+
+function querySparseTable(table, op, lo, hi) {
+  const j = 31 - Math.clz32(hi - lo);
+  return op(table[j][lo], table[j][hi - (1 << j)]);
+}
+
+/** Mean and sample SD of the normalized scores in step indices [lo, hi) holding k
+ *  scores.  Constant windows are detected via the range extrema and returned exactly,
+ *  since prefix-sum differences would leave rounding residue there. */
+function filterWindowMoments(index, lo, hi, k) {
+  const max = querySparseTable(index.maxTable, Math.max, lo, hi);
+  if (max === querySparseTable(index.minTable, Math.min, lo, hi)) return { mean: max, sd: 0 };
+  const s = index.sum[hi] - index.sum[lo];
+  const ss = Math.max(0, index.sumSq[hi] - index.sumSq[lo] - (s * s) / k);
+  return { mean: index.ref + s / k, sd: Math.sqrt(ss / (k - 1)) };
+}
+
 function computeFilterCriteriaForBench(benchmark, shot) {
-  if (!DATA || !DATA.progress) return {};
-  const steps = Object.keys(DATA.progress).map(Number).sort((a, b) => a - b);
+  if (!DATA || !(DATA.progress_filter || DATA.progress)) return {};
   const info = DATA.metrics_setup[benchmark];
   if (!info) return {};
-  const mainMetric = info.main_metric;
+  const index = getFilterIndex(benchmark, shot);
+  if (!index) return {};
   const results = {};
 
-  // Collect all raw scores across ALL steps for this benchmark (needed for minmax/zscore/percentile)
-  const allRawScores = steps.map(s => {
-    const obj = DATA.progress[String(s)]?.[benchmark]?.[shot]?.[mainMetric];
-    return obj ? obj[currentPromptAgg] : undefined;
-  }).filter(v => v !== undefined);
-
-  // Noise scale factor (for prompt_sd / prompt_mad normalization)
-  const noiseFactor = getNoiseScaleFactor(benchmark);
-
   for (const [name, cfg] of Object.entries(filterCriteria)) {
-    const windowSteps = steps.filter(s => s >= cfg.minStep && s <= cfg.maxStep);
-
-    // Extract raw scores and associated data in window
-    const pairs = [];
-    for (const s of windowSteps) {
-      const obj = DATA.progress[String(s)]?.[benchmark]?.[shot]?.[mainMetric];
-      if (!obj) continue;
-      const rawScore = obj[currentPromptAgg];
-      if (rawScore === undefined || rawScore === null) continue;
-      // Normalize score using the same normalization as the chart
-      const score = applyNorm(rawScore, benchmark, allRawScores);
-      pairs.push({ step: s, score, rawScore, obj });
-    }
+    // Window [lo, hi) of step indices; k scored checkpoints in it
+    const lo = countBelow(index.steps, cfg.minStep, false);
+    const hi = Math.max(lo, countBelow(index.steps, cfg.maxStep, true));
+    const k = index.count[hi] - index.count[lo];
 
-    if (pairs.length < 3 && name !== "nonRandom") {
+    if (k < 3 && name !== "nonRandom") {
       results[name] = { value: null, pass: null };
       continue;
     }
-    if (pairs.length < 1) {
+    if (k < 1) {
       results[name] = { value: null, pass: null };
       continue;
     }
@@ -2760,40 +3612,41 @@ function computeFilterCriteriaForBench(benchmark, shot) {
     let value = null;
 
     switch (name) {
-      case "monotonicity":
+      case "monotonicity": {
         // Rank-based: invariant to normalization, but use normalized scores for consistency
-        value = computeSpearmanRank(pairs.map(p => p.step), pairs.map(p => p.score));
+        const xs = [], ys = [];
+        for (let i = lo; i < hi; i++) {
+          if (Number.isNaN(index.score[i])) continue;
+          xs.push(index.steps[i]);
+          ys.push(index.score[i]);
+        }
+        value = computeSpearmanRank(xs, ys);
         break;
+      }
 
       case "snr": {
         // signal = mean(normalized score), noise = mean(normalized prompt noise)
-        const scores = pairs.map(p => p.score);
-        const noiseVals = currentPromptAgg === "median"
-          ? pairs.map(p => 1.4826 * (p.obj.prompt_mad || 0) * noiseFactor)
-          : pairs.map(p => (p.obj.prompt_sd || 0) * noiseFactor);
-        const meanScore = scores.reduce((a, b) => a + b, 0) / scores.length;
-        const meanNoise = noiseVals.reduce((a, b) => a + b, 0) / noiseVals.length;
+        const meanScore = filterWindowMoments(index, lo, hi, k).mean;
+        const meanNoise = (index.noise[hi] - index.noise[lo]) / k;
         value = meanNoise > 1e-10 ? meanScore / (meanNoise + 1e-8) : (meanScore > 0 ? Infinity : 0);
         break;
       }
 
       case "cv": {
         // CV on normalized scores
-        const scores = pairs.map(p => p.score);
-        const n = scores.length;
-        const mean = scores.reduce((a, b) => a + b, 0) / n;
-        const sampleStd = n > 1
-          ? Math.sqrt(scores.reduce((s, v) => s + (v - mean) ** 2, 0) / (n - 1))
-          : 0;
+        const { mean, sd: sampleStd } = filterWindowMoments(index, lo, hi, k);
         value = Math.abs(mean) > 1e-10 ? (sampleStd / Math.abs(mean)) * 100 : (sampleStd > 0 ? Infinity : 0);
         break;
       }
 
       case "mad": {
         // Median of MAD(prompt scores), scaled by noise factor
-        const promptMads = pairs.map(p => p.obj.prompt_mad).filter(v => v != null);
-        if (promptMads.length === 0) { value = null; break; }
-        const scaledMads = promptMads.map(m => m * noiseFactor);
+        const scaledMads = [];
+        for (let i = lo; i < hi; i++) {
+          if (Number.isNaN(index.score[i]) || index.promptMad[i] == null) continue;
+          scaledMads.push(index.promptMad[i] * index.noiseFactor);
+        }
+        if (scaledMads.length === 0) { value = null; break; }
         scaledMads.sort((a, b) => a - b);
         const med = scaledMads.length % 2 === 0
           ? (scaledMads[scaledMads.length / 2 - 1] + scaledMads[scaledMads.length / 2]) / 2
@@ -2807,24 +3660,18 @@ function computeFilterCriteriaForBench(benchmark, shot) {
         break;
 
       case "promptSwitch": {
-        const indices = pairs.map(p => p.obj.max_prompt_idx);
-        if (indices.some(v => v == null)) { value = null; break; }
-        let switches = 0;
-        for (let i = 1; i < indices.length; i++) {
-          if (indices[i] !== indices[i - 1]) switches++;
-        }
-        value = indices.length > 1 ? (switches / (indices.length - 1)) * 100 : 0;
+        if (index.missingIdx[hi] - index.missingIdx[lo] > 0) { value = null; break; }
+        // A switch into the window's first checkpoint happened outside the window
+        const first = index.nextPresent[lo];
+        const switches = index.switches[hi] - index.switches[lo] - index.switched[first];
+        value = k > 1 ? (switches / (k - 1)) * 100 : 0;
         break;
       }
 
-      case "nonRandom": {
+      case "nonRandom":
         // Use normalized scores; normalize the baseline in the same space
-        const scores = pairs.map(p => p.score);
-        const maxScore = Math.max(...scores);
-        const normBaseline = applyNorm(info.random_baseline || 0, benchmark, allRawScores);
-        value = maxScore - normBaseline;
+        value = querySparseTable(index.maxTable, Math.max, lo, hi) - index.normBaseline;
         break;
-      }
     }
 
     const pass = evaluateThreshold(name, value, cfg.threshold);
@@ -2834,15 +3681,33 @@ function computeFilterCriteriaForBench(benchmark, shot) {
   return results;
 }
 
-function runFilter() {
-  if (currentTaskSelection !== "__filtered__") return;
+/** Inputs of filterResults; renderChart() re-runs the filter when they change. */
+function getFilterStateKey() {
+  const criteria = Object.entries(filterCriteria).map(([name, cfg]) =>
+    [name, cfg.enabled, cfg.minStep, cfg.maxStep, cfg.threshold]);
+  return JSON.stringify([currentShot, currentPromptAgg, currentNormalization, [...allFilterBenchmarks], criteria]);
+}
 
-  // Compute criteria for all benchmarks in the full set
-  filterResults = {};
+/** Compute job: criteria for all benchmarks in the full filter set. */
+function* filterJob() {
+  const results = {};
   for (const bench of allFilterBenchmarks) {
-    filterResults[bench] = computeFilterCriteriaForBench(bench, currentShot);
+    results[bench] = computeFilterCriteriaForBench(bench, currentShot);
+    yield;
   }
+  return results;
+}
+
+function runFilter() {
+  const key = getFilterStateKey();
+  return requestCompute("filter", "filter").then((results) => {
+    filterResults = results;
+    filterStateKey = key;
+    applyFilterResults();
+  });
+}
 
+function applyFilterResults() {
   // Determine which benchmarks pass ALL enabled criteria
   checkedTasks = new Set();
   for (const bench of allFilterBenchmarks) {
@@ -2882,7 +3747,6 @@ function renderFilterPanel() {
     cb.addEventListener("change", () => {
       cfg.enabled = cb.checked;
       card.classList.toggle("disabled", !cfg.enabled);
-      runFilter();
       renderChart();
     });
 
@@ -2921,7 +3785,6 @@ function renderFilterPanel() {
     minInput.step = 1000;
     minInput.addEventListener("change", () => {
       cfg.minStep = parseInt(minInput.value) || 1000;
-      runFilter();
       renderChart();
     });
     minLabel.appendChild(minInput);
@@ -2940,7 +3803,6 @@ function renderFilterPanel() {
     maxInput.step = 1000;
     maxInput.addEventListener("change", () => {
       cfg.maxStep = parseInt(maxInput.value) || 33000;
-      runFilter();
       renderChart();
     });
     controls.appendChild(maxInput);
@@ -2955,7 +3817,6 @@ function renderFilterPanel() {
     threshInput.step = name === "monotonicity" || name === "ordering" ? 0.1 : 1;
     threshInput.addEventListener("change", () => {
       cfg.threshold = parseFloat(threshInput.value) || 0;
-      runFilter();
       renderChart();
     });
     threshLabel.appendChild(threshInput);
@@ -3083,4 +3944,5 @@ function hideFilterUI() {
 // Entry point
 // ============================================================
 
-document.addEventListener("DOMContentLoaded", init);
+// app.js is also loaded by compute-worker.js, which has no document
+if (typeof document !== "undefined") document.addEventListener("DOMContentLoaded", init);
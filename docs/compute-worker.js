@@ -0,0 +1,63 @@
+// NorEval compute worker
+// ======================
+// Runs the COMPUTE_JOBS of app.js (score aggregation, normalization and the
+// signal filter) off the main thread.  DATA is not fetched here: the main
+// thread posts its decoded copy (structured clone) and every section it loads
+// later, before any job that reads them.  Messages:
+//   { type: "data", data }              DATA as loaded so far
+//   { type: "section", section, data }  a section decoded after that
+//   { type: "run", id, job, state }     ->  { id, result, memoStats } or { id, error }
+//   { type: "cancel", id }              drops the job if queued or still running
+
+// app.js builds its modebar config from Plotly.Icons at load time; charts are
+// never drawn here.
+self.Plotly = { Icons: {} };
+importScripts("app.js");
+
+const SLICE_MS = 10;  // run a job this long before checking for cancel messages
+const cancelled = new Set();
+let queue = Promise.resolve();
+
+self.onmessage = (e) => {
+  const msg = e.data;
+  if (msg.type === "cancel") {
+    cancelled.add(msg.id);
+    return;
+  }
+  if (msg.type === "data") {
+    DATA = msg.data;
+    return;
+  }
+  if (msg.type === "section") {
+    DATA[msg.section] = msg.data;
+    return;
+  }
+  queue = queue.then(() => run(msg));
+};
+
+function yieldToMessages() {
+  return new Promise((resolve) => setTimeout(resolve, 0));
+}
+
+async function run({ id, job, state }) {
+  if (cancelled.delete(id)) return;
+  try {
+    applyComputeState(state);
+    const it = COMPUTE_JOBS[job]();
+    let sliceStart = performance.now();
+    let step = it.next();
+    while (!step.done) {
+      if (performance.now() - sliceStart > SLICE_MS) {
+        await yieldToMessages();
+        if (cancelled.delete(id)) return;
+        sliceStart = performance.now();
+      }
+      step = it.next();
+    }
+    await yieldToMessages();
+    if (cancelled.delete(id)) return;
+    self.postMessage({ id, result: step.value, memoStats: getMemoStats() });
+  } catch (err) {
+    self.postMessage({ id, error: String((err && err.stack) || err) });
+  }
+}
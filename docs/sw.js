@@ -0,0 +1,113 @@
+// NorEval service worker
+// ======================
+// Serves the dashboard's assets and data files from a cache keyed by content
+// hash, so repeat visits load without downloading data.json and its shards
+// again.  build_data.py writes asset-manifest.json, mapping every cacheable
+// file (app.js, compute-worker.js, style.css, data.json, data/*.json) to the
+// SHA-1 prefix of its content:
+//   { "assets": { "app.js": "3f2a9c01be47", "data.json": "...", ... } }
+//
+// Each page load fetches index.html and the manifest from the network
+// (revalidating; the cached copies are the offline fallback).  A request for
+// a listed file is answered from the cache entry "<file>?v=<hash>" or, if
+// missing, downloaded under that URL, checked against the hash and cached.
+// So after a deploy only the files whose hash changed are fetched, and cache
+// entries of hashes no longer in the manifest are dropped.  Other requests
+// (Plotly, fonts, the --watch live-reload stream) are not intercepted.
+
+const CACHE_NAME = "noreval-assets";
+const MANIFEST_URL = "asset-manifest.json";
+const HASH_LENGTH = 12;  // hex digits, as written by build_data.py
+const SCOPE_URL = self.registration.scope;
+const SCOPE_PATH = new URL(SCOPE_URL).pathname;
+
+let _manifest = null;  // promise of the parsed asset-manifest.json
+
+self.addEventListener("install", () => self.skipWaiting());
+self.addEventListener("activate", (event) => event.waitUntil(self.clients.claim()));
+
+self.addEventListener("fetch", (event) => {
+  const request = event.request;
+  const url = new URL(request.url);
+  if (request.method !== "GET" || url.origin !== self.location.origin) return;
+  if (!url.pathname.startsWith(SCOPE_PATH)) return;
+  if (request.mode === "navigate") {
+    event.respondWith(networkFirst(request.url));
+    // A new page load picks up a new deploy: refresh the manifest, then
+    // drop the cache entries it no longer lists
+    event.waitUntil(loadManifest(true).then(pruneCache));
+    return;
+  }
+  if (url.search) return;
+  const path = decodeURIComponent(url.pathname.slice(SCOPE_PATH.length));
+  event.respondWith(loadManifest(false).then((manifest) => {
+    const hash = manifest.assets[path];
+    return hash ? cacheFirst(path, hash) : fetch(request);
+  }));
+});
+
+/** Fetch url revalidating any HTTP-cached copy, and keep it as the offline fallback. */
+async function networkFirst(url) {
+  const cache = await caches.open(CACHE_NAME);
+  try {
+    const response = await fetch(url, { cache: "no-cache" });
+    if (response.ok) await cache.put(url, response.clone());
+    return response;
+  } catch (err) {
+    const cached = await cache.match(url);
+    if (cached) return cached;
+    throw err;
+  }
+}
+
+/** The current manifest; refresh=true re-fetches it (once per page load). */
+function loadManifest(refresh) {
+  if (refresh || !_manifest) {
+    _manifest = networkFirst(new URL(MANIFEST_URL, SCOPE_URL).href)
+      .then((response) => response.json())
+      .then((manifest) => ({ assets: manifest.assets || {} }))
+      .catch(() => ({ assets: {} }));
+  }
+  return _manifest;
+}
+
+function versionedUrl(path, hash) {
+  return new URL(path + "?v=" + hash, SCOPE_URL).href;
+}
+
+async function sha1Prefix(buffer) {
+  const digest = new Uint8Array(await crypto.subtle.digest("SHA-1", buffer));
+  return [...digest].map((b) => b.toString(16).padStart(2, "0")).join("").slice(0, HASH_LENGTH);
+}
+
+/**
+ * Serve path at content hash from the cache, downloading it on a miss. A
+ * download whose content does not match the hash (e.g. fetched while a
+ * deploy was half-way through) is passed through but not cached.
+ */
+async function cacheFirst(path, hash) {
+  const url = versionedUrl(path, hash);
+  const cache = await caches.open(CACHE_NAME);
+  const cached = await cache.match(url);
+  if (cached) return cached;
+  const response = await fetch(url);
+  if (!response.ok) return response;
+  const body = await response.arrayBuffer();
+  const headers = { "Content-Type": response.headers.get("Content-Type") || "" };
+  if (await sha1Prefix(body) === hash) {
+    await cache.put(url, new Response(body, { headers }));
+  }
+  return new Response(body, { headers });
+}
+
+/** Delete cached file versions that the manifest no longer lists. */
+async function pruneCache(manifest) {
+  const keep = new Set(Object.entries(manifest.assets).map(([path, hash]) => versionedUrl(path, hash)));
+  if (!keep.size) return;  // manifest unavailable (offline): keep everything
+  const cache = await caches.open(CACHE_NAME);
+  for (const request of await cache.keys()) {
+    if (new URL(request.url).searchParams.has("v") && !keep.has(request.url)) {
+      await cache.delete(request);
+    }
+  }
+}
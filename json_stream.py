@@ -0,0 +1,77 @@
+"""Streaming JSON writer for data.json and its shards (build_data.py --stream).
+
+json.dumps(output) holds the whole serialized document as one string on top
+of the object graph it was encoded from, and the file only appears once the
+dump is done.  iter_json() yields the same text in pieces instead: dicts are
+emitted key by key as they are walked, ScoreTables one entity at a time
+(score_table.ScoreTable.entity_scores), and everything else with one
+json.dumps() call.  So, besides the data itself, memory is bounded by the
+largest entity or non-dict value (e.g. a normalization params list), not by
+the whole dataset.  An iterator of (key, value) pairs, such as
+build_data.iter_output(), is written as an object and consumed one pair at a
+time, so its values can be produced only when they are reached and released
+once written.
+
+The pieces join to exactly json.dumps(value, ensure_ascii=False,
+default=json_default), so streamed files are byte-identical to the ones
+written in one piece.  write_json() streams into a temporary file next to
+the target, hashing as it goes, and renames it into place once complete.
+"""
+
+import hashlib
+import json
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+from score_table import ScoreTable, json_default
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, default=json_default)
+
+
+def _key(key):
+    # json.dumps() turns non-string keys into their JSON text ("1000", "true")
+    return _dumps(key if isinstance(key, str) else _dumps(key))
+
+
+def iter_json(value):
+    """Yield the JSON text of value in pieces; see the module docstring."""
+    if isinstance(value, ScoreTable):
+        items, nested = value.entity_scores(), False
+    elif isinstance(value, dict):
+        items, nested = value.items(), True
+    elif isinstance(value, Iterator):  # (key, value) pairs
+        items, nested = value, True
+    else:
+        yield _dumps(value)
+        return
+    separator = "{"
+    for key, item in items:
+        yield f"{separator}{_key(key)}: "
+        if nested:
+            yield from iter_json(item)
+        else:
+            yield _dumps(item)
+        del item  # an iterator's next value may be computed in the next step
+        separator = ", "
+    yield "{}" if separator == "{" else "}"
+
+
+def write_json(path, value, tmp_path=None):
+    """Stream value's JSON into path through tmp_path (default: path + ".tmp").
+
+    With path=None the temporary file is left for the caller to move.
+    Returns the SHA-1 hex digest of the written bytes.
+    """
+    tmp_path = Path(tmp_path or str(path) + ".tmp")
+    digest = hashlib.sha1()
+    with open(tmp_path, "wb") as f:
+        for piece in iter_json(value):
+            data = piece.encode("utf-8")
+            digest.update(data)
+            f.write(data)
+    if path is not None:
+        os.replace(tmp_path, path)
+    return digest.hexdigest()
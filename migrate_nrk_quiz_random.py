@@ -1,20 +1,25 @@
 #!/usr/bin/env python3
 """
-Converts nrk_quiz_qa_random_{nob,nno} results to nrk_quiz_qa_{nob,nno} format.
-
-For each model in results/:
-- If nrk_quiz_qa_random_nob or nrk_quiz_qa_random_nno are missing, prints a warning.
-- If present, copies results_*.json files into nrk_quiz_qa_{nob,nno}/ with all
-  "nrk_quiz_qa_random_nob" -> "nrk_quiz_qa_nob" (and nno equivalent) replacements applied.
-
-Only results_*.json files are copied (not samples_*.jsonl), since those are what
-build_data.py uses. The random benchmark uses non-randomized few-shot examples that
-are now deprecated; the _random variants use the current randomized few-shotting.
+Removes the nrk_quiz_qa_{nob,nno} copies of nrk_quiz_qa_random_{nob,nno} results.
+
+This script used to copy every results_*.json of nrk_quiz_qa_random_{nob,nno}
+into nrk_quiz_qa_{nob,nno}/ with the task name string-replaced, so that
+build_data.py would pick up the randomized few-shot runs.  metrics_setup.yaml
+now lists the _random benchmarks as "aliases" of the canonical ones, and
+build_data.py and check_missing.py resolve them while reading (see
+results_index.resolve_aliases), so the copies are no longer needed.
+
+For every results root, each copy is deleted only if it is byte-for-byte what
+the old migration would have written for its _random source; anything else
+(e.g. the deprecated non-randomized runs) is left alone.  Pass --dry-run to
+only print what would be removed.
 """
 
+import argparse
 import os
 
-RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOTS = ["results", "results-instruct", "NorOLMo_progress"]
 
 PAIRS = [
     ("nrk_quiz_qa_random_nob", "nrk_quiz_qa_nob"),
@@ -22,51 +27,64 @@ PAIRS = [
 ]
 
 
-def process_results_file(src_path, dst_path, old_name, new_name):
-    with open(src_path, "r", encoding="utf-8") as f:
-        content = f.read()
-    content = content.replace(old_name, new_name)
-    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
-    with open(dst_path, "w", encoding="utf-8") as f:
-        f.write(content)
+def find_copies(model_path, random_bench, canonical_bench):
+    """Yield canonical-benchmark paths that are migrated copies of random_bench results."""
+    random_path = os.path.join(model_path, random_bench)
+    canonical_path = os.path.join(model_path, canonical_bench)
+    for dirpath, _, filenames in os.walk(random_path):
+        for fname in sorted(filenames):
+            if not (fname.startswith("results_") and fname.endswith(".json")):
+                continue
+            src_file = os.path.join(dirpath, fname)
+            dst_file = os.path.join(canonical_path, os.path.relpath(src_file, random_path))
+            if not os.path.isfile(dst_file):
+                continue
+            with open(src_file, "r", encoding="utf-8") as f:
+                expected = f.read().replace(random_bench, canonical_bench)
+            with open(dst_file, "r", encoding="utf-8") as f:
+                if f.read() == expected:
+                    yield dst_file
 
 
-def main():
-    model_dirs = sorted(os.listdir(RESULTS_DIR))
+def remove_empty_dirs(path, stop):
+    """Remove path and its parents while empty, up to (not including) stop."""
+    while path != stop and path.startswith(stop + os.sep):
+        try:
+            os.rmdir(path)
+        except OSError:
+            return
+        path = os.path.dirname(path)
 
-    for model_dir in model_dirs:
-        model_path = os.path.join(RESULTS_DIR, model_dir)
-        if not os.path.isdir(model_path):
-            continue
 
-        for random_bench, canonical_bench in PAIRS:
-            random_path = os.path.join(model_path, random_bench)
-            canonical_path = os.path.join(model_path, canonical_bench)
-
-            if not os.path.isdir(random_path):
-                print(f"WARNING: {model_dir!r}: missing {random_bench}/")
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--dry-run", action="store_true",
+                        help="only list the copies that would be removed")
+    args = parser.parse_args()
+
+    total = total_bytes = 0
+    for root in ROOTS:
+        root_path = os.path.join(BASE_DIR, root)
+        if not os.path.isdir(root_path):
+            continue
+        for model_dir in sorted(os.listdir(root_path)):
+            model_path = os.path.join(root_path, model_dir)
+            if not os.path.isdir(model_path):
                 continue
-
-            created = 0
-            for shot_dir in sorted(os.listdir(random_path)):
-                shot_path = os.path.join(random_path, shot_dir)
-                if not os.path.isdir(shot_path):
-                    continue
-                for model_sanitized_dir in sorted(os.listdir(shot_path)):
-                    src_dir = os.path.join(shot_path, model_sanitized_dir)
-                    if not os.path.isdir(src_dir):
-                        continue
-                    for fname in sorted(os.listdir(src_dir)):
-                        if not (fname.startswith("results_") and fname.endswith(".json")):
-                            continue
-                        src_file = os.path.join(src_dir, fname)
-                        dst_file = os.path.join(
-                            canonical_path, shot_dir, model_sanitized_dir, fname
-                        )
-                        process_results_file(src_file, dst_file, random_bench, canonical_bench)
-                        created += 1
-
-            print(f"OK: {model_dir!r}: {created} file(s) written ({random_bench} -> {canonical_bench})")
+            for random_bench, canonical_bench in PAIRS:
+                removed = 0
+                for copy in find_copies(model_path, random_bench, canonical_bench):
+                    total_bytes += os.path.getsize(copy)
+                    if not args.dry_run:
+                        os.remove(copy)
+                        remove_empty_dirs(os.path.dirname(copy), model_path)
+                    removed += 1
+                if removed:
+                    print(f"{root}/{model_dir}: {removed} copied file(s) in {canonical_bench}")
+                total += removed
+
+    verb = "Would remove" if args.dry_run else "Removed"
+    print(f"{verb} {total} duplicate results file(s) ({total_bytes / 1e6:.1f} MB)")
 
 
 if __name__ == "__main__":
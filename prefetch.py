@@ -0,0 +1,78 @@
+"""Bounded read-ahead for results trees on high-latency filesystems.
+
+On Lustre/NFS every open, stat and directory listing is a network round
+trip, so reading a results tree one file at a time mostly waits.
+Prefetcher.map() runs a blocking function over a sequence of items in a
+small thread pool, keeping at most max_in_flight calls running or finished
+but not yet consumed.  Results are yielded in input order, so the consumer's
+loop stays sequential, and a slow consumer stops further submissions
+(backpressure) instead of letting read-ahead grow without bound.
+
+fetch_results_file() is the per-file function build_data.py uses: it opens
+a results file once and returns a PrefetchedFile with its stat result and
+bytes (or only the stat result, when the build cache will serve the cell;
+see build_data.BuildCache.fetch), which BuildCache.lookup() and
+load_results_data() accept in place of the path.  results_index.scan_results_root() uses the same Prefetcher to
+list model directories concurrently.
+"""
+
+import os
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+PrefetchedFile = namedtuple("PrefetchedFile", ["path", "stat", "data"])
+
+
+def fetch_results_file(results_file, read=True):
+    """Prefetch a results file path into a PrefetchedFile.
+
+    With read=False only the stat result is fetched (data is None), which is
+    all a build cache hit needs.  Inputs other than paths, e.g. an
+    ArchiveEntry of a memory-mapped archive, are returned as is.
+    """
+    if not isinstance(results_file, str):
+        return results_file
+    if not read:
+        return PrefetchedFile(results_file, os.stat(results_file), None)
+    with open(results_file, "rb") as f:
+        return PrefetchedFile(results_file, os.fstat(f.fileno()), f.read())
+
+
+class Prefetcher:
+    """Ordered, bounded concurrent map for I/O-bound functions.
+
+    Use as a context manager; the worker threads are shut down on exit.
+    With max_in_flight <= 1, map() just calls the function inline.
+    """
+
+    def __init__(self, max_in_flight):
+        self.max_in_flight = max_in_flight
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def map(self, fn, items):
+        """Yield fn(item) for every item in order, reading at most max_in_flight ahead."""
+        if self.max_in_flight <= 1:
+            for item in items:
+                yield fn(item)
+            return
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(self.max_in_flight,
+                                            thread_name_prefix="prefetch")
+        items = iter(items)
+        window = deque(self._pool.submit(fn, item)
+                       for item in islice(items, self.max_in_flight))
+        while window:
+            yield window.popleft().result()
+            # Refill only once the consumer asks for more, so the window
+            # bounds unconsumed results as well as running calls
+            for item in islice(items, 1):
+                window.append(self._pool.submit(fn, item))
@@ -0,0 +1,209 @@
+"""Prompt-variant statistics for extracted benchmark metrics.
+
+A results file has one task per prompt variant (<benchmark>, <benchmark>_p1,
+...), so every metric comes with a list of (value, stderr) pairs.
+aggregate_metric_values() turns those lists into the per-metric entries of
+data.json (max/mean/median/min, the stderr of the matching variant,
+prompt_sd, prompt_mad, ...), one cell at a time.
+
+aggregate_batch() computes the same entries for many cells at once: all
+(cell, metric, variant) rows are flattened into arrays and every statistic is
+a NumPy segment reduction over them, so the per-metric Python overhead is
+paid once per batch instead of once per statistic.  NumPy is optional;
+without it aggregate_batch() falls back to aggregate_metric_values().
+Results match the per-cell code after rounding to 6 decimals.
+"""
+
+import math
+import statistics
+
+try:
+    import numpy as np
+except ImportError:  # optional: aggregate_batch() then aggregates per cell
+    np = None
+
+HAVE_NUMPY = np is not None
+
+
+def aggregate_metric_values(metric_values):
+    """Compute the prompt-variant statistics of one cell.
+
+    metric_values is {metric_name: [(value, stderr_or_None), ...]} with one
+    pair per prompt variant.  Returns {metric_name: {"max": ..., "mean": ...,
+    "median": ..., "min": ..., "max_stderr": ..., ...}}, or None if empty.
+    """
+    if not metric_values:
+        return None
+
+    out = {}
+    for metric_name, pairs in metric_values.items():
+        values = [v for v, _ in pairs]
+        stderrs = [se for _, se in pairs]
+
+        entry = {
+            "max": round(max(values), 6),
+            "mean": round(statistics.mean(values), 6),
+            "median": round(statistics.median(values), 6),
+            "min": round(min(values), 6),
+        }
+
+        # max_stderr: stderr of the variant that achieved the max score
+        max_idx = values.index(max(values))
+        entry["max_prompt_idx"] = max_idx
+        if stderrs[max_idx] is not None:
+            entry["max_stderr"] = round(stderrs[max_idx], 6)
+
+        # min_stderr: stderr of the variant that achieved the min score
+        min_idx = values.index(min(values))
+        if stderrs[min_idx] is not None:
+            entry["min_stderr"] = round(stderrs[min_idx], 6)
+
+        # mean_stderr: sqrt(sum(se^2)) / n  (error propagation for mean)
+        if all(se is not None for se in stderrs):
+            n = len(stderrs)
+            mean_se = math.sqrt(sum(se**2 for se in stderrs)) / n
+            entry["mean_stderr"] = round(mean_se, 6)
+
+        # median_stderr: stderr of the variant closest to the median
+        med = statistics.median(values)
+        closest_idx = min(range(len(values)), key=lambda i: abs(values[i] - med))
+        if stderrs[closest_idx] is not None:
+            entry["median_stderr"] = round(stderrs[closest_idx], 6)
+
+        # Prompt-variant spread (for prompt deviation error bars)
+        entry["n_prompts"] = len(values)
+        if len(values) >= 2:
+            entry["prompt_sd"] = round(statistics.stdev(values), 6)
+            med_val = statistics.median(values)
+            entry["prompt_mad"] = round(
+                statistics.median([abs(v - med_val) for v in values]), 6
+            )
+        else:
+            entry["prompt_sd"] = 0.0
+            entry["prompt_mad"] = 0.0
+
+        out[metric_name] = entry
+    return out
+
+
+def _first_local_index(mask, seg, starts, nseg):
+    """Index within its segment of the first True row of mask, per segment."""
+    pos = np.flatnonzero(mask)
+    segs, first = np.unique(seg[pos], return_index=True)
+    out = np.zeros(nseg, dtype=np.int64)
+    out[segs] = pos[first] - starts[segs]
+    return out
+
+
+def _segment_median(x, seg, starts, n):
+    """Median of x within each segment (mean of the two middle values if even)."""
+    order = np.lexsort((x, seg))
+    xs = x[order]
+    return (xs[starts + (n - 1) // 2] + xs[starts + n // 2]) / 2
+
+
+def _aggregate_segments(values, stderrs, n):
+    """Vectorized statistics for flattened segments.
+
+    values and stderrs (NaN = missing) hold one row per prompt variant,
+    n the number of rows of each consecutive segment.  Returns a dict of
+    per-segment Python lists.
+    """
+    nseg = len(n)
+    starts = np.concatenate(([0], np.cumsum(n)[:-1]))
+    seg = np.repeat(np.arange(nseg), n)
+
+    vmax = np.maximum.reduceat(values, starts)
+    vmin = np.minimum.reduceat(values, starts)
+    mean = np.add.reduceat(values, starts) / n
+    med = _segment_median(values, seg, starts, n)
+
+    max_idx = _first_local_index(values == vmax[seg], seg, starts, nseg)
+    min_idx = _first_local_index(values == vmin[seg], seg, starts, nseg)
+    dist = np.abs(values - med[seg])
+    closest_idx = _first_local_index(
+        dist == np.minimum.reduceat(dist, starts)[seg], seg, starts, nseg
+    )
+
+    has_se = ~np.isnan(stderrs)
+    all_se = np.logical_and.reduceat(has_se, starts)
+    mean_se = np.sqrt(np.add.reduceat(np.where(has_se, stderrs, 0.0) ** 2, starts)) / n
+
+    multi = n >= 2
+    ss = np.add.reduceat((values - mean[seg]) ** 2, starts)
+    sd = np.sqrt(ss / np.where(multi, n - 1, 1))
+    mad = _segment_median(dist, seg, starts, n)
+
+    return {
+        "max": vmax.tolist(), "mean": mean.tolist(), "median": med.tolist(),
+        "min": vmin.tolist(), "max_idx": max_idx.tolist(),
+        "min_idx": min_idx.tolist(), "closest_idx": closest_idx.tolist(),
+        "all_se": all_se.tolist(), "mean_se": mean_se.tolist(),
+        "sd": sd.tolist(), "mad": mad.tolist(),
+    }
+
+
+def aggregate_batch(cells):
+    """Aggregate many cells at once; returns aggregate_metric_values() per cell.
+
+    cells is a list of {metric_name: [(value, stderr_or_None), ...]} dicts.
+    Metrics whose values are not all floats (integer-valued metrics keep
+    their int type in data.json) go through the per-cell code.
+    """
+    if np is None:
+        return [aggregate_metric_values(c) for c in cells]
+
+    segments = []  # (cell index, metric name, stderrs)
+    values, stderrs, lengths = [], [], []
+    entries = {}  # (cell index, metric name) -> entry
+    for ci, metric_values in enumerate(cells):
+        for metric_name, pairs in metric_values.items():
+            if not all(type(v) is float for v, _ in pairs):
+                entries[(ci, metric_name)] = aggregate_metric_values(
+                    {metric_name: pairs}
+                )[metric_name]
+                continue
+            seg_stderrs = [se for _, se in pairs]
+            segments.append((ci, metric_name, seg_stderrs))
+            values.extend(v for v, _ in pairs)
+            stderrs.extend(math.nan if se is None else se for se in seg_stderrs)
+            lengths.append(len(pairs))
+
+    if segments:
+        stats = _aggregate_segments(
+            np.array(values, dtype=np.float64),
+            np.array(stderrs, dtype=np.float64),
+            np.array(lengths, dtype=np.int64),
+        )
+        for i, (ci, metric_name, seg_stderrs) in enumerate(segments):
+            entry = {
+                "max": round(stats["max"][i], 6),
+                "mean": round(stats["mean"][i], 6),
+                "median": round(stats["median"][i], 6),
+                "min": round(stats["min"][i], 6),
+            }
+            max_idx = stats["max_idx"][i]
+            entry["max_prompt_idx"] = max_idx
+            if seg_stderrs[max_idx] is not None:
+                entry["max_stderr"] = round(seg_stderrs[max_idx], 6)
+            min_idx = stats["min_idx"][i]
+            if seg_stderrs[min_idx] is not None:
+                entry["min_stderr"] = round(seg_stderrs[min_idx], 6)
+            if stats["all_se"][i]:
+                entry["mean_stderr"] = round(stats["mean_se"][i], 6)
+            closest_idx = stats["closest_idx"][i]
+            if seg_stderrs[closest_idx] is not None:
+                entry["median_stderr"] = round(seg_stderrs[closest_idx], 6)
+            entry["n_prompts"] = lengths[i]
+            if lengths[i] >= 2:
+                entry["prompt_sd"] = round(stats["sd"][i], 6)
+                entry["prompt_mad"] = round(stats["mad"][i], 6)
+            else:
+                entry["prompt_sd"] = 0.0
+                entry["prompt_mad"] = 0.0
+            entries[(ci, metric_name)] = entry
+
+    return [
+        {m: entries[(ci, m)] for m in metric_values} if metric_values else None
+        for ci, metric_values in enumerate(cells)
+    ]
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""Packed, append-only archive of lm-eval results sections.
+
+Instead of opening thousands of small results_*.json files, the results
+trees can be packed into two files:
+
+  archive/results.pack  -- a magic header followed by deduplicated blobs, each
+                           the compact JSON of one file's "results" and
+                           "n-samples" sections (nothing else is kept)
+  archive/results.idx   -- JSON lines, one per packed results file, mapping
+                           its path relative to the repository (and its
+                           source, model, benchmark, shot and timestamp) to
+                           the blob's offset, length and SHA-1
+
+Packing is incremental: files already in the index are skipped, new blobs are
+appended to the pack and new entries appended to the index, so neither file
+is ever rewritten.  Identical sections (e.g. re-runs with the same scores)
+share a single blob.
+
+Readers load the index and access blobs through a memory map of the pack
+file; ResultsArchive.index_root() returns the same map shape as
+results_index.scan_results_root(), so build_data.py can ingest from the
+archive instead of walking the tree (python3 build_data.py --from-archive).
+
+Usage:
+  python3 results_archive.py [--archive DIR] pack [ROOT ...]
+  python3 results_archive.py [--archive DIR] stats
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+from collections import namedtuple
+from pathlib import Path
+
+from results_index import (
+    ResultsCell,
+    read_results_sections,
+    results_order,
+    scan_results_root,
+)
+
+BASE_DIR = Path(__file__).parent
+ARCHIVE_DIR = BASE_DIR / "archive"
+DEFAULT_ROOTS = ["results", "results-instruct", "NorOLMo_progress"]
+PACK_NAME = "results.pack"
+INDEX_NAME = "results.idx"
+PACK_MAGIC = b"NOREVAL-PACK 1\n"
+SECTIONS = ("results", "n-samples")
+
+ArchiveEntry = namedtuple(
+    "ArchiveEntry",
+    ["pack", "source", "model", "benchmark", "shot", "timestamp", "path",
+     "offset", "length", "sha1"],
+)
+
+
+def results_timestamp(path):
+    """Return the timestamp part of a results_<timestamp>.json filename."""
+    name = os.path.basename(path)
+    return name[len("results_"):-len(".json")]
+
+
+def entry_key(entry):
+    """Return the stable identifier of an archive entry (used as a cache key)."""
+    return "archive:" + entry.path
+
+
+_open_packs = {}
+
+
+def read_archive_entry(entry):
+    """Decode the sections stored for an ArchiveEntry.
+
+    The pack file is memory-mapped on first use and kept open for the rest of
+    the process, so worker processes each map it once.
+    """
+    mm = _open_packs.get(entry.pack)
+    if mm is None:
+        with open(entry.pack, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        _open_packs[entry.pack] = mm
+    return json.loads(mm[entry.offset:entry.offset + entry.length])
+
+
+class ResultsArchive:
+    """Index of a results pack, keyed by (source, model, benchmark, shot)."""
+
+    def __init__(self, archive_dir=ARCHIVE_DIR):
+        self.pack_path = os.path.join(archive_dir, PACK_NAME)
+        self.index_path = os.path.join(archive_dir, INDEX_NAME)
+        # (source, model, benchmark, shot) -> {relative path: entry}; a shot
+        # directory can hold same-named files in different subdirectories
+        self.cells = {}
+        self.blobs = {}  # sha1 -> (offset, length)
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                for line in f:
+                    if line.strip():
+                        self._add(json.loads(line))
+
+    def __len__(self):
+        return sum(len(c) for c in self.cells.values())
+
+    def _add(self, record):
+        entry = ArchiveEntry(
+            self.pack_path, record["source"], record["model"],
+            record["benchmark"], record["shot"], record["timestamp"], record["path"],
+            record["offset"], record["length"], record["sha1"],
+        )
+        cell = (entry.source, entry.model, entry.benchmark, entry.shot)
+        self.cells.setdefault(cell, {})[entry.path] = entry
+        self.blobs[entry.sha1] = (entry.offset, entry.length)
+        return entry
+
+    def contains(self, source, model, benchmark, shot, path):
+        return path in self.cells.get((source, model, benchmark, shot), {})
+
+    def index_root(self, source, benchmarks=None, shot_dirs=None):
+        """Return {model: {benchmark: {shot: ResultsCell}}} for one source root.
+
+        Mirrors results_index.scan_results_root(), with ArchiveEntry objects
+        in place of file paths.
+        """
+        benchmarks = set(benchmarks) if benchmarks is not None else None
+        shot_dirs = set(shot_dirs) if shot_dirs is not None else None
+        index = {}
+        for (src, model, benchmark, shot) in sorted(self.cells):
+            if src != source:
+                continue
+            if benchmarks is not None and benchmark not in benchmarks:
+                continue
+            if shot_dirs is not None and shot not in shot_dirs:
+                continue
+            files = sorted(self.cells[(src, model, benchmark, shot)].values(),
+                           key=results_order)
+            index.setdefault(model, {}).setdefault(benchmark, {})[shot] = (
+                ResultsCell(files[-1] if files else None, files)
+            )
+        return index
+
+    def append(self, records):
+        """Append (source, model, benchmark, shot, path) records to the archive.
+
+        Returns (files added, new blobs written).  Records already present
+        in the index are skipped.
+        """
+        os.makedirs(os.path.dirname(self.pack_path), exist_ok=True)
+        added = new_blobs = 0
+        with open(self.pack_path, "ab") as pack, open(self.index_path, "a") as idx:
+            if pack.tell() == 0:
+                pack.write(PACK_MAGIC)
+            for source, model, benchmark, shot, path in records:
+                rel_path = os.path.relpath(path, BASE_DIR)
+                if self.contains(source, model, benchmark, shot, rel_path):
+                    continue
+                sections = read_results_sections(path, SECTIONS)
+                blob = json.dumps(sections, separators=(",", ":")).encode("utf-8")
+                digest = hashlib.sha1(blob).hexdigest()
+                if digest in self.blobs:
+                    offset, length = self.blobs[digest]
+                else:
+                    offset, length = pack.tell(), len(blob)
+                    pack.write(blob)
+                    new_blobs += 1
+                record = {
+                    "source": source, "model": model, "benchmark": benchmark,
+                    "shot": shot, "timestamp": results_timestamp(path),
+                    "offset": offset, "length": length, "sha1": digest,
+                    "path": rel_path,
+                }
+                # The blob must be on disk before the index line that points at it
+                pack.flush()
+                idx.write(json.dumps(record, ensure_ascii=False) + "\n")
+                self._add(record)
+                added += 1
+        return added, new_blobs
+
+
+def iter_tree_records(roots):
+    """Yield (source, model, benchmark, shot, path) for every results file."""
+    for root in roots:
+        root_path = Path(root)
+        if not root_path.is_absolute():
+            root_path = BASE_DIR / root_path
+        source = os.path.relpath(root_path, BASE_DIR)
+        for model, model_index in scan_results_root(root_path).items():
+            for benchmark, shots in model_index.items():
+                for shot, cell in shots.items():
+                    for path in cell.files:
+                        yield source, model, benchmark, shot, path
+
+
+def cmd_pack(args):
+    archive = ResultsArchive(args.archive)
+    before = len(archive)
+    added, new_blobs = archive.append(iter_tree_records(args.roots or DEFAULT_ROOTS))
+    size_kb = os.path.getsize(archive.pack_path) / 1024
+    print(f"Packed {added} new results file(s) ({new_blobs} new blob(s)); "
+          f"{before + added} indexed, {archive.pack_path} is {size_kb:.1f} KB")
+
+
+def cmd_stats(args):
+    archive = ResultsArchive(args.archive)
+    sources = {}
+    for (source, _, _, _), by_path in archive.cells.items():
+        sources[source] = sources.get(source, 0) + len(by_path)
+    pack_kb = os.path.getsize(archive.pack_path) / 1024 if os.path.exists(archive.pack_path) else 0
+    print(f"{len(archive)} results files, {len(archive.blobs)} unique blobs, "
+          f"{len(archive.cells)} cells, pack {pack_kb:.1f} KB")
+    for source, count in sorted(sources.items()):
+        print(f"  {source}: {count} files")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--archive", default=str(ARCHIVE_DIR),
+                        help="archive directory (default: archive/)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    pack = sub.add_parser("pack", help="append new results files to the archive")
+    pack.add_argument("roots", nargs="*",
+                      help="results roots to pack (default: all known roots)")
+    pack.set_defaults(func=cmd_pack)
+    stats = sub.add_parser("stats", help="summarize the archive contents")
+    stats.set_defaults(func=cmd_stats)
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""Move superseded results files into compressed per-model history archives.
+
+A shot directory can hold several results_<timestamp>.json files from
+re-runs, but only the newest (by basename, see results_index.py) is ever
+used.  `compact` keeps that latest file per cell in the working tree and
+moves every older one into
+
+  history/<source>/<model>.zip  -- one deflate-compressed zip per model
+                                   directory, members named by their path
+                                   below the model directory
+  history/index.jsonl           -- JSON lines, one per archived file, mapping
+                                   its original path to the zip, member, size,
+                                   mtime and SHA-1
+
+so builds and checks no longer list and tie-break dead files.  A file is
+only deleted after its zip member has been read back and its SHA-1 checked,
+and the index line is written before the deletion.  `restore` puts archived
+files back in place (with their original mtime); the archive itself is
+never rewritten, so restored files can simply be compacted again.
+
+Usage:
+  python3 results_history.py [--history DIR] compact [--dry-run] [ROOT ...]
+  python3 results_history.py [--history DIR] restore [--model SOURCE/MODEL] [PATH ...]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import zipfile
+import zlib
+from pathlib import Path
+
+from results_index import scan_results_root
+
+BASE_DIR = Path(__file__).parent
+HISTORY_DIR = BASE_DIR / "history"
+INDEX_NAME = "index.jsonl"
+DEFAULT_ROOTS = ["results", "results-instruct", "NorOLMo_progress"]
+
+
+def superseded_files(roots):
+    """Yield (source, model, path) for every results file that is not the latest of its cell."""
+    for root in roots:
+        root_path = Path(root)
+        if not root_path.is_absolute():
+            root_path = BASE_DIR / root_path
+        source = os.path.relpath(root_path, BASE_DIR)
+        for model, model_index in scan_results_root(root_path).items():
+            for shots in model_index.values():
+                for cell in shots.values():
+                    for path in cell.files[:-1]:
+                        yield source, model, path
+
+
+class ResultsHistory:
+    """Index of the history archives, keyed by original path (relative to BASE_DIR)."""
+
+    def __init__(self, history_dir=HISTORY_DIR):
+        self.history_dir = Path(history_dir)
+        self.index_path = self.history_dir / INDEX_NAME
+        self.entries = {}
+        if self.index_path.exists():
+            with open(self.index_path) as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self.entries[record["path"]] = record
+
+    def zip_path(self, source, model):
+        return self.history_dir / source / f"{model}.zip"
+
+    def archive_model(self, source, model, paths):
+        """Move paths (all below source/model) into the model's zip.
+
+        Returns (files moved, bytes moved).  Files whose identical copy is
+        already archived are just deleted; files whose archived copy differs
+        are left in place.
+        """
+        model_dir = BASE_DIR / source / model
+        zip_path = self.zip_path(source, model)
+        pending = []  # (path, record)
+        for path in paths:
+            rel = os.path.relpath(path, BASE_DIR)
+            with open(path, "rb") as f:
+                data = f.read()
+            digest = hashlib.sha1(data).hexdigest()
+            known = self.entries.get(rel)
+            if known is not None and known["sha1"] != digest:
+                print(f"  skipping {rel}: differs from its archived copy")
+                continue
+            record = known or {
+                "path": rel,
+                "archive": os.path.relpath(zip_path, self.history_dir),
+                "member": os.path.relpath(path, model_dir).replace(os.sep, "/"),
+                "size": len(data),
+                "mtime": os.path.getmtime(path),
+                "sha1": digest,
+            }
+            pending.append((path, record, data if known is None else None))
+
+        new = [(path, record, data) for path, record, data in pending if data is not None]
+        if new:
+            zip_path.parent.mkdir(parents=True, exist_ok=True)
+            with zipfile.ZipFile(zip_path, "a", zipfile.ZIP_DEFLATED) as zf:
+                for _, record, data in new:
+                    zf.writestr(record["member"], data)
+            # Read every new member back before anything is deleted
+            with zipfile.ZipFile(zip_path) as zf:
+                for _, record, _ in new:
+                    if hashlib.sha1(zf.read(record["member"])).hexdigest() != record["sha1"]:
+                        raise RuntimeError(f"{zip_path}: {record['member']} failed verification")
+            with open(self.index_path, "a") as idx:
+                for _, record, _ in new:
+                    idx.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    self.entries[record["path"]] = record
+
+        moved = moved_bytes = 0
+        for path, record, _ in pending:
+            os.remove(path)
+            _remove_empty_parents(os.path.dirname(path), model_dir)
+            moved += 1
+            moved_bytes += record["size"]
+        return moved, moved_bytes
+
+    def restore(self, paths):
+        """Write archived files back to their original paths; returns files restored."""
+        restored = 0
+        by_zip = {}
+        for rel in paths:
+            record = self.entries[rel]
+            by_zip.setdefault(record["archive"], []).append(record)
+        for archive, records in sorted(by_zip.items()):
+            with zipfile.ZipFile(self.history_dir / archive) as zf:
+                for record in records:
+                    target = BASE_DIR / record["path"]
+                    if target.exists():
+                        print(f"  skipping {record['path']}: already in the working tree")
+                        continue
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    target.write_bytes(zf.read(record["member"]))
+                    os.utime(target, (record["mtime"], record["mtime"]))
+                    restored += 1
+        return restored
+
+
+def _remove_empty_parents(directory, stop):
+    """Remove directory and its parents while empty, up to (not including) stop."""
+    stop = os.path.abspath(stop)
+    directory = os.path.abspath(directory)
+    while directory != stop and directory.startswith(stop + os.sep):
+        try:
+            os.rmdir(directory)
+        except OSError:  # not empty
+            return
+        directory = os.path.dirname(directory)
+
+
+def _format_mb(n):
+    return f"{n / 1e6:.1f} MB"
+
+
+def cmd_compact(args):
+    history = ResultsHistory(args.history)
+    by_model = {}
+    for source, model, path in superseded_files(args.roots or DEFAULT_ROOTS):
+        by_model.setdefault((source, model), []).append(path)
+
+    if args.dry_run:
+        total = compressed = 0
+        per_source = {}
+        for (source, model), paths in sorted(by_model.items()):
+            for path in paths:
+                with open(path, "rb") as f:
+                    data = f.read()
+                total += len(data)
+                compressed += len(zlib.compress(data))
+                counts = per_source.setdefault(source, [0, 0, 0])
+                counts[1] += 1
+                counts[2] += len(data)
+            per_source[source][0] += 1
+        files = sum(len(paths) for paths in by_model.values())
+        print(f"Would move {files} superseded results file(s) ({_format_mb(total)}) "
+              f"from {len(by_model)} model directories into {history.history_dir} "
+              f"(~{_format_mb(compressed)} compressed)")
+        for source, (models, count, size) in sorted(per_source.items()):
+            print(f"  {source}: {count} files in {models} model directories, "
+                  f"{_format_mb(size)}")
+        largest = sorted(by_model.items(), key=lambda item: -len(item[1]))[:10]
+        for (source, model), paths in largest:
+            print(f"    {source}/{model}: {len(paths)} files")
+        return
+
+    moved = moved_bytes = 0
+    for (source, model), paths in sorted(by_model.items()):
+        n, size = history.archive_model(source, model, paths)
+        moved += n
+        moved_bytes += size
+    archive_bytes = sum(
+        p.stat().st_size for p in history.history_dir.rglob("*.zip")
+    ) if history.history_dir.exists() else 0
+    print(f"Moved {moved} superseded results file(s) ({_format_mb(moved_bytes)}) "
+          f"into {history.history_dir}; {len(history.entries)} archived, "
+          f"archives {_format_mb(archive_bytes)}")
+
+
+def cmd_restore(args):
+    history = ResultsHistory(args.history)
+    paths = [os.path.normpath(p) for p in args.paths]
+    if args.model:
+        prefix = os.path.normpath(args.model) + os.sep
+        paths += [rel for rel in history.entries if rel.startswith(prefix)]
+    unknown = [p for p in paths if p not in history.entries]
+    if unknown:
+        raise SystemExit(f"not in the history index: {', '.join(unknown)}")
+    if not paths:
+        raise SystemExit("nothing to restore (give PATHs or --model)")
+    restored = history.restore(paths)
+    print(f"Restored {restored} of {len(paths)} results file(s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--history", default=str(HISTORY_DIR),
+                        help="history directory (default: history/)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    compact = sub.add_parser(
+        "compact", help="move superseded results files into the history archives"
+    )
+    compact.add_argument("--dry-run", action="store_true",
+                         help="only report what would be moved and its size")
+    compact.add_argument("roots", nargs="*",
+                         help="results roots to compact (default: all known roots)")
+    compact.set_defaults(func=cmd_compact)
+    restore = sub.add_parser("restore", help="restore archived results files")
+    restore.add_argument("--model", metavar="SOURCE/MODEL",
+                         help="restore every archived file of a model directory, "
+                              "e.g. results/norolmo-13b")
+    restore.add_argument("paths", nargs="*",
+                         help="original paths to restore, relative to the repository")
+    restore.set_defaults(func=cmd_restore)
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""Single-pass index and selective reader for lm-eval results trees.
+
+Every results root (results/, results-instruct/, NorOLMo_progress/) has the
+layout <model>/<benchmark>/<N-shot>/<model_sanitized>/results_<timestamp>.json.
+Instead of globbing each (benchmark, shot) directory separately, scan_results_root()
+walks a root once with os.scandir and returns a nested map
+
+    {model: {benchmark: {shot_dir: ResultsCell(latest, files)}}}
+
+where files are all results_*.json paths below the shot directory, sorted
+oldest to newest by basename (the basename embeds the run timestamp), and
+latest is the last of them (or None for an empty shot directory).  Directory
+presence is preserved, so a benchmark or shot directory without results still
+shows up with an empty cell.
+
+Benchmarks can declare "aliases" in metrics_setup.yaml: other benchmark
+directory names (and task-name prefixes) holding runs of the same task.
+resolve_aliases() folds their cells into the canonical benchmark of an index
+and rename_alias_tasks() rewrites their task keys while reading, so renamed
+or re-run tasks need no copies on disk.
+
+read_results_sections() decodes only the top-level keys of a results file
+that the caller needs (typically "results" and "n-samples"), skipping the
+much larger configs/pretty_env_info payload.
+"""
+
+import json
+import os
+from collections import namedtuple
+
+from prefetch import Prefetcher
+
+ResultsCell = namedtuple("ResultsCell", ["latest", "files"])
+
+
+def _is_results_file(name):
+    return name.startswith("results_") and name.endswith(".json")
+
+
+def _list_dirs(path):
+    """Return [(name, path)] of visible subdirectories, sorted by name."""
+    try:
+        with os.scandir(path) as it:
+            dirs = [
+                (entry.name, entry.path) for entry in it
+                if not entry.name.startswith(".") and entry.is_dir()
+            ]
+    except OSError:
+        return []
+    dirs.sort()
+    return dirs
+
+
+def _collect_results_files(path, out):
+    """Append every results_*.json below path (recursively) to out."""
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir():
+                    _collect_results_files(entry.path, out)
+                elif _is_results_file(entry.name):
+                    out.append(entry.path)
+    except OSError:
+        pass
+
+
+def scan_shot_dir(shot_path):
+    """Return the ResultsCell for a single shot directory."""
+    files = []
+    _collect_results_files(shot_path, files)
+    files.sort(key=lambda f: (os.path.basename(f), f))
+    return ResultsCell(files[-1] if files else None, files)
+
+
+def scan_model_dir(model_path, benchmarks=None, shot_dirs=None):
+    """Index one model/checkpoint directory.
+
+    Returns {benchmark: {shot_dir: ResultsCell}}.  If benchmarks or shot_dirs
+    are given, other directories are not descended into.
+    """
+    benchmarks = set(benchmarks) if benchmarks is not None else None
+    shot_dirs = set(shot_dirs) if shot_dirs is not None else None
+    index = {}
+    for benchmark, bench_path in _list_dirs(model_path):
+        if benchmarks is not None and benchmark not in benchmarks:
+            continue
+        shots = {}
+        for shot_dir, shot_path in _list_dirs(bench_path):
+            if shot_dirs is not None and shot_dir not in shot_dirs:
+                continue
+            shots[shot_dir] = scan_shot_dir(shot_path)
+        index[benchmark] = shots
+    return index
+
+
+def scan_results_root(root, benchmarks=None, shot_dirs=None, prefetch=0):
+    """Index a whole results root in one walk.
+
+    Returns {model: {benchmark: {shot_dir: ResultsCell}}}, or an empty dict
+    if root does not exist.  With prefetch > 1, up to that many model
+    directories are listed concurrently (see prefetch.Prefetcher).
+    """
+    models = _list_dirs(root)
+    with Prefetcher(prefetch) as prefetcher:
+        indexes = prefetcher.map(
+            lambda model: scan_model_dir(model[1], benchmarks, shot_dirs), models
+        )
+        return {model: index for (model, _), index in zip(models, indexes)}
+
+
+def latest_results_file(model_index, benchmark, shot_dir):
+    """Return the latest results file for a cell of a model index, or None."""
+    cell = model_index.get(benchmark, {}).get(shot_dir)
+    return cell.latest if cell is not None else None
+
+
+def benchmark_aliases(metrics_setup):
+    """Return {alias: canonical benchmark} from the "aliases" lists of metrics_setup.yaml.
+
+    An alias is a benchmark directory (and task-name prefix) whose results
+    are runs of the canonical benchmark, e.g. a renamed task or a
+    replacement run under a different task name.
+    """
+    return {
+        alias: benchmark
+        for benchmark, config in metrics_setup.items()
+        for alias in config.get("aliases", ())
+    }
+
+
+def results_order(f):
+    """Sort key of a results file path or results_archive.ArchiveEntry (newest last)."""
+    if isinstance(f, str):
+        return os.path.basename(f), f
+    return f"results_{f.timestamp}.json", f.path
+
+
+def resolve_aliases(model_index, aliases):
+    """Fold the cells of alias benchmark directories into their canonical benchmark.
+
+    model_index is a {benchmark: {shot_dir: ResultsCell}} map, modified in
+    place and returned.  The files of each alias cell are merged with the
+    canonical cell's, so the latest run of either name is used; the alias
+    benchmarks are removed.
+    """
+    for alias, benchmark in aliases.items():
+        alias_shots = model_index.pop(alias, None)
+        if alias_shots is None:
+            continue
+        shots = model_index.setdefault(benchmark, {})
+        for shot_dir, alias_cell in alias_shots.items():
+            cell = shots.get(shot_dir)
+            files = sorted((cell.files if cell else []) + alias_cell.files,
+                           key=results_order)
+            shots[shot_dir] = ResultsCell(files[-1] if files else None, files)
+    return model_index
+
+
+def rename_alias_tasks(section, benchmark, aliases):
+    """Rewrite task keys of a results section from alias prefixes to benchmark.
+
+    section is a results file's "results" or "n-samples" dict; a task key
+    equal to an alias or starting with "<alias>_" gets the alias replaced by
+    benchmark.  Keys already present under the canonical name win.
+    """
+    if not aliases:
+        return section
+    renamed = {}
+    for task_key, value in section.items():
+        for alias in aliases:
+            if task_key == alias or task_key.startswith(alias + "_"):
+                canonical = benchmark + task_key[len(alias):]
+                if canonical not in section:
+                    renamed[canonical] = value
+                break
+        else:
+            renamed[task_key] = value
+    return renamed
+
+
+def _slice_top_level(raw, keys):
+    """Return {key: bytes} slices of the wanted top-level values, or None.
+
+    lm-eval writes results files with json.dump(indent=2), so each top-level
+    key starts a line indented by exactly two spaces; nested keys are
+    indented further and JSON strings cannot contain raw newlines.  Returns
+    None if raw does not look like that layout.
+    """
+    if not raw.startswith(b'{\n  "'):
+        return None
+    end = raw.rfind(b"\n}")
+    if end == -1:
+        return None
+    starts = []  # (offset of the newline, key)
+    pos = 1
+    while pos != -1 and pos < end:
+        key_end = raw.find(b'": ', pos + 4)
+        if key_end == -1:
+            return None
+        starts.append((pos, raw[pos + 4:key_end]))
+        pos = raw.find(b'\n  "', key_end)
+    wanted = {k.encode("utf-8"): k for k in keys}
+    slices = {}
+    for i, (start, key) in enumerate(starts):
+        if key not in wanted:
+            continue
+        value_start = start + 4 + len(key) + 3
+        value_end = starts[i + 1][0] if i + 1 < len(starts) else end
+        value = raw[value_start:value_end].rstrip()
+        if value.endswith(b","):
+            value = value[:-1]
+        slices[wanted[key]] = value
+    return slices
+
+
+def read_results_sections(path, keys=("results", "n-samples"), stats=None, raw=None):
+    """Decode only the given top-level keys of a results JSON file.
+
+    Returns {key: value} for the keys present in the file.  Falls back to a
+    full json.load if the file is not laid out as expected.  If stats is a
+    dict, "files", "bytes_read" and "bytes_decoded" are accumulated in it.
+    raw, if given, is the file's already-read content.
+    """
+    if raw is None:
+        with open(path, "rb") as f:
+            raw = f.read()
+    sections = None
+    decoded = 0
+    slices = _slice_top_level(raw, keys)
+    if slices is not None:
+        try:
+            sections = {k: json.loads(v) for k, v in slices.items()}
+            decoded = sum(len(v) for v in slices.values())
+        except ValueError:
+            sections = None
+    if sections is None:
+        data = json.loads(raw)
+        sections = {k: data[k] for k in keys if k in data}
+        decoded = len(raw)
+    if stats is not None:
+        stats["files"] = stats.get("files", 0) + 1
+        stats["bytes_read"] = stats.get("bytes_read", 0) + len(raw)
+        stats["bytes_decoded"] = stats.get("bytes_decoded", 0) + decoded
+    return sections
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""Indexed SQLite store of the extracted scores, with a query CLI and API.
+
+Every build writes scores.sqlite (see write_store) next to data.json's
+inputs: one row per (section, entity, benchmark, shot, metric) cell with the
+extract_benchmark_scores() statistics as columns, plus a benchmarks table
+with each benchmark's main metric and random baseline.  section is
+"models", "instruct_models", "progress" or "ablation:<name>" (as sourceId in
+app.js); entity is the model directory, or the step for checkpoints, which
+is also stored as an integer in step.  The file is replaced atomically, so
+readers never see a half-written store.
+
+ScoreStore answers the usual questions without loading data.json:
+
+    store = ScoreStore()
+    store.top("norquad", 5, k=10)                       # rank
+    store.cells("nocola", section="progress", below_baseline=True)  # filter
+    store.diff("Qwen2.5-72B", "Llama-3.1-70B", shot=5)            # diff
+
+Rows are Score named tuples, with value and stderr taken for one prompt
+aggregation (max by default: max and max_stderr) and metric defaulting to
+each benchmark's main metric.
+
+Command line (also available as `python3 build_data.py query ...`):
+
+  python3 score_store.py [--store FILE] [filters] [--top K | --bottom K | --diff A B] [--json]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent
+STORE_FILE = BASE_DIR / "scores.sqlite"
+PROMPT_AGGS = ["max", "mean", "median", "min"]
+STAT_COLUMNS = [
+    "max", "mean", "median", "min",
+    "max_stderr", "min_stderr", "mean_stderr", "median_stderr",
+    "n_prompts", "prompt_sd", "prompt_mad", "max_prompt_idx",
+]
+
+SCHEMA = f"""
+CREATE TABLE scores (
+    section TEXT NOT NULL,
+    entity TEXT NOT NULL,
+    step INTEGER,
+    benchmark TEXT NOT NULL,
+    shot INTEGER NOT NULL,
+    metric TEXT NOT NULL,
+    {", ".join(f'"{c}" REAL' for c in STAT_COLUMNS)},
+    PRIMARY KEY (section, entity, benchmark, shot, metric)
+) WITHOUT ROWID;
+CREATE INDEX scores_by_benchmark ON scores (benchmark, shot, metric, section);
+CREATE INDEX scores_by_entity ON scores (entity, shot);
+CREATE TABLE benchmarks (
+    benchmark TEXT PRIMARY KEY,
+    main_metric TEXT NOT NULL,
+    random_baseline REAL NOT NULL,
+    max_performance REAL NOT NULL,
+    category TEXT
+) WITHOUT ROWID;
+"""
+
+Score = namedtuple("Score", ["section", "entity", "step", "benchmark", "shot", "metric",
+                             "value", "stderr", "baseline"])
+
+
+def _section_tables(output):
+    """Yield (section, is_steps, ScoreTable) for every score table of a build's output."""
+    for section in ("models", "instruct_models", "progress"):
+        yield section, section == "progress", output[section]
+    for name, table in output["ablations"].items():
+        yield f"ablation:{name}", True, table
+
+
+def write_store(output, path=STORE_FILE):
+    """Write the score sections of a build's output dict to an SQLite store at path.
+
+    Rows are generated while they are inserted, so the store never needs a
+    second copy of the scores in memory.  Returns the number of score rows
+    written.
+    """
+    rows = (
+        (section, str(entity), entity if is_steps else None, benchmark, int(shot), metric,
+         *(getattr(record, c) for c in STAT_COLUMNS))
+        for section, is_steps, table in _section_tables(output)
+        for entity, benchmark, shot, metric, record in table.rows()
+    )
+    benchmarks = [
+        (name, info["main_metric"], info["random_baseline"], info["max_performance"],
+         info.get("category"))
+        for name, info in output["metrics_setup"].items()
+    ]
+
+    tmp = Path(str(path) + ".tmp")
+    if tmp.exists():
+        tmp.unlink()
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.executescript(SCHEMA)
+        n_rows = conn.executemany(
+            f"INSERT INTO scores VALUES ({', '.join('?' * (6 + len(STAT_COLUMNS)))})", rows
+        ).rowcount
+        conn.executemany("INSERT INTO benchmarks VALUES (?, ?, ?, ?, ?)", benchmarks)
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp, path)
+    return n_rows
+
+
+class ScoreStore:
+    """Read-only queries over a store written by write_store()."""
+
+    def __init__(self, path=STORE_FILE):
+        if not Path(path).exists():
+            raise FileNotFoundError(f"{path} not found (run build_data.py first)")
+        self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _select(self, agg, benchmark=None, shot=None, metric=None, section=None,
+                entities=None, below_baseline=False, min_value=None, max_value=None,
+                order=None, limit=None):
+        if agg not in PROMPT_AGGS:
+            raise ValueError(f"unknown prompt aggregation {agg!r} (one of {PROMPT_AGGS})")
+        where, params = [], []
+        if benchmark is not None:
+            where.append("s.benchmark = ?")
+            params.append(benchmark)
+        if shot is not None:
+            where.append("s.shot = ?")
+            params.append(int(shot))
+        if metric is None:
+            where.append("s.metric = b.main_metric")
+        else:
+            where.append("s.metric = ?")
+            params.append(metric)
+        if section is not None:
+            where.append("s.section = ?")
+            params.append(section)
+        if entities:
+            where.append(f"s.entity IN ({', '.join('?' * len(entities))})")
+            params.extend(entities)
+        if below_baseline:
+            where.append(f's."{agg}" < b.random_baseline')
+        if min_value is not None:
+            where.append(f's."{agg}" >= ?')
+            params.append(min_value)
+        if max_value is not None:
+            where.append(f's."{agg}" <= ?')
+            params.append(max_value)
+        sql = (
+            f'SELECT s.section, s.entity, s.step, s.benchmark, s.shot, s.metric, '
+            f's."{agg}", s."{agg}_stderr", b.random_baseline '
+            f"FROM scores s JOIN benchmarks b ON b.benchmark = s.benchmark "
+            f"WHERE {' AND '.join(where)}"
+        )
+        if order:
+            sql += f" ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [Score(*row) for row in self.conn.execute(sql, params)]
+
+    def cells(self, benchmark=None, shot=None, metric=None, section=None, entities=None,
+              agg="max", below_baseline=False, min_value=None, max_value=None):
+        """Filter cells; ordered by section, benchmark, shot, step and entity."""
+        return self._select(agg, benchmark, shot, metric, section, entities, below_baseline,
+                            min_value, max_value,
+                            order="s.section, s.benchmark, s.shot, s.step, s.entity")
+
+    def top(self, benchmark, shot, k=10, metric=None, section="models", agg="max",
+            ascending=False):
+        """The k best (or with ascending=True, worst) entities of a section on a benchmark."""
+        direction = "ASC" if ascending else "DESC"
+        return self._select(agg, benchmark, shot, metric, section,
+                            order=f's."{agg}" {direction}, s.entity', limit=k)
+
+    def diff(self, a, b, shot=None, metric=None, section=None, agg="max"):
+        """Compare entity a with entity b on every cell both have.
+
+        Returns [(benchmark, shot, metric, value_a, value_b, delta, z)], where
+        delta = value_a - value_b and z is delta over the combined stderr
+        (None without stderrs), sorted by delta.
+        """
+        by_cell = {}
+        for row in self._select(agg, shot=shot, metric=metric, section=section,
+                                entities=[str(a), str(b)]):
+            cell = by_cell.setdefault((row.benchmark, row.shot, row.metric), {})
+            if row.entity in cell:
+                raise ValueError(f"{row.entity} is in several sections "
+                                 f"({cell[row.entity].section}, {row.section}); pass section")
+            cell[row.entity] = row
+        out = []
+        for (benchmark, cell_shot, cell_metric), rows in by_cell.items():
+            if len(rows) < 2:
+                continue
+            ra, rb = rows[str(a)], rows[str(b)]
+            if ra.value is None or rb.value is None:
+                continue
+            delta = ra.value - rb.value
+            se = None
+            if ra.stderr is not None and rb.stderr is not None:
+                se = (ra.stderr ** 2 + rb.stderr ** 2) ** 0.5
+            out.append((benchmark, cell_shot, cell_metric, ra.value, rb.value, delta,
+                        delta / se if se else None))
+        out.sort(key=lambda r: r[5])
+        return out
+
+
+def _format_value(v):
+    return "-" if v is None else f"{v:.4f}"
+
+
+def _print_table(header, rows):
+    rows = [[str(c) for c in row] for row in rows]
+    widths = [max(len(h), *(len(r[i]) for r in rows)) if rows else len(h)
+              for i, h in enumerate(header)]
+    print("  ".join(h.ljust(w) for h, w in zip(header, widths)))
+    for row in rows:
+        print("  ".join(c.ljust(w) for c, w in zip(row, widths)))
+
+
+def _positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="query", description=__doc__.split("\n")[0],
+        epilog="Examples: --benchmark norquad --shot 5 --top 10;  "
+               "--section progress --benchmark nocola --below-baseline;  "
+               "--diff Qwen2.5-72B Llama-3.1-70B --shot 5",
+    )
+    parser.add_argument("--store", default=str(STORE_FILE),
+                        help="SQLite store to query (default: scores.sqlite)")
+    parser.add_argument("--section", "-S",
+                        help="models, instruct_models, progress or ablation:<name>")
+    parser.add_argument("--benchmark", "-b")
+    parser.add_argument("--shot", "-s", type=int, choices=[0, 1, 5])
+    parser.add_argument("--metric", "-m", help="default: each benchmark's main metric")
+    parser.add_argument("--entity", "-e", action="append",
+                        help="model directory or step; may be repeated")
+    parser.add_argument("--agg", default="max", choices=PROMPT_AGGS,
+                        help="prompt aggregation (default: max)")
+    parser.add_argument("--below-baseline", action="store_true",
+                        help="only cells scoring below the benchmark's random baseline")
+    parser.add_argument("--min", type=float, dest="min_value", help="only values >= MIN")
+    parser.add_argument("--max", type=float, dest="max_value", help="only values <= MAX")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--top", type=_positive_int, metavar="K",
+                      help="rank: the K best entities")
+    mode.add_argument("--bottom", type=_positive_int, metavar="K",
+                      help="rank: the K worst entities")
+    mode.add_argument("--diff", nargs=2, metavar=("A", "B"),
+                      help="compare two entities on every cell both have")
+    parser.add_argument("--json", action="store_true", help="print the rows as JSON")
+    args = parser.parse_args(argv)
+    rank = args.top if args.top is not None else args.bottom
+    if rank is not None and (args.benchmark is None or args.shot is None):
+        parser.error("--top/--bottom need --benchmark and --shot")
+
+    try:
+        with ScoreStore(args.store) as store:
+            if args.diff:
+                rows = store.diff(*args.diff, shot=args.shot, metric=args.metric,
+                                  section=args.section, agg=args.agg)
+            elif rank is not None:
+                rows = store.top(args.benchmark, args.shot, rank, args.metric,
+                                 args.section or "models", args.agg,
+                                 ascending=args.bottom is not None)
+            else:
+                rows = store.cells(args.benchmark, args.shot, args.metric, args.section,
+                                   args.entity, args.agg, args.below_baseline,
+                                   args.min_value, args.max_value)
+    except (FileNotFoundError, ValueError) as e:
+        parser.error(str(e))
+    if args.diff:
+        if args.json:
+            keys = ["benchmark", "shot", "metric", "a", "b", "delta", "z"]
+            print(json.dumps([dict(zip(keys, r)) for r in rows], indent=2))
+            return
+        _print_table(
+            ["benchmark", "shot", "metric", args.diff[0], args.diff[1], "delta", "z"],
+            [(b, s, m, _format_value(va), _format_value(vb), f"{d:+.4f}",
+              "-" if z is None else f"{z:+.2f}") for b, s, m, va, vb, d, z in rows],
+        )
+        return
+    if args.json:
+        print(json.dumps([r._asdict() for r in rows], indent=2))
+        return
+    _print_table(
+        ["section", "entity", "benchmark", "shot", "metric", args.agg, "stderr", "baseline"],
+        [(r.section, r.entity, r.benchmark, r.shot, r.metric, _format_value(r.value),
+          _format_value(r.stderr), r.baseline) for r in rows],
+    )
+    print(f"({len(rows)} rows)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""Compact in-memory score model of the build.
+
+Every (entity, benchmark, shot, metric) cell of data.json carries up to a
+dozen prompt-variant statistics (see prompt_stats.aggregate_metric_values).
+Kept as one dict per cell, nested per entity, benchmark and shot, they
+dominate the build's memory, which grows with the number of checkpoints
+times the (subtask) metrics of every benchmark.  The build holds them as:
+
+  ScoreRecord  one cell's statistics in __slots__ attributes (None = absent).
+               Records are created at extraction and shared by the BuildCache
+               and the ScoreTable, so each cell is held once.
+  ScoreTable   one score section: its records in output order, with typed
+               arrays of interned entity, benchmark, shot and metric IDs.
+
+Records only become the statistic dicts of data.json while being serialized
+(json_default), with the keys in aggregate_metric_values() order, so the
+output does not change.  benchmarks/bench_memory.py compares the peak memory
+of both layouts for 1,000 checkpoints.
+"""
+
+from array import array
+
+STAT_FIELDS = (
+    "max", "mean", "median", "min", "max_prompt_idx",
+    "max_stderr", "min_stderr", "mean_stderr", "median_stderr",
+    "n_prompts", "prompt_sd", "prompt_mad",
+)
+ROW_FIELDS = ("entity", "benchmark", "shot", "metric")
+
+
+class ScoreRecord:
+    """Prompt-variant statistics of one cell; absent statistics are None."""
+
+    __slots__ = STAT_FIELDS
+
+    def __init__(self, stats):
+        for field in STAT_FIELDS:
+            setattr(self, field, stats.get(field))
+
+    def as_dict(self):
+        """The data.json form: present statistics only, in STAT_FIELDS order."""
+        out = {}
+        for field in STAT_FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                out[field] = value
+        return out
+
+    def __eq__(self, other):
+        if not isinstance(other, ScoreRecord):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in STAT_FIELDS)
+
+    def __repr__(self):
+        return f"ScoreRecord({self.as_dict()!r})"
+
+
+def to_records(scores):
+    """Turn {metric: stats dict} (or None) into {metric: ScoreRecord} (or None)."""
+    if scores is None:
+        return None
+    return {metric: ScoreRecord(stats) for metric, stats in scores.items()}
+
+
+def record_hook(obj):
+    """json object_hook that reads statistic dicts straight into ScoreRecords."""
+    if "n_prompts" in obj and "max" in obj:
+        return ScoreRecord(obj)
+    return obj
+
+
+def json_default(obj):
+    """json default= for output holding ScoreTables and ScoreRecords."""
+    if isinstance(obj, ScoreTable):
+        return obj.nested()
+    if isinstance(obj, ScoreRecord):
+        return obj.as_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class Interner:
+    """Two-way map between keys and consecutive integer IDs."""
+
+    def __init__(self):
+        self.keys = []
+        self.ids = {}
+
+    def id(self, key):
+        """Return the ID of key, assigning the next one if it is new."""
+        i = self.ids.get(key)
+        if i is None:
+            i = self.ids[key] = len(self.keys)
+            self.keys.append(key)
+        return i
+
+    def __len__(self):
+        return len(self.keys)
+
+
+class ScoreTable:
+    """One score section, {entity: {benchmark: {shot: {metric: stats}}}}, as rows.
+
+    Rows keep their insertion order, which is the order of data.json.
+    Iterating a table (and len() and in) goes over its entities, including
+    the ones without any scores.
+    """
+
+    def __init__(self):
+        self.entities = Interner()
+        self.benchmarks = Interner()
+        self.shots = Interner()
+        self.metrics = Interner()
+        self.ids = {field: array("I") for field in ROW_FIELDS}
+        self.records = []
+        self._columns = None
+
+    def add(self, entity, scores):
+        """Append an entity's process_model_dir() scores."""
+        if entity in self.entities.ids:
+            raise ValueError(f"duplicate entity {entity!r}")
+        e = self.entities.id(entity)
+        entity_ids, benchmark_ids, shot_ids, metric_ids = (
+            self.ids[field] for field in ROW_FIELDS
+        )
+        for benchmark, shots in scores.items():
+            b = self.benchmarks.id(benchmark)
+            for shot, metrics in shots.items():
+                s = self.shots.id(shot)
+                for metric, record in metrics.items():
+                    entity_ids.append(e)
+                    benchmark_ids.append(b)
+                    shot_ids.append(s)
+                    metric_ids.append(self.metrics.id(metric))
+                    self.records.append(record)
+        self._columns = None
+
+    def __iter__(self):
+        return iter(self.entities.keys)
+
+    def __len__(self):
+        return len(self.entities)
+
+    def __contains__(self, entity):
+        return entity in self.entities.ids
+
+    def rows(self):
+        """Yield (entity, benchmark, shot, metric, record) in row order."""
+        keys = [
+            getattr(self, name).keys
+            for name in ("entities", "benchmarks", "shots", "metrics")
+        ]
+        for *ids, record in zip(*(self.ids[f] for f in ROW_FIELDS), self.records):
+            yield (*(k[i] for k, i in zip(keys, ids)), record)
+
+    def entity_scores(self):
+        """Yield (entity, {benchmark: {shot: {metric: ScoreRecord}}}) in order.
+
+        Only one entity's nested dicts exist at a time.
+        """
+        entity_ids, benchmark_ids, shot_ids, metric_ids = (
+            self.ids[field] for field in ROW_FIELDS
+        )
+        benchmarks, shots, metrics = self.benchmarks.keys, self.shots.keys, self.metrics.keys
+        row, n_rows = 0, len(self.records)
+        for e, entity in enumerate(self.entities.keys):
+            scores = {}
+            # add() appends each entity's rows in one contiguous run
+            while row < n_rows and entity_ids[row] == e:
+                bench_scores = scores.setdefault(benchmarks[benchmark_ids[row]], {})
+                shot_scores = bench_scores.setdefault(shots[shot_ids[row]], {})
+                shot_scores[metrics[metric_ids[row]]] = self.records[row]
+                row += 1
+            yield entity, scores
+
+    def nested(self):
+        """The section as data.json nests it, with ScoreRecords as leaves."""
+        return dict(self.entity_scores())
+
+    def column(self, benchmark, shot, metric):
+        """Records of one (benchmark, shot, metric), aligned with the entities.
+
+        Entities without that cell get None.  On first use the table indexes
+        the rows of every (benchmark, shot, metric) in typed arrays; only the
+        requested column is expanded into a list.
+        """
+        if self._columns is None:
+            columns = {}
+            for row, key in enumerate(zip(*(self.ids[f] for f in ROW_FIELDS[1:]))):
+                rows = columns.get(key)
+                if rows is None:
+                    rows = columns[key] = array("I")
+                rows.append(row)
+            self._columns = columns
+        key = (
+            self.benchmarks.ids.get(benchmark),
+            self.shots.ids.get(shot),
+            self.metrics.ids.get(metric),
+        )
+        col = [None] * len(self.entities)
+        entity_ids = self.ids["entity"]
+        for row in self._columns.get(key, ()):
+            col[entity_ids[row]] = self.records[row]
+        return col
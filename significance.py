@@ -0,0 +1,210 @@
+"""Pairwise significance of model differences, precomputed for the dashboard.
+
+For every (shot, prompt aggregation, benchmark) of a score section, each pair
+of models is compared with a two-sided z-test on the main metric, using the
+stderr that belongs to the aggregation (max_stderr for max, and so on):
+
+    z = (score_a - score_b) / sqrt(stderr_a^2 + stderr_b^2)
+
+The same is done for the two aggregate views of the dashboard at their
+default settings: the task average and the category average of the
+random-baseline-normalized scores, with the stderr propagated as in
+aggregateScores() in app.js.  Each pair is averaged over the benchmarks that
+both models have a score and a stderr for, so that neither side is
+penalized for a benchmark the other was not evaluated on.
+
+A matrix is stored as its upper triangle, one character per pair (i, j) with
+i < j in the order of the section's entity list, row by row:
+
+    "." no test (a score or stderr is missing, or both stderrs are 0)
+    "3" no significant difference (p >= 0.05)
+    "4".."6" entity i is better at p < 0.05 / 0.01 / 0.001
+    "2".."0" entity j is better at p < 0.05 / 0.01 / 0.001
+
+i.e. int(char) - 3 is the signed significance level.  Pair (i, j) is at
+position i * (2n - i - 1) / 2 + (j - i - 1).  A 60-model matrix is a
+1770-character string, which gzip shrinks well.
+
+All pairs of a matrix are computed at once with NumPy when it is installed,
+and pair by pair otherwise; both give the same codes.
+"""
+
+import math
+
+try:
+    import numpy as np
+except ImportError:  # optional: pairwise_codes() then loops over the pairs
+    np = None
+
+# |z| thresholds of two-sided p < 0.05, 0.01 and 0.001
+Z_LEVELS = [1.959964, 2.575829, 3.290527]
+MISSING = "."
+SIGNIFICANCE_SECTIONS = ["models", "instruct_models"]
+
+
+def _code(z):
+    level = sum(abs(z) >= t for t in Z_LEVELS)
+    return str(3 + level if z > 0 else 3 - level)
+
+
+def pairwise_codes(values, stderrs):
+    """Encode the z-tests of all pairs of entities as an upper-triangle string.
+
+    values and stderrs are per-entity lists with None for missing entries.
+    """
+    n = len(values)
+    if np is not None and n > 1:
+        v = np.array([np.nan if x is None else x for x in values], dtype=float)
+        s = np.array([np.nan if x is None else x for x in stderrs], dtype=float)
+        i, j = np.triu_indices(n, 1)
+        se = np.sqrt(s[i] * s[i] + s[j] * s[j])
+        valid = np.isfinite(v[i]) & np.isfinite(v[j]) & np.isfinite(se) & (se > 0)
+        z = np.zeros(len(i))
+        np.divide(v[i] - v[j], se, out=z, where=valid)
+        level = (np.abs(z)[:, None] >= np.array(Z_LEVELS)).sum(axis=1)
+        signed = np.where(z > 0, 3 + level, 3 - level)
+        chars = np.where(valid, signed + ord("0"), ord(MISSING))
+        return chars.astype(np.uint8).tobytes().decode("ascii")
+
+    return "".join(
+        _pair_code(values[i], values[j], stderrs[i], stderrs[j])
+        for i in range(n) for j in range(i + 1, n)
+    )
+
+
+def _pair_code(a, b, sa, sb):
+    if None in (a, b, sa, sb):
+        return MISSING
+    se = math.sqrt(sa * sa + sb * sb)
+    return _code((a - b) / se) if se > 0 else MISSING
+
+
+def _aggregate(cells, groups):
+    """Mean of the cells' (score, stderr) per group, then across groups, as in app.js."""
+    total = se2_total = 0.0
+    count = 0
+    for group in groups:
+        group_total = se2 = 0.0
+        n = 0
+        for benchmark in group:
+            if benchmark in cells:
+                score, se = cells[benchmark]
+                group_total += score
+                se2 += se * se
+                n += 1
+        if n:
+            total += group_total / n
+            se2_total += se2 / (n * n)
+            count += 1
+    if not count:
+        return None, None
+    return total / count, math.sqrt(se2_total) / count
+
+
+def aggregate_codes(cells, groups):
+    """Encode the z-tests of all pairs' aggregate scores like pairwise_codes().
+
+    cells is a per-entity list of {benchmark: (score, stderr)}, groups a list
+    of benchmark lists.  Each pair is aggregated over the benchmarks both
+    entities have.  The NumPy path accumulates in the same order as
+    _aggregate(), so both give the same codes.
+    """
+    n = len(cells)
+    if np is not None and n > 1:
+        i, j = np.triu_indices(n, 1)
+        total = [np.zeros(len(i)), np.zeros(len(i))]
+        se2_total = [np.zeros(len(i)), np.zeros(len(i))]
+        count = np.zeros(len(i))
+        for group in groups:
+            group_total = [np.zeros(len(i)), np.zeros(len(i))]
+            se2 = [np.zeros(len(i)), np.zeros(len(i))]
+            group_n = np.zeros(len(i))
+            for benchmark in group:
+                pairs = [cell.get(benchmark, (np.nan, np.nan)) for cell in cells]
+                score, se = np.array(pairs, dtype=float).T
+                shared = np.isfinite(score[i]) & np.isfinite(score[j])
+                for side, k in enumerate((i, j)):
+                    group_total[side] += np.where(shared, score[k], 0.0)
+                    se2[side] += np.where(shared, se[k] * se[k], 0.0)
+                group_n += shared
+            present = group_n > 0
+            n_safe = np.where(present, group_n, 1.0)
+            for side in range(2):
+                total[side] += np.where(present, group_total[side] / n_safe, 0.0)
+                se2_total[side] += np.where(present, se2[side] / (n_safe * n_safe), 0.0)
+            count += present
+        valid = count > 0
+        count = np.where(valid, count, 1.0)
+        a, b = (total[side] / count for side in range(2))
+        sa, sb = (np.sqrt(se2_total[side]) / count for side in range(2))
+        se = np.sqrt(sa * sa + sb * sb)
+        valid &= se > 0
+        z = np.zeros(len(i))
+        np.divide(a - b, se, out=z, where=valid)
+        level = (np.abs(z)[:, None] >= np.array(Z_LEVELS)).sum(axis=1)
+        signed = np.where(z > 0, 3 + level, 3 - level)
+        chars = np.where(valid, signed + ord("0"), ord(MISSING))
+        return chars.astype(np.uint8).tobytes().decode("ascii")
+
+    codes = []
+    for i in range(n):
+        for j in range(i + 1, n):
+            shared = cells[i].keys() & cells[j].keys()
+            a, sa = _aggregate({k: cells[i][k] for k in shared}, groups)
+            b, sb = _aggregate({k: cells[j][k] for k in shared}, groups)
+            codes.append(_pair_code(a, b, sa, sb))
+    return "".join(codes)
+
+
+def build_significance(table, metrics_setup, shots, prompt_aggs):
+    """Compute the pairwise significance codes of one score section's ScoreTable.
+
+    Returns {"entities": [...], "z_levels": Z_LEVELS, "benchmarks": {shot:
+    {prompt_agg: {benchmark: codes}}}, "aggregate": {shot: {prompt_agg:
+    {"tasks": codes, "categories": codes}}}}, codes as from pairwise_codes().
+    Benchmarks without any score are left out.
+    """
+    entities = list(table)
+    categories = {}
+    for benchmark, config in metrics_setup.items():
+        categories.setdefault(config.get("category", "Uncategorized"), []).append(benchmark)
+    task_groups = [list(metrics_setup)]
+    category_groups = list(categories.values())
+
+    by_benchmark = {}
+    aggregate = {}
+    for shot in shots:
+        for agg in prompt_aggs:
+            stderr_key = agg + "_stderr"
+            # entity -> {benchmark: (baseline-normalized score, stderr)}, for
+            # the cells that can be tested
+            normalized = [{} for _ in entities]
+            for benchmark, config in metrics_setup.items():
+                main_metric = config["main_metric"]
+                base = config["random_baseline"]
+                scale = 100.0 / ((100.0 if config.get("metric_scale") == "percent" else 1.0) - base)
+                values, stderrs = [], []
+                column = table.column(benchmark, shot, main_metric)
+                for record, cells in zip(column, normalized):
+                    value = se = None
+                    if record is not None:
+                        value, se = getattr(record, agg), getattr(record, stderr_key)
+                    values.append(value)
+                    stderrs.append(se)
+                    if value is not None and se is not None:
+                        cells[benchmark] = ((value - base) * scale, se * scale)
+                if all(v is None for v in values):
+                    continue
+                by_benchmark.setdefault(shot, {}).setdefault(agg, {})[benchmark] = (
+                    pairwise_codes(values, stderrs)
+                )
+            views = {}
+            for view, groups in (("tasks", task_groups), ("categories", category_groups)):
+                views[view] = aggregate_codes(normalized, groups)
+            aggregate.setdefault(shot, {})[agg] = views
+    return {
+        "entities": [str(e) for e in entities],
+        "z_levels": Z_LEVELS,
+        "benchmarks": by_benchmark,
+        "aggregate": aggregate,
+    }